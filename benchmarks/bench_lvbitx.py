@@ -0,0 +1,216 @@
+"""
+
+	Benchmarks for lvbitx, run on synthetic bitfiles.
+
+	Usage:
+		python benchmarks/bench_lvbitx.py --sizes 1,16,200 --output results.json
+		python benchmarks/bench_lvbitx.py --baseline results.json
+
+	Each case is timed (best of --repeat runs) and its peak Python memory measured with
+	tracemalloc in a separate run. Results are written as JSON; given a baseline, cases slower
+	or bigger than the baseline by more than --tolerance are reported and the exit status is 1.
+
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import lvbitx
+
+
+def MakeBitfile(fileName, registers=200, arrays=20, channels=4, bitstreamSize=1<<20, seed=0):
+	"""
+
+		Writes a synthetic bitfile with LVBitxCreate.
+
+		Parameters:
+			fileName        output file name (str)
+			registers       number of scalar registers (int, optional)
+			arrays          number of array registers (int, optional)
+			channels        number of DMA channels (int, optional)
+			bitstreamSize   bitstream size in bytes (int, optional)
+			seed            random seed (int, optional)
+
+	"""
+	rnd = random.Random(seed)
+	types = [code for name, code in lvbitx.TypeCode.items() if name != u"Array"]
+	lvc = lvbitx.LVBitxCreate()
+	lvc.viName = "bench.vi"
+	lvc.signatureRegister = "%032X" % rnd.getrandbits(128)
+	offset = 0x18000
+	for i in range(registers + arrays):
+		reg = lvbitx.Register()
+		reg.name = "reg%d" % i
+		reg.id = i
+		reg.offset = offset
+		reg.indicator = rnd.random() < 0.5
+		if i < registers:
+			reg.datatype.type = rnd.choice(types)
+			reg.datatype.name = reg.name
+			reg.sizeInBits = 32
+		else:
+			reg.datatype = lvbitx.DatatypeArray()
+			reg.datatype.name = reg.name
+			reg.datatype.size = rnd.randint(2, 64)
+			reg.datatype.type.type = lvbitx.TypeCode[u"U8"]
+			reg.sizeInBits = 8 * reg.datatype.size
+		offset += 4 * ((reg.sizeInBits + 31) // 32)
+		lvc.registers.append(reg)
+	for i in range(channels):
+		channel = lvbitx.DmaChannel()
+		channel.name = "Fifo%d" % i
+		channel.number = i
+		channel.numberOfElements = 1023
+		channel.baseAddressTag = "NiLvFpgaFIFO%d" % i
+		channel.datatype.subtype = lvbitx.TypeCode[u"U32"]
+		channel.datatype.wordLength = 32
+		lvc.channels.append(channel)
+	block = lvbitx.RegisterBlock()
+	block.name = "user"
+	block.offset = 0x18000
+	lvc.registerBlocks.append(block)
+	clock = lvbitx.BaseClock()
+	clock.name = "40 MHz Onboard Clock"
+	lvc.usedBaseClocks.append(clock)
+	with tempfile.TemporaryFile() as bitstream:
+		for pos in range(0, bitstreamSize, 1<<20):
+			bitstream.write(rnd.getrandbits(8 * min(1<<20, bitstreamSize - pos)).to_bytes(min(1<<20, bitstreamSize - pos), "little"))
+		bitstream.seek(0)
+		lvc.bitstream = bitstream
+		with open(fileName, "wb") as f:
+			lvc.GenerateTo(f, pretty=True)
+
+def Cases(fileName, engines):
+	"""
+
+		Lists benchmark cases for a bitfile.
+		The "lazy" engine keeps each section once parsed, so its Get* cases open a fresh parser
+		on every call and include the (index only) opening time.
+
+		Output:
+			list of (name, function) tuples
+
+	"""
+	cases = []
+	for engine in engines:
+		cases.append(("%s/open" % engine, lambda engine=engine: lvbitx.LVbitxParse(fileName, engine=engine)))
+		lvp = lvbitx.LVbitxParse(fileName, engine=engine) if engine != u"lazy" else None
+		for method in ("GetSignature", "GetViName", "GetRegisterList", "GetDmaChannels", "GetRegisterBlocks", "GetUsedBaseClocks", "GetBitstream"):
+			if lvp is None:
+				cases.append(("%s/%s" % (engine, method), lambda method=method: Fresh(fileName, method)))
+			else:
+				cases.append(("%s/%s" % (engine, method), getattr(lvp, method)))
+	lvp = lvbitx.LVbitxParse(fileName, engine="stream")
+	lvc = lvbitx.LVBitxCreate(lvp.Load())
+	lvc.bitstream = lvp.GetBitstream()
+	cases.append(("Generate", lvc.Generate))
+	return cases
+
+def Fresh(fileName, method):
+	"""
+
+		Calls a Get* method on a newly opened "lazy" parser.
+
+	"""
+	with lvbitx.LVbitxParse(fileName, engine="lazy") as lvp:
+		return getattr(lvp, method)()
+
+def Measure(function, repeat):
+	"""
+
+		Measures a function.
+
+		Output:
+			dict with best wall time (s) and peak traced memory (bytes)
+
+	"""
+	best = None
+	for i in range(repeat):
+		start = time.perf_counter()
+		function()
+		elapsed = time.perf_counter() - start
+		best = elapsed if best is None else min(best, elapsed)
+	tracemalloc.start()
+	try:
+		function()
+		peak = tracemalloc.get_traced_memory()[1]
+	finally:
+		tracemalloc.stop()
+	return {"time":best, "peak":peak}
+
+def Compare(results, baseline, tolerance, minTime=1e-2):
+	"""
+
+		Compares results with a baseline. Cases faster than minTime seconds are too noisy for their
+		time to be compared.
+
+		Output:
+			list of regression descriptions (str)
+
+	"""
+	regressions = []
+	for name, result in sorted(results.items()):
+		if name not in baseline:
+			continue
+		for key in ("time", "peak"):
+			old = baseline[name][key]
+			if key == "time" and old < minTime:
+				continue
+			if old > 0 and result[key] > old * (1 + tolerance):
+				regressions.append("%s: %s %.4g -> %.4g (%+.0f%%)" % (name, key, old, result[key], 100.0 * (result[key] / old - 1)))
+	return regressions
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description="Benchmark lvbitx on synthetic bitfiles.")
+	parser.add_argument("--sizes", default="1,16", help="comma-separated bitstream sizes in MB (default: 1,16)")
+	parser.add_argument("--registers", type=int, default=200, help="number of scalar registers")
+	parser.add_argument("--arrays", type=int, default=20, help="number of array registers")
+	parser.add_argument("--channels", type=int, default=4, help="number of DMA channels")
+	parser.add_argument("--engines", default=",".join(lvbitx.ParserEngines), help="comma-separated parser engines")
+	parser.add_argument("--repeat", type=int, default=5, help="timed runs per case (best is kept, default: 5)")
+	parser.add_argument("--output", help="JSON file to write results to (default: standard output)")
+	parser.add_argument("--baseline", help="JSON results to compare against")
+	parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative slowdown or memory growth (default: 0.2)")
+	parser.add_argument("--min-time", type=float, default=1e-2, help="cases faster than this (s) are not compared on time (default: 0.01)")
+	args = parser.parse_args(argv)
+	directory = tempfile.mkdtemp()
+	results = {}
+	try:
+		for size in args.sizes.split(","):
+			fileName = os.path.join(directory, "bench%sMB.lvbitx" % size)
+			MakeBitfile(fileName, args.registers, args.arrays, args.channels, int(float(size) * (1<<20)))
+			for name, function in Cases(fileName, args.engines.split(",")):
+				name = "%sMB/%s" % (size, name)
+				results[name] = Measure(function, args.repeat)
+				sys.stderr.write("%-40s %10.4f s %12d B\n" % (name, results[name]["time"], results[name]["peak"]))
+			os.remove(fileName)
+	finally:
+		shutil.rmtree(directory)
+	report = {"python":platform.python_version(), "platform":platform.platform(),
+		"parameters":{"registers":args.registers, "arrays":args.arrays, "channels":args.channels},
+		"results":results}
+	if args.output:
+		with open(args.output, "w") as f:
+			json.dump(report, f, indent=1, sort_keys=True)
+	else:
+		json.dump(report, sys.stdout, indent=1, sort_keys=True)
+		sys.stdout.write("\n")
+	if args.baseline:
+		with open(args.baseline) as f:
+			regressions = Compare(results, json.load(f)["results"], args.tolerance, args.min_time)
+		for line in regressions:
+			sys.stderr.write("regression: %s\n" % line)
+		return 1 if regressions else 0
+	return 0
+
+if __name__ == "__main__":
+	sys.exit(main())
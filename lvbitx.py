@@ -2,57 +2,60 @@
 	Copyright (c) 2014 Vincent Paeder
 	
 	This program is free software: you can redistribute it and/or modify
-    it under the terms of the GNU General Public License as published by
-    the Free Software Foundation, either version 3 of the License, or
-    (at your option) any later version.
+	it under the terms of the GNU General Public License as published by
+	the Free Software Foundation, either version 3 of the License, or
+	(at your option) any later version.
 
-    This program is distributed in the hope that it will be useful,
-    but WITHOUT ANY WARRANTY; without even the implied warranty of
-    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
-    GNU General Public License for more details.
+	This program is distributed in the hope that it will be useful,
+	but WITHOUT ANY WARRANTY; without even the implied warranty of
+	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+	GNU General Public License for more details.
 
-    You should have received a copy of the GNU General Public License
-    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+	You should have received a copy of the GNU General Public License
+	along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 """
 
 """
 
-    Parser for National Instruments LabView FPGA bitfiles (LVBITX).
-    Includes a class to generate compatible XML.
-    Note that the signatures won't be generated correctly, but it doesn't seem to be a problem
-    (as long as the signature provided to the driver on load is the same as the one in the file).
+	Parser for National Instruments LabView FPGA bitfiles (LVBITX).
+	Includes a class to generate compatible XML.
+	Note that the signatures won't be generated correctly, but it doesn't seem to be a problem
+	(as long as the signature provided to the driver on load is the same as the one in the file).
 
 """
 
 
 class Datatype():
-    """
-    
-        Datatype class for Register objects
-        
-    """
+	"""
+	
+		Datatype class for Register objects
+		
+	"""
+	__slots__ = ("type", "name")
 	def __init__(self):
 		self.type = 0 # type code (see TypeCode dict)
 		self.name = "" # register name
 
 class DatatypeArray():
-    """
-    
-        Datatype array class for Register objects (used to create arrays of subtypes)
-        
-    """
+	"""
+	
+		Datatype array class for Register objects (used to create arrays of subtypes)
+		
+	"""
+	__slots__ = ("name", "size", "type")
 	def __init__(self):
 		self.name = "" # register name
 		self.size = 4 # array size
 		self.type = Datatype() # subtype (Datatype class)
 
 class Register:
-    """
-    
-        Register informations
-    
-    """
+	"""
+	
+		Register informations
+	
+	"""
+	__slots__ = ("name", "hidden", "indicator", "datatype", "flattenedType", "offset", "sizeInBits", "classId", "internal", "id", "bidirectional", "synchronous", "mechanicalAction", "accessMayTimeout", "registerNode")
 	def __init__(self):
 		self.name = "" # register name
 		self.hidden = False # if False, appears in the interface
@@ -71,21 +74,23 @@ class Register:
 		self.registerNode = False #
 
 class RegisterBlock():
-    """
-    
-        Register block informations
-    
-    """
+	"""
+	
+		Register block informations
+	
+	"""
+	__slots__ = ("name", "offset")
 	def __init__(self):
 		self.name = "" # register name
 		self.offset = 0 # address offset
 
 class DmaDatatype():
-    """
-    
-        Data type class for DMA channels
-    
-    """
+	"""
+	
+		Data type class for DMA channels
+	
+	"""
+	__slots__ = ("delta", "integerWordLength", "maximum", "minimum", "signed", "subtype", "wordLength")
 	def __init__(self):
 		self.delta = 1.0 # increment delta
 		self.integerWordLength = 32 # integer word length
@@ -96,11 +101,12 @@ class DmaDatatype():
 		self.wordLength = 0 # word length
 
 class DmaChannel():
-    """
-    
-        DMA channel informations
-    
-    """
+	"""
+	
+		DMA channel informations
+	
+	"""
+	__slots__ = ("name", "baseAddressTag", "controlSet", "datatype", "direction", "implementation", "number", "numberOfElements", "userVisible", "writeWindowAddressTag", "writeWindowSize")
 	def __init__(self):
 		self.name = "" # channel name
 		self.baseAddressTag = "" # address tag
@@ -115,20 +121,22 @@ class DmaChannel():
 		self.writeWindowSize = 0 # number of elements for a P2P FIFO
 
 class BaseClock():
-    """
-    
-        Base clock class
-    
-    """
+	"""
+	
+		Base clock class
+	
+	"""
+	__slots__ = ("name",)
 	def __init__(self):
 		self.name = "" # clock name
 
 class Icon():
-    """
-    
-        Labview icon class
-    
-    """
+	"""
+	
+		Labview icon class
+	
+	"""
+	__slots__ = ("imageType", "imageDepth", "image", "mask", "colors", "rectangle")
 	def __init__(self):
 		self.imageType = 0 # image type
 		self.imageDepth = 8 # image depth
@@ -137,686 +145,4245 @@ class Icon():
 		self.colors = "" # image colors (base64 encoded)
 		self.rectangle = [0,0,0,0] # image rectange [top, left, bottom, right]
 
-TypeCode = {u"Bool":0, u"I8":1, u"U8":2, u"I16":3, u"U16":4, u"I32":5, u"U32":6, u"I64":7, u"U64":8,u"Array":9}
-DirectionCode = {u"TargetToHost":0, u"HostToTarget":1}
-MechanicalActionCode = {u"Switch When Pressed":0, u"Switch When Released":1, u"Switch Until Released":2, u"Latch When Pressed":3, u"Latch When Released":4, u"Latch Until Released":5}
-ImplementationCode = {u"niFpgaPeerToPeerReader":0, u"niFpgaPeerToPeerWriter":1, u"niFpgaTargetToHost":2, u"niFpgaHostToTarget":3}
-
-class LVbitxParse:
-    """
-    
-        LVBITX parser class
-    
-    """
-	def __init__(self, fileName=""):
-        """
-        
-            Initialization.
-            
-            Parameters:
-                fileName        LVBITX file name (str, optional)
-        
-        """
-		self.bitx = None
-		if fileName!="":
-			self.OpenFile(fileName)
-	
-	def OpenFile(self, fileName):
-        """
-        
-            Opens LVBITX file.
-            
-            Parameters:
-                fileName        LVBITX file name (str)
-        
-        """
-		from xml.dom import minidom
-		try:
-			self.bitx = minidom.parse(fileName)
-		except:
-			self.bitx = None
-	
-	def GetSignature(self):
-        """
-        
-            Reads signature for SignatureRegister of loaded file.
-            
-            Output:
-                file signature (str)
-            
-        """
-		if self.bitx!=None:
-			try:
-				sig = str(self.bitx.getElementsByTagName("SignatureRegister")[0].childNodes[0].data)
-				return sig
-			except:
-				return ""
-	
-	def GetViName(self):
-        """
-        
-            Reads VI name associated to loaded file.
-            
-            Output:
-                VI name (str)
-            
-        """
-		if self.bitx!=None:
-			for x in self.bitx.getElementsByTagName("VI")[0].childNodes:
-				if x.tagName == u"Name":
-					return x.childNodes[0].data
-		return ""
-	
-	def GetRegisterList(self):
-        """
-        
-            Extracts register list from loaded file.
-            
-            Output:
-                list of Register objects
-            
-        """
-		regList = []
-		if self.bitx!=None:
-			for x in self.bitx.getElementsByTagName("RegisterList")[0].childNodes:
-				if hasattr(x,"tagName") and x.tagName == u"Register":
-					reg = Register()
-					for y in x.childNodes:
-						if hasattr(y,'tagName') and y.tagName == u"Name": reg.name = y.childNodes[0].data
-						if hasattr(y,'tagName') and y.tagName == u"Hidden": reg.hidden = y.childNodes[0].data == u"true"
-						if hasattr(y,'tagName') and y.tagName == u"Indicator": reg.indicator = y.childNodes[0].data == u"true"
-						if hasattr(y,'tagName') and y.tagName == u"Datatype":
-							for z in y.childNodes:
-								if hasattr(z,'getElementsByTagName'):
-									if z.tagName==u"Array":
-										dtype = DatatypeArray()
-										if len(z.getElementsByTagName("Name")[0].childNodes)>0: dtype.name = z.getElementsByTagName("Name")[0].childNodes[0].data
-										dtype.size = int(z.getElementsByTagName("Size")[0].childNodes[0].data)
-										for zz in z.getElementsByTagName("Type")[0].childNodes:
-											if hasattr(zz,"tagName"):
-												dtype.type.type = TypeCode[zz.tagName]
-												if len(zz.getElementsByTagName("Name")[0].childNodes)>0: dtype.type.name = zz.getElementsByTagName("Name")[0].childNodes[0].data
-									else:
-										dtype = Datatype()
-										if len(z.getElementsByTagName("Name")[0].childNodes)>0: dtype.name = z.getElementsByTagName("Name")[0].childNodes[0].data
-										dtype.type = TypeCode[z.tagName]
-									reg.datatype = dtype
-						if hasattr(y,'tagName') and y.tagName == u"FlattenedType" and len(y.childNodes)>0: reg.flattenedType = y.childNodes[0].data
-						if hasattr(y,'tagName') and y.tagName == u"Offset": reg.offset = int(y.childNodes[0].data)
-						if hasattr(y,'tagName') and y.tagName == u"SizeInBits": reg.sizeInBits = int(y.childNodes[0].data)
-						if hasattr(y,'tagName') and y.tagName == u"Class": reg.classId = int(y.childNodes[0].data)
-						if hasattr(y,'tagName') and y.tagName == u"Internal": reg.internal = y.childNodes[0].data == u"true"
-						if hasattr(y,'tagName') and y.tagName == u"ID": reg.id = int(y.childNodes[0].data)
-						if hasattr(y,'tagName') and y.tagName == u"Bidirectional": reg.bidirectional = y.childNodes[0].data == u"true"
-						if hasattr(y,'tagName') and y.tagName == u"Synchronous": reg.synchronous = y.childNodes[0].data == u"true"
-						if hasattr(y,'tagName') and y.tagName == u"MechanicalAction": reg.mechanicalAction = MechanicalActionCode[y.childNodes[0].data]
-						if hasattr(y,'tagName') and y.tagName == u"AccessMayTimeout": reg.accessMayTimeout = y.childNodes[0].data == u"true"
-						if hasattr(y,'tagName') and y.tagName == u"RegisterNode": reg.registerNode = y.childNodes[0].data == u"true"
-					regList.append(reg)
-			return regList
-	
-	def GetDmaChannels(self):
-        """
-        
-            Reads DMA channels from loaded file.
-            
-            Output:
-                list of DmaChannel objects
-            
-        """
-		channels = []
-		if self.bitx!=None:
-			for x in self.bitx.getElementsByTagName("DmaChannelAllocationList")[0].childNodes:
-				if hasattr(x,'tagName') and x.tagName == u"Channel":
-					chan = DmaChannel()
-					chan.name = x.attributes["name"].value
-					for y in x.childNodes:
-						if hasattr(y,'tagName') and y.tagName == u"BaseAddressTag": chan.baseAddressTag = y.childNodes[0].data
-						if hasattr(y,'tagName') and y.tagName == u"ControlSet": chan.controlSet = int(y.childNodes[0].data)
-						if hasattr(y,'tagName') and y.tagName == u"DataType":
-							dtype = DmaDatatype()
-							for z in y.childNodes:
-								if hasattr(z,'tagName') and z.tagName == u"Delta": dtype.delta = float(z.childNodes[0].data)
-								if hasattr(z,'tagName') and z.tagName == u"IntegerWordLength": dtype.integerWordLength = int(z.childNodes[0].data)
-								if hasattr(z,'tagName') and z.tagName == u"Maximum": dtype.maximum = float(z.childNodes[0].data)
-								if hasattr(z,'tagName') and z.tagName == u"Minimum": dtype.minimum = float(z.childNodes[0].data)
-								if hasattr(z,'tagName') and z.tagName == u"Signed": dtype.signed = z.childNodes[0].data == u"true"
-								if hasattr(z,'tagName') and z.tagName == u"SubType": dtype.subtype = TypeCode[z.childNodes[0].data]
-								if hasattr(z,'tagName') and z.tagName == u"WordLength": dtype.wordLength = int(z.childNodes[0].data)
-							chan.datatype = dtype
-						if hasattr(y,'tagName') and y.tagName == u"Direction": chan.direction = DirectionCode[y.childNodes[0].data]
-						if hasattr(y,'tagName') and y.tagName == u"Implementation": chan.implementation = ImplementationCode[y.childNodes[0].data]
-						if hasattr(y,'tagName') and y.tagName == u"Number": chan.number = int(y.childNodes[0].data)
-						if hasattr(y,'tagName') and y.tagName == u"NumberOfElements": chan.numberOfElements = int(y.childNodes[0].data)
-						if hasattr(y,'tagName') and y.tagName == u"UserVisible": chan.userVisible = y.childNodes[0].data == u"true"
-						if hasattr(y,'tagName') and y.tagName == u"WriteWindowAddressTag": chan.writeWindowAddressTag = y.childNodes[0].data
-						if hasattr(y,'tagName') and y.tagName == u"WriteWindowSize": chan.writeWindowSize = int(y.childNodes[0].data)
-					channels.append(chan)
-		return channels
-	
-	def GetRegisterBlocks(self):
-        """
-        
-            Reads register blocks from loaded file.
-            
-            Output:
-                list of RegisterBlock objects
-            
-        """
-		blocks = []
-		if self.bitx!=None:
-			for x in self.bitx.getElementsByTagName("RegisterBlockList")[0].childNodes:
-				if hasattr(x,'tagName') and x.tagName == u"RegisterBlock":
-					reg = RegisterBlock()
-					reg.name = x.attributes["name"].value
-					for y in x.childNodes:
-						if hasattr(y,'tagName') and y.tagName == u"Offset": reg.offset = int(y.childNodes[0].data,16)
-					blocks.append(reg)
-		return blocks
+class Bitfile():
+	"""
 	
-	def GetUsedBaseClocks(self):
-        """
-        
-            Reads used base clocks from loaded file.
-            
-            Output:
-                list of BaseClock objects
-            
-        """
-		clocks = []
-		if self.bitx!=None:
-			for x in self.bitx.getElementsByTagName("UsedBaseClockList")[0].childNodes:
-				if hasattr(x,'tagName') and x.tagName == u"BaseClock":
-					bc = BaseClock()
-					bc.name = x.attributes["name"].value
-					clocks.append(bc)
-		return clocks
-	
-	def GetBitstream(self):
-        """
-        
-            Reads bitstream from loaded file.
-            
-            Output:
-                decoded binary bitstream (str)
-            
-        """
-	    if self.bitx!=None:
-            import base64
-            return base64.b64decode(self.bitx.getElementsByTagName("Bitstream")[0].childNodes[0].data)
-        else:
-            return ""
+		Whole bitfile model (as returned by LVbitxParse.Load), bitstream excepted
 	
-
-class LVBitxCreate():
-    """
-    
-        LVBITX creator class
-    
-    """
+	"""
+	__slots__ = ("bitfileVersion", "signatureRegister", "signatureGuids", "signatureNames", "timeStamp", "viName", "targetClass", "autoRunWhenDownloaded", "multipleUserClocks", "registers", "icon", "channels", "registerBlocks", "usedBaseClocks")
 	def __init__(self):
-        """
-        
-            Initialization.
-            
-        """
+		self.bitfileVersion = "" # bitfile format version
 		self.signatureRegister = "" # signature to be provided on load
 		self.signatureGuids = "" # ?
 		self.signatureNames = "" # ?
-		self.viName = "default.vi" # VI name
-		self.targetClass = "PXIe-7965R" # target class
+		self.timeStamp = "" # compilation time stamp
+		self.viName = "" # VI name
+		self.targetClass = "" # target class
 		self.autoRunWhenDownloaded = False # if True, auto-run when loaded
 		self.multipleUserClocks = False # if True, more than one clock is defined
-		self.bitstream = "" # binary bitstream
 		self.registers = [] # list of Register objects
 		self.icon = Icon() # VI icon object
 		self.channels = [] # list of DmaChannel objects
 		self.registerBlocks = [] # list of RegisterBlock objects
 		self.usedBaseClocks = [] # list of BaseClock objects
 
-	def Generate(self):
-        """
-        
-            Generates a LVBITX stream from the properties of the object.
-            
-            Output:
-                string containing LVBITX data (str)
-        
-        """
-		from xml.dom import minidom
-		doc = minidom.Document()
-		root = doc.createElement("Bitfile")
-		doc.appendChild(root)
-		
-		# bitfile version tag
-		bfVersion = doc.createElement("BitfileVersion")
-		bfVersionText = doc.createTextNode("1.0")
-		bfVersion.appendChild(bfVersionText)
-		root.appendChild(bfVersion)
-		
-		# SignatureRegister tag
-		sigRegister = doc.createElement("SignatureRegister")
-		sigRegisterText = doc.createTextNode(self.signatureRegister)
-		sigRegister.appendChild(sigRegisterText)
-		root.appendChild(sigRegister)
-		
-		# SignatureGuids tag
-		sigGuids = doc.createElement("SignatureGuids")
-		sigGuidsText = doc.createTextNode(self.signatureGuids)
-		sigGuids.appendChild(sigGuidsText)
-		root.appendChild(sigGuids)
-		
-		# SignatureNames tag
-		sigNames = doc.createElement("SignatureNames")
-		sigNamesText = doc.createTextNode(self.signatureNames)
-		sigNames.appendChild(sigNamesText)
-		root.appendChild(sigNames)
-		
-		# TimeStamp tag
-		from datetime import datetime
-		timeStamp = doc.createElement("TimeStamp")
-		timeStampText = doc.createTextNode(datetime.today().strftime("%m/%d/%Y%l:%M %p"))
-		timeStamp.appendChild(timeStampText)
-		root.appendChild(timeStamp)
-		
-		# CompilationStatus tag
-		compStatus = doc.createElement("CompilationStatus")
-		compStatusText = doc.createTextNode("")
-		compStatus.appendChild(compStatusText)
-		root.appendChild(compStatus)
-		
-		# BitstreamVersion tag
-		bsVersion = doc.createElement("BitstreamVersion")
-		bsVersionText = doc.createTextNode("2")
-		bsVersion.appendChild(bsVersionText)
-		root.appendChild(bsVersion)
-		
-		# VI node
-		viNode = doc.createElement("VI")
-		root.appendChild(viNode)
-		
-		# VI name tag
-		viName = doc.createElement("Name")
-		viNameText = doc.createTextNode(self.viName)
-		viName.appendChild(viNameText)
-		viNode.appendChild(viName)
-		
-		# register list node
-		registerList = doc.createElement("RegisterList")
-		viNode.appendChild(registerList)
-		for reg in self.registers:
-			register = doc.createElement("Register")
-			registerList.appendChild(register)
-			# name tag
-			registerName = doc.createElement("Name")
-			registerNameText = doc.createTextNode(reg.name)
-			registerName.appendChild(registerNameText)
-			register.appendChild(registerName)
-			# hidden tag
-			registerHidden = doc.createElement("Hidden")
-			registerHiddenText = doc.createTextNode(str(reg.hidden).lower())
-			registerHidden.appendChild(registerHiddenText)
-			register.appendChild(registerHidden)
-			
-			# indicator tag
-			registerIndicator = doc.createElement("Indicator")
-			registerIndicatorText = doc.createTextNode(str(reg.indicator).lower())
-			registerIndicator.appendChild(registerIndicatorText)
-			register.appendChild(registerIndicator)
-			
-			# data type tag
-			registerDatatype = doc.createElement("DataType")
-			register.appendChild(registerDatatype)
-			
-			if isinstance(reg.datatype,Datatype):
-				registerTypeCode = doc.createElement(TypeCode.keys()[TypeCode.values().index(reg.datatype.type)])
-				registerDatatype.appendChild(registerTypeCode)
-				registerTypeName = doc.createElement("Name")
-				registerTypeCode.appendChild(registerTypeName)
-				registerTypeNameText = doc.createTextNode(reg.datatype.name)
-				registerTypeName.appendChild(registerTypeNameText)
-			elif isinstance(reg.datatype,DatatypeArray):
-				# array name
-				registerTypeName = doc.createElement("Name")
-				registerDatatype.appendChild(registerTypeName)
-				registerTypeNameText = doc.createTextNode(reg.datatype.name)
-				registerTypeName.appendChild(registerTypeNameText)
-				# array size
-				registerTypeSize = doc.createElement("Size")
-				registerDatatype.appendChild(registerTypeSize)
-				registerTypeSizeText = doc.createTextNode(str(reg.datatype.size))
-				registerTypeSize.appendChild(registerTypeSizeText)
-				# array type
-				registerArrayType = doc.createElement("Type")
-				registerDatatype.appendChild(registerArrayType)
-				registerTypeCode = doc.createElement(TypeCode.keys()[TypeCode.values().index(reg.datatype.type.type)])
-				registerArrayType.appendChild(registerTypeCode)
-				# array type name
-				registerArrayTypeName = doc.createElement("Name")
-				registerTypeCode.appendChild(registerArrayTypeName)
-				registerArrayTypeNameText = doc.createTextNode(reg.datatype.type.name)
-				registerArrayTypeName.appendChild(registerArrayTypeNameText)
-			
-			# flattened type tag
-			registerFlattenedType = doc.createElement("FlattenedType")
-			registerFlattenedTypeText = doc.createTextNode(reg.flattenedType)
-			registerFlattenedType.appendChild(registerFlattenedTypeText)
-			register.appendChild(registerFlattenedType)
-			
-			# grouping tag
-			registerGrouping = doc.createElement("Grouping")
-			register.appendChild(registerGrouping)
-			
-			# offset tag
-			registerOffset = doc.createElement("Offset")
-			registerOffsetText = doc.createTextNode(str(reg.offset))
-			registerOffset.appendChild(registerOffsetText)
-			register.appendChild(registerOffset)
-			
-			# size in bits tag
-			registerSizeInBits = doc.createElement("SizeInBits")
-			registerSizeInBitsText = doc.createTextNode(str(reg.sizeInBits))
-			registerSizeInBits.appendChild(registerSizeInBitsText)
-			register.appendChild(registerSizeInBits)
-			
-			# class tag
-			registerClass = doc.createElement("Class")
-			registerClassText = doc.createTextNode(str(reg.classId))
-			registerClass.appendChild(registerClassText)
-			register.appendChild(registerClass)
-			
-			# internal tag
-			registerInternal = doc.createElement("Internal")
-			registerInternalText = doc.createTextNode(str(reg.internal).lower())
-			registerInternal.appendChild(registerInternalText)
-			register.appendChild(registerInternal)
-			
-			# typedef path tag
-			registerTypedefPath = doc.createElement("TypedefPath")
-			register.appendChild(registerTypedefPath)
-			
-			# id tag
-			registerID = doc.createElement("ID")
-			registerIDText = doc.createTextNode(str(reg.id))
-			registerID.appendChild(registerIDText)
-			register.appendChild(registerID)
-			
-			# bidirectional tag
-			registerBidirectional = doc.createElement("Bidirectional")
-			registerBidirectionalText = doc.createTextNode(str(reg.bidirectional).lower())
-			registerBidirectional.appendChild(registerBidirectionalText)
-			register.appendChild(registerBidirectional)
-			
-			# synchronous tag
-			registerSynchronous = doc.createElement("Synchronous")
-			registerSynchronousText = doc.createTextNode(str(reg.synchronous).lower())
-			registerSynchronous.appendChild(registerSynchronousText)
-			register.appendChild(registerSynchronous)
-			
-			# mechanical action tag
-			registerMechanicalAction = doc.createElement("MechanicalAction")
-			registerMechanicalActionText = doc.createTextNode(MechanicalActionCode.keys()[MechanicalActionCode.values().index(reg.mechanicalAction)])
-			registerMechanicalAction.appendChild(registerMechanicalActionText)
-			register.appendChild(registerMechanicalAction)
-			
-			# AccessMayTimeout tag
-			registerAccessMayTimeout = doc.createElement("AccessMayTimeout")
-			registerAccessMayTimeoutText = doc.createTextNode(str(reg.accessMayTimeout).lower())
-			registerAccessMayTimeout.appendChild(registerAccessMayTimeoutText)
-			register.appendChild(registerAccessMayTimeout)
-			
-			# RegisterNode tag
-			registerRegisterNode = doc.createElement("RegisterNode")
-			registerRegisterNodeText = doc.createTextNode(str(reg.registerNode).lower())
-			registerRegisterNode.appendChild(registerRegisterNodeText)
-			register.appendChild(registerRegisterNode)
-		
-			# subcontrol list tag
-			registerSubControlList = doc.createElement("SubControlList")
-			register.appendChild(registerSubControlList)
-			
-		
-		# icon node
-		iconNode = doc.createElement("Icon")
-		root.appendChild(iconNode)
-		
-		# ImageType tag
-		iconImageType = doc.createElement("ImageType")
-		iconImageTypeText = doc.createTextNode(str(self.icon.imageType))
-		iconImageType.appendChild(iconImageTypeText)
-		iconNode.appendChild(iconImageType)
-		
-		# ImageDepth tag
-		iconImageDepth = doc.createElement("ImageDepth")
-		iconImageDepthText = doc.createTextNode(str(self.icon.imageDepth))
-		iconImageDepth.appendChild(iconImageDepthText)
-		iconNode.appendChild(iconImageDepth)
-		
-		# Image tag
-		iconImage = doc.createElement("Image")
-		iconImageText = doc.createTextNode(self.icon.image)
-		iconImage.appendChild(iconImageText)
-		iconNode.appendChild(iconImage)
-		
-		# Mask tag
-		iconMask = doc.createElement("Mask")
-		iconMaskText = doc.createTextNode(self.icon.mask)
-		iconMask.appendChild(iconMaskText)
-		iconNode.appendChild(iconMask)
-		
-		# Colors tag
-		iconColors = doc.createElement("Colors")
-		iconColorsText = doc.createTextNode(self.icon.colors)
-		iconColors.appendChild(iconColorsText)
-		iconNode.appendChild(iconColors)
-		
-		# Rectangle node
-		iconRectangle = doc.createElement("Rectangle")
-		iconNode.appendChild(iconRectangle)
-		iconRectangleLeft = doc.createElement("Left")
-		iconRectangleLeftText = doc.createTextNode(str(self.icon.rectangle[0]))
-		iconRectangleLeft.appendChild(iconRectangleLeftText)
-		iconRectangle.appendChild(iconRectangleLeft)
-		iconRectangleTop = doc.createElement("Top")
-		iconRectangleTopText = doc.createTextNode(str(self.icon.rectangle[1]))
-		iconRectangleTop.appendChild(iconRectangleTopText)
-		iconRectangle.appendChild(iconRectangleTop)
-		iconRectangleRight = doc.createElement("Right")
-		iconRectangleRightText = doc.createTextNode(str(self.icon.rectangle[2]))
-		iconRectangleRight.appendChild(iconRectangleRightText)
-		iconRectangle.appendChild(iconRectangleRight)
-		iconRectangleBottom = doc.createElement("Bottom")
-		iconRectangleBottomText = doc.createTextNode(str(self.icon.rectangle[3]))
-		iconRectangleBottom.appendChild(iconRectangleBottomText)
-		iconRectangle.appendChild(iconRectangleBottom)
-		
-		# Project node
-		projectNode = doc.createElement("Project")
-		root.appendChild(projectNode)
-		
-		# TargetClass tag
-		targetClass = doc.createElement("TargetClass")
-		targetClassText = doc.createTextNode(self.targetClass)
-		targetClass.appendChild(targetClassText)
-		projectNode.appendChild(targetClass)
-		
-		# AutoRunWhenDownloaded tag
-		autoRunWhenDownloaded = doc.createElement("AutoRunWhenDownloaded")
-		autoRunWhenDownloadedText = doc.createTextNode(str(self.autoRunWhenDownloaded).lower())
-		autoRunWhenDownloaded.appendChild(autoRunWhenDownloadedText)
-		projectNode.appendChild(autoRunWhenDownloaded)
-		
-		# Compilation results tree
-		compTree = doc.createElement("CompilationResultsTree")
-		projectNode.appendChild(compTree)
-		compResults = doc.createElement("CompilationResults")
-		compTree.appendChild(compResults)
-		
-		# NiFlexRio
-		niFlexRio = doc.createElement("NiFlexRio")
-		compResults.appendChild(niFlexRio)
-		puma2 = doc.createElement("Puma2")
-		niFlexRio.appendChild(puma2)
-		pumaBsVersion = doc.createElement("BitstreamVersion")
-		pumaBsVersionText = doc.createTextNode("2")
-		pumaBsVersion.appendChild(pumaBsVersionText)
-		puma2.appendChild(pumaBsVersion)
-		
-		# NiFpga
-		niFpga = doc.createElement("NiFpga")
-		compResults.appendChild(niFpga)
-		
-		# DmaChannelAllocationList tag
-		dmaChannelAllocationList = doc.createElement("DmaChannelAllocationList")
-		compResults.appendChild(dmaChannelAllocationList)
-		for chan in self.channels:
-			channel = doc.createElement("Channel")
-			channel.setAttribute("name",chan.name)
-			dmaChannelAllocationList.appendChild(channel)
-			
-			# BaseAddressTag tag
-			chanBaseAddressTag = doc.createElement("BaseAddressTag")
-			chanBaseAddressTagText = doc.createTextNode(chan.baseAddressTag)
-			chanBaseAddressTag.appendChild(chanBaseAddressTagText)
-			channel.appendChild(chanBaseAddressTag)
-		
-			# ControlSet tag
-			chanControlSet = doc.createElement("ControlSet")
-			chanControlSetText = doc.createTextNode(str(chan.controlSet))
-			chanControlSet.appendChild(chanControlSetText)
-			channel.appendChild(chanControlSet)
-			
-			# Datatype tag
-			channelDatatype = doc.createElement("DataType")
-			channel.appendChild(channelDatatype)
-			
-			# Datatype delta tag
-			chanDtypeDelta = doc.createElement("Delta")
-			chanDtypeDeltaText = doc.createTextNode(str(chan.datatype.delta))
-			chanDtypeDelta.appendChild(chanDtypeDeltaText)
-			channelDatatype.appendChild(chanDtypeDelta)
-			
-			# Datatype IntegerWordLength tag
-			chanDtypeIntegerWordLength = doc.createElement("IntegerWordLength")
-			chanDtypeIntegerWordLengthText = doc.createTextNode(str(chan.datatype.integerWordLength))
-			chanDtypeIntegerWordLength.appendChild(chanDtypeIntegerWordLengthText)
-			channelDatatype.appendChild(chanDtypeIntegerWordLength)
-			
-			# Datatype Maximum tag
-			chanDtypeMaximum = doc.createElement("Maximum")
-			chanDtypeMaximumText = doc.createTextNode(str(chan.datatype.maximum))
-			chanDtypeMaximum.appendChild(chanDtypeMaximumText)
-			channelDatatype.appendChild(chanDtypeMaximum)
-			
-			# Datatype Minimum tag
-			chanDtypeMinimum = doc.createElement("Minimum")
-			chanDtypeMinimumText = doc.createTextNode(str(chan.datatype.minimum))
-			chanDtypeMinimum.appendChild(chanDtypeMinimumText)
-			channelDatatype.appendChild(chanDtypeMinimum)
-			
-			# Datatype Signed tag
-			chanDtypeSigned = doc.createElement("Signed")
-			chanDtypeSignedText = doc.createTextNode(str(chan.datatype.signed).lower())
-			chanDtypeSigned.appendChild(chanDtypeSignedText)
-			channelDatatype.appendChild(chanDtypeSigned)
-			
-			# Datatype SubType tag
-			chanDtypeSubType = doc.createElement("SubType")
-			chanDtypeSubTypeText = doc.createTextNode(TypeCode.keys()[TypeCode.values().index(chan.datatype.subtype)])
-			chanDtypeSubType.appendChild(chanDtypeSubTypeText)
-			channelDatatype.appendChild(chanDtypeSubType)
-			
-			# Datatype WordLength tag
-			chanDtypeWordLength = doc.createElement("WordLength")
-			chanDtypeWordLengthText = doc.createTextNode(str(chan.datatype.wordLength))
-			chanDtypeWordLength.appendChild(chanDtypeWordLengthText)
-			channelDatatype.appendChild(chanDtypeWordLength)
-			
-			# Implementation tag
-			chanImplementation = doc.createElement("Implementation")
-			chanImplementationText = doc.createTextNode(ImplementationCode.keys()[ImplementationCode.values().index(chan.implementation)])
-			chanImplementation.appendChild(chanImplementationText)
-			channel.appendChild(chanImplementation)
-			
-			# Number tag
-			chanNumber = doc.createElement("Number")
-			chanNumberText = doc.createTextNode(str(chan.number))
-			chanNumber.appendChild(chanNumberText)
-			channel.appendChild(chanNumber)
-			
-			# NumberOfElements tag
-			chanNumberOfElements = doc.createElement("NumberOfElements")
-			chanNumberOfElementsText = doc.createTextNode(str(chan.numberOfElements))
-			chanNumberOfElements.appendChild(chanNumberOfElementsText)
-			channel.appendChild(chanNumberOfElements)
-			
-			# UserVisible tag
-			chanUserVisible = doc.createElement("UserVisible")
-			chanUserVisibleText = doc.createTextNode(str(chan.userVisible).lower())
-			chanUserVisible.appendChild(chanUserVisibleText)
-			channel.appendChild(chanUserVisible)
-		
-		# RegisterBlockList tag
-		registerBlockList = doc.createElement("RegisterBlockList")
-		compResults.appendChild(registerBlockList)
-		for reg in self.registerBlocks:
-			register = doc.createElement("RegisterBlock")
-			register.setAttribute("name",reg.name)
-			registerBlockList.appendChild(register)
-			
-			# Offset tag
-			regOffset = doc.createElement("Offset")
-			regOffsetText = doc.createTextNode(hex(reg.offset))
-			regOffset.appendChild(regOffsetText)
-			register.appendChild(regOffset)
-		
-		# UsedBaseClockList tag
-		usedBaseClockList = doc.createElement("UsedBaseClockList")
-		compResults.appendChild(usedBaseClockList)
-		for clk in self.usedBaseClocks:
-			clock = doc.createElement("BaseClock")
-			clock.setAttribute("name",clk.name)
-			clockText = doc.createTextNode("")
-			clock.appendChild(clockText)
-			usedBaseClockList.appendChild(clock)
-		
-		# NIFPGA version tag
-		niFpgaVersion = doc.createElement("version")
-		niFpgaVersionText = doc.createTextNode("1")
-		niFpgaVersion.appendChild(niFpgaVersionText)
-		niFpga.appendChild(niFpgaVersion)
-		
-		# MultipleUserClocks tag
-		multipleUserClocks = doc.createElement("MultipleUserClocks")
-		multipleUserClocksText = doc.createTextNode(str(self.multipleUserClocks).lower())
-		multipleUserClocks.appendChild(multipleUserClocksText)
-		projectNode.appendChild(multipleUserClocks)
-		
-		# ClientData tag
-		clientData = doc.createElement("ClientData")
-		root.appendChild(clientData)
-		
-		# Bitstream tag
-        import base64
-		bitstream = doc.createElement("Bitstream")
-		bitstreamText = doc.createTextNode(base64.base64encode(self.bitstream))
-		bitstream.appendChild(bitstreamText)
-		root.appendChild(bitstream)
-		
-		return root.toprettyxml()
-		
-#lvc = LVBitxCreate()
-#lvc.registers.append(Register())
-#lvc.registers[0].datatype = DatatypeArray()
-#lvc.channels.append(DmaChannel())
-#lvc.registerBlocks.append(RegisterBlock())
-#lvc.usedBaseClocks.append(BaseClock())
+class _Frozen():
+	"""
 
-#lvp = LVbitxParse()
-#lvp.OpenFile("NiFpga_niScopeEXP2PInterleavedDataFPGA.lvbitx")
-#lvc.registers = lvp.GetRegisterList()
-#lvc.channels = lvp.GetDmaChannels()
-#lvc.registerBlocks = lvp.GetRegisterBlocks()
-#lvc.usedBaseClocks = lvp.GetUsedBaseClocks()
+		Mixin making a model class immutable and hashable (see Freeze).
 
-#print lvc.Generate()
+	"""
+	__slots__ = ()
+
+	def __setattr__(self, name, value):
+		raise AttributeError("%s is immutable" % type(self).__name__)
+
+	def __delattr__(self, name):
+		raise AttributeError("%s is immutable" % type(self).__name__)
+
+	def _Key(self):
+		return tuple(getattr(self, name) for name in _SlotNames(type(self)))
+
+	def __eq__(self, other):
+		return type(self) is type(other) and self._Key() == other._Key()
+
+	def __ne__(self, other):
+		return not self == other
+
+	def __hash__(self):
+		return hash(self._Key())
+
+	def __reduce__(self):
+		return (Freeze, (Thaw(self),))
+
+class FrozenDatatype(_Frozen, Datatype):
+	"""
+
+		Immutable Datatype
+
+	"""
+	__slots__ = ()
+
+class FrozenDatatypeArray(_Frozen, DatatypeArray):
+	"""
+
+		Immutable DatatypeArray
+
+	"""
+	__slots__ = ()
+
+class FrozenRegister(_Frozen, Register):
+	"""
+
+		Immutable Register
+
+	"""
+	__slots__ = ()
+
+class FrozenRegisterBlock(_Frozen, RegisterBlock):
+	"""
+
+		Immutable RegisterBlock
+
+	"""
+	__slots__ = ()
+
+class FrozenDmaDatatype(_Frozen, DmaDatatype):
+	"""
+
+		Immutable DmaDatatype
+
+	"""
+	__slots__ = ()
+
+class FrozenDmaChannel(_Frozen, DmaChannel):
+	"""
+
+		Immutable DmaChannel
+
+	"""
+	__slots__ = ()
+
+class FrozenBaseClock(_Frozen, BaseClock):
+	"""
+
+		Immutable BaseClock
+
+	"""
+	__slots__ = ()
+
+class FrozenIcon(_Frozen, Icon):
+	"""
+
+		Immutable Icon (rectangle is a tuple)
+
+	"""
+	__slots__ = ()
+
+class FrozenBitfile(_Frozen, Bitfile):
+	"""
+
+		Immutable Bitfile (lists are tuples of frozen objects)
+
+	"""
+	__slots__ = ()
+
+_FrozenClasses = {Datatype:FrozenDatatype, DatatypeArray:FrozenDatatypeArray, Register:FrozenRegister,
+	RegisterBlock:FrozenRegisterBlock, DmaDatatype:FrozenDmaDatatype, DmaChannel:FrozenDmaChannel,
+	BaseClock:FrozenBaseClock, Icon:FrozenIcon, Bitfile:FrozenBitfile}
+_ThawedClasses = dict((frozen, cls) for cls, frozen in _FrozenClasses.items())
+_SlotNamesCache = {}
+
+def _SlotNames(cls):
+	"""
+
+		Returns the attribute names of a model class, inherited ones included.
+
+	"""
+	names = _SlotNamesCache.get(cls)
+	if names is None:
+		names = tuple(name for c in reversed(cls.__mro__) for name in c.__dict__.get("__slots__", ()))
+		_SlotNamesCache[cls] = names
+	return names
+
+def Freeze(obj):
+	"""
+
+		Makes an immutable, hashable copy of a model object (Register, DmaChannel, Bitfile, ...).
+		Nested models are frozen too and lists become tuples. Frozen objects can be shared between
+		threads and read without locking; they are instances of the original classes, so they can be
+		used wherever these are expected for reading.
+
+		Parameters:
+			obj             model object (frozen objects are returned as is)
+
+		Output:
+			frozen model object
+
+	"""
+	if isinstance(obj, _Frozen):
+		return obj
+	cls = _FrozenClasses[type(obj)]
+	frozen = cls.__new__(cls)
+	for name in _SlotNames(cls):
+		value = getattr(obj, name)
+		if isinstance(value, (list, tuple)):
+			value = tuple(Freeze(item) if type(item) in _FrozenClasses else item for item in value)
+		elif type(value) in _FrozenClasses:
+			value = Freeze(value)
+		object.__setattr__(frozen, name, value)
+	return frozen
+
+def Thaw(obj):
+	"""
+
+		Makes a mutable copy of a frozen model object. Nested models are thawed too and tuples become lists.
+
+		Parameters:
+			obj             frozen model object (mutable objects are returned as is)
+
+		Output:
+			model object
+
+	"""
+	if not isinstance(obj, _Frozen):
+		return obj
+	cls = _ThawedClasses[type(obj)]
+	thawed = cls.__new__(cls)
+	for name in _SlotNames(cls):
+		value = getattr(obj, name)
+		if isinstance(value, tuple):
+			value = [Thaw(item) for item in value]
+		elif isinstance(value, _Frozen):
+			value = Thaw(value)
+		setattr(thawed, name, value)
+	return thawed
+
+def _CopyModel(obj):
+	"""
+
+		Makes a deep copy of a mutable model object; nested models and lists are copied too.
+
+	"""
+	cls = type(obj)
+	copy = cls.__new__(cls)
+	for name in _SlotNames(cls):
+		value = getattr(obj, name)
+		if isinstance(value, list):
+			value = [_CopyModel(item) if type(item) in _FrozenClasses else item for item in value]
+		elif type(value) in _FrozenClasses:
+			value = _CopyModel(value)
+		setattr(copy, name, value)
+	return copy
+
+TypeCode = {u"Bool":0, u"I8":1, u"U8":2, u"I16":3, u"U16":4, u"I32":5, u"U32":6, u"I64":7, u"U64":8,u"Array":9}
+DirectionCode = {u"TargetToHost":0, u"HostToTarget":1}
+MechanicalActionCode = {u"Switch When Pressed":0, u"Switch When Released":1, u"Switch Until Released":2, u"Latch When Pressed":3, u"Latch When Released":4, u"Latch Until Released":5}
+ImplementationCode = {u"niFpgaPeerToPeerReader":0, u"niFpgaPeerToPeerWriter":1, u"niFpgaTargetToHost":2, u"niFpgaHostToTarget":3}
+ParserEngines = (u"dom", u"stream", u"lazy")
+
+class LVbitxError(Exception):
+	"""
+
+		Base class of the errors raised by this module
+
+	"""
+	pass
+
+class LVbitxParseError(LVbitxError, ValueError):
+	"""
+
+		Raised when a bitfile can't be parsed
+
+	"""
+	def __init__(self, message, source="", line=None, column=None):
+		LVbitxError.__init__(self, message)
+		self.source = source # file name, or "" for in-memory data
+		self.line = line # line of the error (1-based), if known
+		self.column = column # column of the error (0-based), if known
+
+class Codec():
+	"""
+
+		Converter between XML text and a model attribute value
+
+	"""
+	def __init__(self, decode, encode):
+		self.decode = decode # function converting text to value
+		self.encode = encode # function converting value to text
+
+	def Decode(self, text):
+		return self.decode(text)
+
+	def Encode(self, value):
+		return self.encode(value)
+
+class EnumCodec(Codec):
+	"""
+
+		Converter between enumeration names and numerical codes, with precomputed maps in both directions
+
+	"""
+	def __init__(self, codes):
+		self.codes = codes # name -> code dict
+		self.names = dict((v, k) for k, v in codes.items()) # code -> name dict
+
+	def Decode(self, text):
+		return self.codes[text]
+
+	def Encode(self, value):
+		return self.names[value]
+
+TextCodec = Codec(lambda text: text, lambda value: value)
+BoolCodec = Codec(lambda text: text == u"true", lambda value: str(value).lower())
+IntCodec = Codec(int, str)
+FloatCodec = Codec(float, str)
+HexCodec = Codec(lambda text: int(text,16), hex)
+TypeCodec = EnumCodec(TypeCode)
+DirectionCodec = EnumCodec(DirectionCode)
+MechanicalActionCodec = EnumCodec(MechanicalActionCode)
+ImplementationCodec = EnumCodec(ImplementationCode)
+
+class Field():
+	"""
+
+		Schema entry binding a child tag to a model attribute
+
+	"""
+	def __init__(self, tag, attribute=None, codec=TextCodec, schema=None, decode=None, encode=None, optional=False):
+		"""
+
+			Initialization.
+
+			Parameters:
+				tag             child tag name (str)
+				attribute       model attribute name; if None, the tag is written empty and ignored on read (str, optional)
+				codec           text converter (Codec, optional)
+				schema          schema of a nested model, used instead of codec (Schema, optional)
+				decode          function(node, reader) returning the value of a complex tag (callable, optional)
+				encode          function(value, tag, writer) writing a complex tag (callable, optional)
+				optional        if True, the tag is only written when the value is set (bool, optional)
+
+		"""
+		self.tag = tag
+		self.attribute = attribute
+		self.codec = codec
+		self.schema = schema
+		self.decode = decode
+		self.encode = encode
+		self.optional = optional
+
+	def Decode(self, obj, node, reader):
+		"""
+
+			Sets model attribute from a child node.
+
+		"""
+		if self.schema is not None:
+			setattr(obj, self.attribute, self.schema.Decode(node, reader))
+		elif self.decode is not None:
+			setattr(obj, self.attribute, self.decode(node, reader))
+		else:
+			text = reader.Text(node)
+			if text is None:
+				text = u""
+			if text != u"" or self.codec is TextCodec:
+				setattr(obj, self.attribute, self.codec.Decode(text))
+
+	def Encode(self, obj, writer):
+		"""
+
+			Writes model attribute as a child tag.
+
+		"""
+		if self.attribute is None:
+			writer.Element(self.tag)
+			return
+		value = getattr(obj, self.attribute)
+		if self.optional and not value:
+			return
+		if self.schema is not None:
+			self.schema.Encode(value, self.tag, writer)
+		elif self.encode is not None:
+			self.encode(value, self.tag, writer)
+		else:
+			writer.Element(self.tag, self.codec.Encode(value))
+
+class Schema():
+	"""
+
+		Declarative description of the XML form of a model class, shared by parser and generator
+
+	"""
+	def __init__(self, modelClass, fields, attributes=(), emptyText=False):
+		"""
+
+			Initialization.
+
+			Parameters:
+				modelClass      model class (class)
+				fields          child tags, in output order (list of Field objects)
+				attributes      XML attributes as (XML name, model attribute) pairs (list, optional)
+				emptyText       if True and there are no fields, the element is written with empty text
+								rather than as an empty-element tag (bool, optional)
+
+		"""
+		self.modelClass = modelClass
+		self.fields = fields
+		self.attributes = attributes
+		self.emptyText = emptyText
+		self.byTag = dict((f.tag, f) for f in fields if f.attribute is not None) # tag -> Field dict
+
+	def Decode(self, node, reader):
+		"""
+
+			Builds a model object from a node.
+
+			Parameters:
+				node            XML node (DOM or ElementTree element)
+				reader          node accessor matching node type (_DomReader or _EtreeReader)
+
+			Output:
+				model object
+
+		"""
+		obj = self.modelClass()
+		for name, attribute in self.attributes:
+			value = reader.Attribute(node, name)
+			if value is not None:
+				setattr(obj, attribute, value)
+		byTag = self.byTag
+		for child in reader.Children(node):
+			field = byTag.get(reader.Tag(child))
+			if field is not None:
+				field.Decode(obj, child, reader)
+		return obj
+
+	def Encode(self, obj, tag, writer):
+		"""
+
+			Writes a model object as an element.
+
+			Parameters:
+				obj             model object
+				tag             element tag name (str)
+				writer          XML writer (_XmlWriter)
+
+		"""
+		attrs = [(name, getattr(obj, attribute)) for name, attribute in self.attributes]
+		if len(self.fields) == 0 and self.emptyText:
+			writer.Element(tag, u"", attrs)
+			return
+		writer.Start(tag, attrs)
+		for field in self.fields:
+			field.Encode(obj, writer)
+		writer.End()
+
+class _EtreeReader():
+	"""
+
+		Node accessor for xml.etree.ElementTree elements
+
+	"""
+	@staticmethod
+	def Children(node):
+		return node
+
+	@staticmethod
+	def Tag(node):
+		return node.tag
+
+	@staticmethod
+	def Text(node):
+		return node.text
+
+	@staticmethod
+	def Attribute(node, name):
+		return node.get(name)
+
+class _DomReader():
+	"""
+
+		Node accessor for xml.dom.minidom elements
+
+	"""
+	@staticmethod
+	def Children(node):
+		return [x for x in node.childNodes if x.nodeType == x.ELEMENT_NODE]
+
+	@staticmethod
+	def Tag(node):
+		return node.tagName
+
+	@staticmethod
+	def Text(node):
+		texts = [x.data for x in node.childNodes if x.nodeType in (x.TEXT_NODE, x.CDATA_SECTION_NODE)]
+		if len(texts) == 0:
+			return None
+		return u"".join(texts)
+
+	@staticmethod
+	def Attribute(node, name):
+		if node.hasAttribute(name):
+			return node.getAttribute(name)
+		return None
+
+def _DecodeTypeTag(node, reader):
+	"""
+
+		Builds a Datatype object from a type tag (<U32>, <Bool>, ...).
+
+	"""
+	dtype = DatatypeSchema.Decode(node, reader)
+	dtype.type = TypeCodec.Decode(reader.Tag(node))
+	return dtype
+
+def _DecodeDatatype(node, reader):
+	"""
+
+		Builds a Datatype or DatatypeArray object from a register <Datatype> tag.
+
+	"""
+	for x in reader.Children(node):
+		if reader.Tag(x) == u"Array":
+			return DatatypeArraySchema.Decode(x, reader)
+		return _DecodeTypeTag(x, reader)
+	return Datatype()
+
+def _DecodeArrayType(node, reader):
+	"""
+
+		Builds the Datatype object of an array <Type> tag.
+
+	"""
+	for x in reader.Children(node):
+		return _DecodeTypeTag(x, reader)
+	return Datatype()
+
+def _EncodeArrayType(dtype, tag, writer):
+	"""
+
+		Writes the Datatype object of an array as a <Type> tag.
+
+	"""
+	writer.Start(tag)
+	DatatypeSchema.Encode(dtype, TypeCodec.Encode(dtype.type), writer)
+	writer.End()
+
+def _EncodeDatatype(dtype, tag, writer):
+	"""
+
+		Writes a Datatype or DatatypeArray object as a register <Datatype> tag.
+
+	"""
+	writer.Start(tag)
+	if isinstance(dtype, DatatypeArray):
+		DatatypeArraySchema.Encode(dtype, u"Array", writer)
+	else:
+		DatatypeSchema.Encode(dtype, TypeCodec.Encode(dtype.type), writer)
+	writer.End()
+
+_RectangleTags = (u"Left", u"Top", u"Right", u"Bottom")
+
+def _DecodeRectangle(node, reader):
+	"""
+
+		Reads an icon <Rectangle> tag as a [left, top, right, bottom] list.
+
+	"""
+	rectangle = [0,0,0,0]
+	for x in reader.Children(node):
+		if reader.Tag(x) in _RectangleTags:
+			rectangle[_RectangleTags.index(reader.Tag(x))] = int(reader.Text(x))
+	return rectangle
+
+def _EncodeRectangle(rectangle, tag, writer):
+	"""
+
+		Writes a [left, top, right, bottom] list as an icon <Rectangle> tag.
+
+	"""
+	writer.Start(tag)
+	for i in range(4):
+		writer.Element(_RectangleTags[i], str(rectangle[i]))
+	writer.End()
+
+DatatypeSchema = Schema(Datatype, [
+	Field(u"Name", "name"),
+	])
+DatatypeArraySchema = Schema(DatatypeArray, [
+	Field(u"Name", "name"),
+	Field(u"Size", "size", IntCodec),
+	Field(u"Type", "type", decode=_DecodeArrayType, encode=_EncodeArrayType),
+	])
+RegisterSchema = Schema(Register, [
+	Field(u"Name", "name"),
+	Field(u"Hidden", "hidden", BoolCodec),
+	Field(u"Indicator", "indicator", BoolCodec),
+	Field(u"Datatype", "datatype", decode=_DecodeDatatype, encode=_EncodeDatatype),
+	Field(u"FlattenedType", "flattenedType"),
+	Field(u"Grouping"),
+	Field(u"Offset", "offset", IntCodec),
+	Field(u"SizeInBits", "sizeInBits", IntCodec),
+	Field(u"Class", "classId", IntCodec),
+	Field(u"Internal", "internal", BoolCodec),
+	Field(u"TypedefPath"),
+	Field(u"ID", "id", IntCodec),
+	Field(u"Bidirectional", "bidirectional", BoolCodec),
+	Field(u"Synchronous", "synchronous", BoolCodec),
+	Field(u"MechanicalAction", "mechanicalAction", MechanicalActionCodec),
+	Field(u"AccessMayTimeout", "accessMayTimeout", BoolCodec),
+	Field(u"RegisterNode", "registerNode", BoolCodec),
+	Field(u"SubControlList"),
+	])
+DmaDatatypeSchema = Schema(DmaDatatype, [
+	Field(u"Delta", "delta", FloatCodec),
+	Field(u"IntegerWordLength", "integerWordLength", IntCodec),
+	Field(u"Maximum", "maximum", FloatCodec),
+	Field(u"Minimum", "minimum", FloatCodec),
+	Field(u"Signed", "signed", BoolCodec),
+	Field(u"SubType", "subtype", TypeCodec),
+	Field(u"WordLength", "wordLength", IntCodec),
+	])
+DmaChannelSchema = Schema(DmaChannel, [
+	Field(u"BaseAddressTag", "baseAddressTag"),
+	Field(u"ControlSet", "controlSet", IntCodec),
+	Field(u"DataType", "datatype", schema=DmaDatatypeSchema),
+	Field(u"Direction", "direction", DirectionCodec),
+	Field(u"Implementation", "implementation", ImplementationCodec),
+	Field(u"Number", "number", IntCodec),
+	Field(u"NumberOfElements", "numberOfElements", IntCodec),
+	Field(u"UserVisible", "userVisible", BoolCodec),
+	Field(u"WriteWindowAddressTag", "writeWindowAddressTag", optional=True),
+	Field(u"WriteWindowSize", "writeWindowSize", IntCodec, optional=True),
+	], attributes=[(u"name", "name")])
+RegisterBlockSchema = Schema(RegisterBlock, [
+	Field(u"Offset", "offset", HexCodec),
+	], attributes=[(u"name", "name")])
+BaseClockSchema = Schema(BaseClock, [], attributes=[(u"name", "name")], emptyText=True)
+IconSchema = Schema(Icon, [
+	Field(u"ImageType", "imageType", IntCodec),
+	Field(u"ImageDepth", "imageDepth", IntCodec),
+	Field(u"Image", "image"),
+	Field(u"Mask", "mask"),
+	Field(u"Colors", "colors"),
+	Field(u"Rectangle", "rectangle", decode=_DecodeRectangle, encode=_EncodeRectangle),
+	])
+
+_Base64Whitespace = b" \t\r\n"
+
+def _Base64Slice(data, start, end):
+	"""
+
+		Returns a range of base64 encoded text as bytes, whitespace removed.
+
+		Parameters:
+			data            encoded text (str, or bytes-like object such as mmap)
+			start           start of the range (int)
+			end             end of the range (int, excluded)
+
+		Output:
+			encoded characters (bytes)
+
+	"""
+	if isinstance(data, str):
+		return data[start:end].encode("ascii").translate(None, _Base64Whitespace)
+	return data[start:end].translate(None, _Base64Whitespace)
+
+def _Base64Chunks(data, start, end, chunkSize=1<<20):
+	"""
+
+		Decodes a range of base64 encoded text chunk by chunk.
+		Chunks are cut on 4-character boundaries (whitespace excluded), so that each of them
+		decodes on its own and memory use doesn't depend on the size of the range.
+
+		Parameters:
+			data            encoded text (str, or bytes-like object such as mmap)
+			start           start of the range (int)
+			end             end of the range (int, excluded)
+			chunkSize       number of encoded bytes decoded at a time (int, optional)
+
+		Output:
+			generator of decoded binary chunks (bytes)
+
+	"""
+	import binascii
+	chunkSize = max(4, chunkSize - chunkSize % 4)
+	rest = b""
+	for pos in range(start, end, chunkSize):
+		chunk = rest + _Base64Slice(data, pos, min(pos + chunkSize, end))
+		cut = len(chunk) - len(chunk) % 4
+		rest = chunk[cut:]
+		if cut > 0:
+			yield binascii.a2b_base64(chunk[:cut])
+	if len(rest) > 0:
+		yield binascii.a2b_base64(rest)
+
+def _Base64Length(data, start, end, chunkSize=1<<20):
+	"""
+
+		Computes the decoded length of a range of base64 encoded text without decoding it.
+
+		Parameters:
+			data            encoded text (str, or bytes-like object such as mmap)
+			start           start of the range (int)
+			end             end of the range (int, excluded)
+			chunkSize       number of encoded bytes scanned at a time (int, optional)
+
+		Output:
+			decoded length in bytes (int)
+
+	"""
+	count = 0
+	tail = b""
+	for pos in range(start, end, chunkSize):
+		chunk = _Base64Slice(data, pos, min(pos + chunkSize, end))
+		count += len(chunk)
+		tail = (tail + chunk)[-2:]
+	return count * 3 // 4 - tail.count(b"=")
+
+def _WriteAll(sink, data):
+	"""
+
+		Writes data to a file-like object or socket, retrying on partial writes.
+
+		Parameters:
+			sink            destination (object with a write or sendall method)
+			data            data to write (bytes-like object)
+
+	"""
+	if not hasattr(sink, "write"):
+		sink.sendall(data)
+		return
+	view = memoryview(data)
+	while len(view) > 0:
+		n = sink.write(view)
+		if n is None:
+			break
+		view = view[n:]
+
+def _Base64EncodeChunks(data, chunkSize=3<<18):
+	"""
+
+		Base64 encodes binary data chunk by chunk.
+		Chunks are cut on 3-byte boundaries, so that their concatenation is the encoding of the whole.
+
+		Parameters:
+			data            binary data (bytes-like object, str, or readable binary file-like object)
+			chunkSize       number of bytes encoded at a time (int, optional)
+
+		Output:
+			generator of encoded chunks (bytes)
+
+	"""
+	import binascii
+	chunkSize = max(3, chunkSize - chunkSize % 3)
+	if hasattr(data, "read"):
+		rest = b""
+		while True:
+			chunk = data.read(chunkSize)
+			if not chunk:
+				break
+			chunk = rest + chunk
+			cut = len(chunk) - len(chunk) % 3
+			rest = chunk[cut:]
+			if cut > 0:
+				yield binascii.b2a_base64(chunk[:cut], newline=False)
+		if len(rest) > 0:
+			yield binascii.b2a_base64(rest, newline=False)
+		return
+	if isinstance(data, str):
+		data = data.encode("latin-1")
+	view = memoryview(data).cast("B")
+	for pos in range(0, len(view), chunkSize):
+		yield binascii.b2a_base64(view[pos:pos + chunkSize], newline=False)
+
+class _XmlWriter():
+	"""
+
+		Incremental XML writer used by LVBitxCreate.
+		Output is buffered in small pieces and passed to a write function; an element
+		opened with Start and closed without content is written as an empty-element tag.
+		Pretty output follows the layout of xml.dom.minidom's toprettyxml.
+
+	"""
+	def __init__(self, write, pretty=False, bufferSize=1<<16):
+		"""
+
+			Initialization.
+
+			Parameters:
+				write           function receiving output text (callable)
+				pretty          if True, indents output with tabs and newlines (bool, optional)
+				bufferSize      number of characters buffered before calling write (int, optional)
+
+		"""
+		self.write = write # output function
+		self.pretty = pretty # if True, indents output
+		self.bufferSize = bufferSize # buffered characters threshold
+		self.parts = [] # buffered output pieces
+		self.size = 0 # number of buffered characters
+		self.tags = [] # currently open tags
+		self.pending = False # if True, the last start tag hasn't been closed with '>' yet
+		self.inline = False # if True, text has been written in the current element
+
+	def _Out(self, text):
+		self.parts.append(text)
+		self.size += len(text)
+		if self.size >= self.bufferSize:
+			self.Flush()
+
+	def _Indent(self):
+		if self.pretty:
+			return "\t" * len(self.tags)
+		return ""
+
+	def _Newline(self):
+		if self.pretty:
+			return "\n"
+		return ""
+
+	def _Open(self, text):
+		if self.pending:
+			self._Out(">" + self._Newline())
+			self.pending = False
+		self._Out(self._Indent() + text)
+
+	def Start(self, tag, attrs=None):
+		"""
+
+			Opens an element.
+
+			Parameters:
+				tag             tag name (str)
+				attrs           list of (name, value) attribute pairs (list, optional)
+
+		"""
+		self._Open("<" + tag + _XmlAttributes(attrs))
+		self.tags.append(tag)
+		self.pending = True
+
+	def End(self):
+		"""
+
+			Closes the last opened element.
+
+		"""
+		tag = self.tags.pop()
+		if self.pending:
+			self._Out("/>" + self._Newline())
+		elif self.inline:
+			self._Out("</" + tag + ">" + self._Newline())
+		else:
+			self._Out(self._Indent() + "</" + tag + ">" + self._Newline())
+		self.pending = False
+		self.inline = False
+
+	def Element(self, tag, text=None, attrs=None):
+		"""
+
+			Writes a complete element.
+
+			Parameters:
+				tag             tag name (str)
+				text            element text, or None for an empty-element tag (str, optional)
+				attrs           list of (name, value) attribute pairs (list, optional)
+
+		"""
+		if text is None:
+			self._Open("<" + tag + _XmlAttributes(attrs) + "/>" + self._Newline())
+		else:
+			self._Open("<" + tag + _XmlAttributes(attrs) + ">" + _XmlEscape(text) + "</" + tag + ">" + self._Newline())
+
+	def Text(self, text):
+		"""
+
+			Writes text inside the last opened element. Several calls may follow each other.
+
+			Parameters:
+				text            text (str)
+
+		"""
+		if self.pending:
+			self._Out(">")
+			self.pending = False
+		self.inline = True
+		self._Out(_XmlEscape(text))
+
+	def Flush(self):
+		"""
+
+			Passes buffered output to the write function.
+
+		"""
+		if len(self.parts) > 0:
+			self.write("".join(self.parts))
+			self.parts = []
+			self.size = 0
+
+def _XmlEscape(text):
+	"""
+
+		Escapes text for XML content or attribute values (same rules as xml.dom.minidom).
+
+	"""
+	return text.replace("&", "&amp;").replace("<", "&lt;").replace("\"", "&quot;").replace(">", "&gt;")
+
+def _XmlAttributes(attrs):
+	"""
+
+		Formats a list of (name, value) attribute pairs.
+
+	"""
+	if not attrs:
+		return ""
+	return "".join(" %s=\"%s\"" % (name, _XmlEscape(value)) for name, value in attrs)
+
+class _StreamHandler():
+	"""
+
+		Expat event handlers for the streaming parser engine, filling a Bitfile object.
+		Only one record element (register, channel, ...) is held in memory at a time:
+		it is built with an ElementTree builder, converted to a model object and released.
+		Character data of the <Bitstream> tag is not kept; only its byte range is recorded.
+		The handlers can also be fed from a DOM walk, in which case parser is None.
+
+	"""
+	# record tag -> (parent tags, schema, Bitfile attribute, True if attribute is a list)
+	records = {
+		u"Register":((u"RegisterList",), RegisterSchema, "registers", True),
+		u"Channel":((u"DmaChannelAllocationList",), DmaChannelSchema, "channels", True),
+		u"RegisterBlock":((u"RegisterBlockList",), RegisterBlockSchema, "registerBlocks", True),
+		u"BaseClock":((u"UsedBaseClockList",), BaseClockSchema, "usedBaseClocks", True),
+		u"Icon":((u"VI", u"Bitfile"), IconSchema, "icon", False),
+		}
+	# text field tag -> (parent tags, Bitfile attribute, codec)
+	fields = {
+		u"BitfileVersion":((u"Bitfile",), "bitfileVersion", TextCodec),
+		u"SignatureRegister":((u"Bitfile",), "signatureRegister", TextCodec),
+		u"SignatureGuids":((u"Bitfile",), "signatureGuids", TextCodec),
+		u"SignatureNames":((u"Bitfile",), "signatureNames", TextCodec),
+		u"TimeStamp":((u"Bitfile",), "timeStamp", TextCodec),
+		u"Name":((u"VI",), "viName", TextCodec),
+		u"TargetClass":((u"Project",), "targetClass", TextCodec),
+		u"AutoRunWhenDownloaded":((u"Project",), "autoRunWhenDownloaded", BoolCodec),
+		u"MultipleUserClocks":((u"Project",), "multipleUserClocks", BoolCodec),
+		}
+
+	def __init__(self, parser=None):
+		"""
+
+			Initialization.
+
+			Parameters:
+				parser          expat parser the handlers are attached to (xmlparser, optional)
+
+		"""
+		self.parser = parser # expat parser (released after parsing)
+		self.path = [] # tag names of currently open elements
+		self.builder = None # ElementTree builder for the record being read
+		self.record = None # tag name of the record being read
+		self.recordDepth = 0 # nesting depth of the record being read
+		self.field = None # tag name of the text field being read
+		self.text = None # character data buffer for the text field being read
+		self.seen = set() # text fields already read
+		self.inBitstream = False # if True, the parser is inside <Bitstream>
+		self.bitfile = Bitfile() # extracted models
+		self.bitstreamRange = None # (start, end) byte offsets of the encoded bitstream
+		if parser is not None:
+			parser.StartElementHandler = self.StartElement
+			parser.EndElementHandler = self.EndElement
+			parser.CharacterDataHandler = self.CharacterData
+
+	def StartElement(self, name, attrs):
+		parent = self.path[-1] if self.path else None
+		if self.builder is not None:
+			self.builder.start(name, attrs)
+		elif name in self.records and parent in self.records[name][0]:
+			from xml.etree.ElementTree import TreeBuilder
+			self.builder = TreeBuilder()
+			self.record = name
+			self.recordDepth = len(self.path)
+			self.builder.start(name, attrs)
+		elif name in self.fields and parent in self.fields[name][0] and name not in self.seen:
+			self.field = name
+			self.text = []
+		elif name == u"Bitstream" and self.bitstreamRange is None:
+			self.inBitstream = True
+			self.bitstreamRange = (None, None)
+		self.path.append(name)
+
+	def EndElement(self, name):
+		self.path.pop()
+		if self.builder is not None:
+			self.builder.end(name)
+			if len(self.path) == self.recordDepth:
+				parents, schema, target, isList = self.records[self.record]
+				obj = schema.Decode(self.builder.close(), _EtreeReader)
+				if isList: getattr(self.bitfile, target).append(obj)
+				else: setattr(self.bitfile, target, obj)
+				self.builder = None
+				self.record = None
+		elif self.field is not None:
+			parents, target, codec = self.fields[self.field]
+			setattr(self.bitfile, target, codec.Decode(u"".join(self.text)))
+			self.seen.add(self.field)
+			self.field = None
+			self.text = None
+		elif self.inBitstream:
+			start = self.bitstreamRange[0]
+			end = self.parser.CurrentByteIndex if self.parser is not None else 0
+			if start is None: start = end
+			self.bitstreamRange = (start, end)
+			self.inBitstream = False
+
+	def Get(self, name):
+		"""
+
+			Returns an attribute of the extracted Bitfile.
+
+		"""
+		return getattr(self.bitfile, name)
+
+	def CharacterData(self, data):
+		if self.builder is not None:
+			self.builder.data(data)
+		elif self.text is not None:
+			self.text.append(data)
+		elif self.inBitstream and self.bitstreamRange[0] is None and self.parser is not None:
+			self.bitstreamRange = (self.parser.CurrentByteIndex, None)
+
+def _OpenSource(source):
+	"""
+
+		Normalizes an input accepted by LVbitxParse.OpenFile.
+		File objects are read from their current position: regular files (io.FileIO, or a buffered
+		reader over one) positioned at their start are memory mapped, other file objects (including
+		decompressing ones such as gzip.GzipFile, whose fileno is the compressed file) and streams
+		are read once. Buffers are used in place and
+		zip members are read once.
+
+		Parameters:
+			source          file name or path, bytes, bytearray, memoryview, mmap, binary file-like
+							object, or zipfile.Path
+
+		Output:
+			(name, data) tuple; data is None for file names, otherwise a bytes, bytearray or mmap object
+
+	"""
+	import io, mmap, os, stat, zipfile
+	if isinstance(source, zipfile.Path):
+		with source.open("rb") as f:
+			return str(source), f.read()
+	if isinstance(source, (str, os.PathLike)):
+		return os.fspath(source), None
+	if isinstance(source, (bytes, bytearray, mmap.mmap)):
+		return "", source
+	if isinstance(source, memoryview):
+		if isinstance(source.obj, (bytes, bytearray, mmap.mmap)) and source.c_contiguous and source.nbytes == len(source.obj):
+			return "", source.obj
+		return "", source.tobytes()
+	if hasattr(source, "read"):
+		name = getattr(source, "name", "")
+		name = name if isinstance(name, str) else ""
+		if isinstance(getattr(source, "raw", source), io.FileIO):
+			try:
+				fd = source.fileno()
+				info = os.fstat(fd)
+				if stat.S_ISREG(info.st_mode) and info.st_size > 0 and source.tell() == 0:
+					return name, mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+			except (OSError, ValueError, io.UnsupportedOperation):
+				pass
+		if isinstance(source, io.BytesIO) and source.tell() == 0:
+			return name, source.getvalue()
+		return name, source.read()
+	raise TypeError("unsupported bitfile source: %s" % type(source).__name__)
+
+def _MapFile(fileName):
+	"""
+
+		Maps a file in memory (read-only).
+
+	"""
+	import mmap, os
+	with open(fileName, "rb") as f:
+		if os.fstat(f.fileno()).st_size == 0:
+			raise LVbitxParseError("%s: empty file" % fileName, fileName)
+		return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+class _BufferReader():
+	"""
+
+		Minimal binary file-like reader over a buffer, to parse in-memory data with minidom without copying it whole.
+
+	"""
+	def __init__(self, data):
+		self.data = data
+		self.pos = 0
+
+	def read(self, size=-1):
+		end = len(self.data) if size is None or size < 0 else min(len(self.data), self.pos + size)
+		chunk = bytes(self.data[self.pos:end])
+		self.pos = end
+		return chunk
+
+class _LazyIndex():
+	"""
+
+		Section index of the "lazy" parser engine.
+		Opening only maps the file and scans its bytes for the boundaries of the top-level sections
+		and of the bitstream. A section is parsed (with the streaming engine handlers) the first
+		time it is requested and the result is kept; header fields and project flags come from a
+		parse of everything outside the indexed sections and the bitstream.
+		Exposes the same bitfile, bitstreamRange and Get interface as _StreamHandler.
+
+	"""
+	# Bitfile attribute -> (section tag, tags of the elements enclosing the section)
+	sections = {
+		"registers":(u"RegisterList", (u"Bitfile", u"VI")),
+		"icon":(u"Icon", (u"Bitfile",)),
+		"channels":(u"DmaChannelAllocationList", (u"Bitfile", u"Project", u"CompilationResultsTree", u"CompilationResults")),
+		"registerBlocks":(u"RegisterBlockList", (u"Bitfile", u"Project", u"CompilationResultsTree", u"CompilationResults")),
+		"usedBaseClocks":(u"UsedBaseClockList", (u"Bitfile", u"Project", u"CompilationResultsTree", u"CompilationResults")),
+		}
+
+	def __init__(self, data, source=""):
+		"""
+
+			Initialization.
+
+			Parameters:
+				data            file data (bytes, bytearray or mmap)
+				source          file name, reported in parse errors (str, optional)
+
+		"""
+		import threading
+		limit = data.find(b"<Bitstream>")
+		if limit >= 0:
+			start = limit + len(b"<Bitstream>")
+			end = data.rfind(b"</Bitstream>", start)
+			self.bitstreamRange = (start, end if end >= 0 else start) # (start, end) byte offsets of the encoded bitstream
+		else:
+			limit = len(data)
+			self.bitstreamRange = None
+		if data.find(b"<Bitfile", 0, limit) < 0:
+			raise ValueError("not a bitfile")
+		self.data = data # file data
+		self.source = source # file name, for error messages
+		self.limit = limit # end of the metadata
+		self.ranges = {} # Bitfile attribute -> (start, end) byte range of its section
+		for name, (tag, parents) in self.sections.items():
+			section = _FindSection(data, tag.encode("ascii"), 0, limit)
+			if section is not None:
+				self.ranges[name] = section
+		self.parsed = {} # Bitfile attribute -> parsed section
+		self.skeleton = None # Bitfile object holding fields outside of indexed sections
+		self.lock = threading.Lock()
+
+	def Get(self, name):
+		"""
+
+			Returns a Bitfile attribute, parsing the part of the file holding it if not done yet.
+
+		"""
+		with self.lock:
+			if name in self.sections:
+				if name not in self.parsed:
+					if name in self.ranges:
+						bitfile = self._Parse([self.ranges[name]], self.sections[name][1])
+						self.parsed[name] = getattr(bitfile, name)
+					else:
+						self.parsed[name] = getattr(Bitfile(), name)
+				return self.parsed[name]
+			if self.skeleton is None:
+				pieces = []
+				pos = 0
+				for start, end in sorted(self.ranges.values()):
+					pieces.append((pos, start))
+					pos = end
+				pieces.append((pos, self.limit))
+				self.skeleton = self._Parse(pieces, ())
+			return getattr(self.skeleton, name)
+
+	@property
+	def bitfile(self):
+		bitfile = Bitfile()
+		for name in Bitfile.__slots__:
+			setattr(bitfile, name, self.Get(name))
+		return bitfile
+
+	def _Parse(self, pieces, path):
+		"""
+
+			Runs the streaming engine handlers over byte ranges of the file.
+
+			Parameters:
+				pieces          list of (start, end) byte ranges, fed in order
+				path            tags of the elements enclosing the first range (tuple)
+
+			Output:
+				Bitfile object
+
+			Raises LVbitxParseError if the data is malformed or holds invalid values (line and column
+			are relative to the first range).
+
+		"""
+		from xml.parsers import expat
+		parser = expat.ParserCreate()
+		handler = _StreamHandler(parser)
+		handler.path = list(path)
+		name = self.source or "<data>"
+		try:
+			for start, end in pieces:
+				parser.Parse(self.data[start:end], False)
+		except LVbitxError:
+			raise
+		except expat.ExpatError as e:
+			raise LVbitxParseError("%s: section at byte %d: %s" % (name, pieces[0][0], expat.ErrorString(e.code)), self.source, e.lineno, e.offset)
+		except Exception as e:
+			raise LVbitxParseError("%s: section at byte %d: %s: %s" % (name, pieces[0][0], type(e).__name__, e), self.source)
+		handler.parser = None
+		return handler.bitfile
+
+def _FindSection(data, tag, start, end):
+	"""
+
+		Finds the byte range of an element by scanning for its tags.
+
+		Parameters:
+			data            file data (bytes-like object, e.g. mmap)
+			tag             tag name (bytes)
+			start           offset to search from (int)
+			end             offset to search up to (int)
+
+		Output:
+			(start, end) tuple, or None if there's no such element
+
+	"""
+	pos = data.find(b"<" + tag, start, end)
+	while pos >= 0 and data[pos + len(tag) + 1:pos + len(tag) + 2] not in (b">", b"/", b" ", b"\t", b"\r", b"\n"):
+		pos = data.find(b"<" + tag, pos + 1, end)
+	if pos < 0:
+		return None
+	close, selfClosing = _StartTag(data, pos)
+	if selfClosing:
+		return (pos, close)
+	stop = data.find(b"</" + tag + b">", close, end)
+	if stop < 0:
+		raise ValueError("unterminated element %s" % tag.decode("ascii"))
+	return (pos, stop + len(tag) + 3)
+
+class Stats():
+	"""
+
+		Opt-in instrumentation collector: phase timers, counters and callbacks.
+		Pass one to LVbitxParse or LVBitxCreate (stats argument) to record where time goes;
+		without it, instrumented code only pays for an "is None" test per call.
+		Phase names: "parse", "load", "extract.<section>", "bitstream.decode", "bitstream.encode",
+		"serialize". Counters: "xml.elements", "xml.bytes", "bitstream.bytesDecoded",
+		"bitstream.bytesEncoded".
+
+	"""
+	def __init__(self, callback=None):
+		"""
+
+			Initialization.
+
+			Parameters:
+				callback        function called as callback(kind, name, value) each time a phase ends
+								(kind "phase", value in seconds) or a counter is incremented
+								(kind "counter", value is the increment) (callable, optional)
+
+		"""
+		import threading
+		self.phases = {} # phase name -> [total time in seconds, number of runs]
+		self.counters = {} # counter name -> value
+		self.callbacks = [callback] if callback is not None else [] # functions called on each event
+		self._lock = threading.Lock()
+
+	def Phase(self, name):
+		"""
+
+			Times a phase.
+
+			Parameters:
+				name            phase name (str)
+
+			Output:
+				context manager
+
+		"""
+		return _StatsPhase(self, name)
+
+	def AddTime(self, name, seconds):
+		"""
+
+			Adds a run to a phase.
+
+			Parameters:
+				name            phase name (str)
+				seconds         run duration (float)
+
+		"""
+		with self._lock:
+			phase = self.phases.setdefault(name, [0.0, 0])
+			phase[0] += seconds
+			phase[1] += 1
+		for callback in self.callbacks:
+			callback("phase", name, seconds)
+
+	def Count(self, name, n=1):
+		"""
+
+			Increments a counter.
+
+			Parameters:
+				name            counter name (str)
+				n               increment (int, optional)
+
+		"""
+		with self._lock:
+			self.counters[name] = self.counters.get(name, 0) + n
+		for callback in self.callbacks:
+			callback("counter", name, n)
+
+	def TimeChunks(self, name, chunks, counter=None):
+		"""
+
+			Times the production of chunks by an iterator, leaving out the time spent by the consumer.
+
+			Parameters:
+				name            phase name (str)
+				chunks          iterable of bytes-like objects
+				counter         counter incremented by the total chunk size (str, optional)
+
+			Output:
+				generator of the same chunks
+
+		"""
+		from time import perf_counter
+		chunks = iter(chunks)
+		total = 0.0
+		size = 0
+		try:
+			while True:
+				start = perf_counter()
+				try:
+					chunk = next(chunks)
+				except StopIteration:
+					break
+				total += perf_counter() - start
+				size += len(chunk)
+				yield chunk
+		finally:
+			if hasattr(chunks, "close"):
+				chunks.close()
+			self.AddTime(name, total)
+			if counter is not None:
+				self.Count(counter, size)
+
+	def Export(self):
+		"""
+
+			Returns collected values, e.g. for a metrics system.
+
+			Output:
+				dict with "phases" (name -> {"seconds", "calls"}) and "counters" (name -> value)
+
+		"""
+		with self._lock:
+			return {"phases":dict((name, {"seconds":seconds, "calls":calls}) for name, (seconds, calls) in self.phases.items()),
+				"counters":dict(self.counters)}
+
+	def Reset(self):
+		"""
+
+			Clears collected values.
+
+		"""
+		with self._lock:
+			self.phases.clear()
+			self.counters.clear()
+
+class _StatsPhase():
+	"""
+
+		Context manager timing a Stats phase.
+
+	"""
+	__slots__ = ("stats", "name", "start")
+
+	def __init__(self, stats, name):
+		self.stats = stats
+		self.name = name
+
+	def __enter__(self):
+		from time import perf_counter
+		self.start = perf_counter()
+		return self
+
+	def __exit__(self, *exc):
+		from time import perf_counter
+		self.stats.AddTime(self.name, perf_counter() - self.start)
+		return False
+
+def _Timed(phase):
+	"""
+
+		Method decorator timing calls as a phase of the instance's stats object, if it has one.
+
+	"""
+	import functools
+	def decorate(method):
+		@functools.wraps(method)
+		def timed(self, *args, **kwargs):
+			if self.stats is None:
+				return method(self, *args, **kwargs)
+			with self.stats.Phase(phase):
+				return method(self, *args, **kwargs)
+		return timed
+	return decorate
+
+class LVbitxParse:
+	"""
+	
+		LVBITX parser class
+	
+	"""
+	def __init__(self, fileName="", engine="dom", stats=None, validate=False):
+		"""
+		
+			Initialization.
+			
+			Parameters:
+				fileName        LVBITX file name, or any other source accepted by OpenFile (optional)
+				engine          parser engine, one of ParserEngines (str, optional)
+								"dom" keeps the whole document in memory,
+								"stream" extracts all models in one forward pass and keeps only those,
+								"lazy" indexes sections and parses each one on first use
+				stats           instrumentation collector (Stats, optional)
+				validate        if True, files are checked with ValidateBitfile when opened and
+								the findings are stored in diagnostics (bool, optional)
+		
+		"""
+		if engine not in ParserEngines:
+			raise ValueError("unknown parser engine: %s" % engine)
+		self.engine = engine
+		self.stats = stats # instrumentation collector (Stats object or None)
+		self.validate = validate # if True, files are validated when opened
+		self.diagnostics = [] # findings of the last validation (list of Diagnostic objects)
+		self.fileName = ""
+		self.bitx = None # DOM document ("dom" engine)
+		self.stream = None # extracted models ("stream" engine) or section index ("lazy" engine)
+		self.data = None # in-memory or mapped file data, None when the "dom" engine reads fileName
+		self.mapped = None # memory map opened by the parser, released by Close
+		if fileName!="":
+			self.OpenFile(fileName)
+	
+	def __enter__(self):
+		return self
+	
+	def __exit__(self, *exc):
+		self.Close()
+		return False
+	
+	def Close(self):
+		"""
+		
+			Releases loaded file: the parsed data is dropped and the memory map opened for the
+			file, if any, is closed. Buffers and maps passed to OpenFile are left open.
+		
+		"""
+		self.fileName = ""
+		self.bitx = None
+		self.stream = None
+		self.data = None
+		if self.mapped is not None:
+			self.mapped.close()
+			self.mapped = None
+	
+	@_Timed(u"parse")
+	def OpenFile(self, fileName):
+		"""
+		
+			Opens LVBITX file.
+			In-memory buffers and regular files behind file objects are parsed in place, without
+			copying; zip members and other streams are read once. File objects are read from
+			their current position. A file opened before is closed first (see Close).
+			
+			Parameters:
+				fileName        LVBITX file name or path, bytes, bytearray, memoryview, mmap,
+								binary file-like object, or zipfile.Path
+			
+			Raises LVbitxParseError if the data is not a well-formed bitfile (OSError is raised
+			as is for unreadable files).
+		
+		"""
+		import mmap
+		from xml.parsers import expat
+		self.Close()
+		self.fileName, self.data = _OpenSource(fileName)
+		if isinstance(self.data, mmap.mmap) and not isinstance(fileName, (mmap.mmap, memoryview)):
+			self.mapped = self.data
+		source = self.fileName
+		name = source or "<data>"
+		try:
+			if self.engine != u"dom" and self.data is None:
+				# the map stays open until Close, so that the bitstream is read from the parsed file
+				self.data = self.mapped = _MapFile(self.fileName)
+			if self.engine == u"stream":
+				self.stream = self._StreamParse(self.data)
+			elif self.engine == u"lazy":
+				self.stream = _LazyIndex(self.data, self.fileName)
+			else:
+				from xml.dom import minidom
+				self.bitx = minidom.parse(self.fileName if self.data is None else _BufferReader(self.data))
+				if self.stats is not None:
+					self.stats.Count(u"xml.elements", len(self.bitx.getElementsByTagName("*")))
+		except Exception as e:
+			self.Close()
+			if isinstance(e, (LVbitxError, OSError)):
+				raise
+			if isinstance(e, expat.ExpatError):
+				raise LVbitxParseError("%s: %s" % (name, expat.ErrorString(e.code)), source, e.lineno, e.offset)
+			raise LVbitxParseError("%s: %s: %s" % (name, type(e).__name__, e), source)
+		if self.validate:
+			self.Validate()
+	
+	def Validate(self):
+		"""
+		
+			Checks the models of loaded file for inconsistencies (see ValidateBitfile).
+			
+			Output:
+				list of Diagnostic objects, also stored in diagnostics
+			
+		"""
+		bitfile = self.Load()
+		self.diagnostics = ValidateBitfile(bitfile) if bitfile is not None else []
+		return self.diagnostics
+	
+	def _StreamParse(self, data):
+		"""
+		
+			Runs the streaming engine over file data.
+			
+			Parameters:
+				data            file data (bytes, bytearray or mmap)
+			
+			Output:
+				_StreamHandler object holding the extracted models (bitfile) and the bitstream range
+		
+		"""
+		from xml.parsers import expat
+		parser = expat.ParserCreate()
+		handler = _StreamHandler(parser)
+		if self.stats is not None:
+			elements = [0]
+			def StartElement(name, attrs, start=parser.StartElementHandler):
+				elements[0] += 1
+				start(name, attrs)
+			parser.StartElementHandler = StartElement
+		for pos in range(0, len(data), 1<<20):
+			parser.Parse(data[pos:pos + (1<<20)], False)
+		parser.Parse(b"", True)
+		handler.parser = None
+		if self.stats is not None:
+			self.stats.Count(u"xml.elements", elements[0])
+			self.stats.Count(u"xml.bytes", parser.CurrentByteIndex)
+		return handler
+	
+	@_Timed(u"load")
+	def Load(self):
+		"""
+		
+			Extracts every section of loaded file in a single traversal.
+			
+			Output:
+				Bitfile object (None if no file is loaded)
+			
+		"""
+		if self.stream!=None:
+			return _CopyModel(self.stream.bitfile)
+		if self.bitx!=None:
+			handler = _StreamHandler()
+			stack = [(self.bitx.documentElement, False)]
+			while len(stack) > 0:
+				node, closing = stack.pop()
+				if closing:
+					handler.EndElement(node.tagName)
+				elif node.nodeType == node.ELEMENT_NODE:
+					handler.StartElement(node.tagName, dict(node.attributes.items()))
+					stack.append((node, True))
+					stack.extend((child, False) for child in reversed(node.childNodes))
+				elif node.nodeType in (node.TEXT_NODE, node.CDATA_SECTION_NODE):
+					handler.CharacterData(node.data)
+			return handler.bitfile
+		return None
+	
+	@_Timed(u"extract.signature")
+	def GetSignature(self):
+		"""
+		
+			Reads signature for SignatureRegister of loaded file.
+			
+			Output:
+				file signature (str)
+			
+		"""
+		if self.stream!=None:
+			return str(self.stream.Get("signatureRegister"))
+		if self.bitx!=None:
+			try:
+				sig = str(self.bitx.getElementsByTagName("SignatureRegister")[0].childNodes[0].data)
+				return sig
+			except:
+				return ""
+	
+	@_Timed(u"extract.viName")
+	def GetViName(self):
+		"""
+		
+			Reads VI name associated to loaded file.
+			
+			Output:
+				VI name (str)
+			
+		"""
+		if self.stream!=None:
+			return self.stream.Get("viName")
+		if self.bitx!=None:
+			for x in self.bitx.getElementsByTagName("VI")[0].childNodes:
+				if hasattr(x,'tagName') and x.tagName == u"Name":
+					return x.childNodes[0].data
+		return ""
+	
+	@_Timed(u"extract.registers")
+	def GetRegisterList(self):
+		"""
+		
+			Extracts register list from loaded file.
+			
+			Output:
+				list of Register objects
+			
+		"""
+		if self.stream!=None:
+			return [_CopyModel(item) for item in self.stream.Get("registers")]
+		return self._DecodeDomList("RegisterList", u"Register", RegisterSchema)
+	
+	@_Timed(u"extract.channels")
+	def GetDmaChannels(self):
+		"""
+		
+			Reads DMA channels from loaded file.
+			
+			Output:
+				list of DmaChannel objects
+			
+		"""
+		if self.stream!=None:
+			return [_CopyModel(item) for item in self.stream.Get("channels")]
+		return self._DecodeDomList("DmaChannelAllocationList", u"Channel", DmaChannelSchema)
+	
+	@_Timed(u"extract.registerBlocks")
+	def GetRegisterBlocks(self):
+		"""
+		
+			Reads register blocks from loaded file.
+			
+			Output:
+				list of RegisterBlock objects
+			
+		"""
+		if self.stream!=None:
+			return [_CopyModel(item) for item in self.stream.Get("registerBlocks")]
+		return self._DecodeDomList("RegisterBlockList", u"RegisterBlock", RegisterBlockSchema)
+	
+	@_Timed(u"extract.usedBaseClocks")
+	def GetUsedBaseClocks(self):
+		"""
+		
+			Reads used base clocks from loaded file.
+			
+			Output:
+				list of BaseClock objects
+			
+		"""
+		if self.stream!=None:
+			return [_CopyModel(item) for item in self.stream.Get("usedBaseClocks")]
+		return self._DecodeDomList("UsedBaseClockList", u"BaseClock", BaseClockSchema)
+	
+	def _DecodeDomList(self, listTag, tag, schema):
+		"""
+		
+			Decodes the records of a list section from the DOM.
+			
+			Parameters:
+				listTag         list section tag name (str)
+				tag             record tag name (str)
+				schema          record schema (Schema)
+			
+			Output:
+				list of model objects
+			
+		"""
+		items = []
+		if self.bitx!=None:
+			for x in self.bitx.getElementsByTagName(listTag)[0].childNodes:
+				if hasattr(x,'tagName') and x.tagName == tag:
+					items.append(schema.Decode(x, _DomReader))
+		return items
+	
+	def GetBitstream(self):
+		"""
+		
+			Reads bitstream from loaded file.
+			The "stream" and "lazy" engines decode the encoded text in place (from the memory
+			map or buffer), so that the result is the only copy made.
+			
+			Output:
+				decoded binary bitstream (bytes)
+			
+		"""
+		if self.stream==None and self.bitx==None:
+			return ""
+		import binascii
+		data, start, end, close = self._OpenBitstreamData()
+		# the "dom" engine gives the text node (str), the other engines bytes-like data
+		encoded = data[start:end] if isinstance(data, str) else memoryview(data)[start:end]
+		try:
+			if self.stats is None:
+				return binascii.a2b_base64(encoded)
+			with self.stats.Phase(u"bitstream.decode"):
+				bitstream = binascii.a2b_base64(encoded)
+			self.stats.Count(u"bitstream.bytesDecoded", len(bitstream))
+			return bitstream
+		finally:
+			if isinstance(encoded, memoryview):
+				encoded.release()
+			close()
+	
+	def GetBitstreamBuffer(self):
+		"""
+		
+			Decodes bitstream from loaded file into a single preallocated buffer.
+			With the "stream" engine, the encoded text is read from a memory map of the file
+			and never copied as a whole.
+			
+			Output:
+				decoded binary bitstream (memoryview)
+			
+		"""
+		buf = bytearray(self._BitstreamEncodedLength() * 3 // 4)
+		view = memoryview(buf)
+		pos = 0
+		for chunk in self._BitstreamChunks():
+			view[pos:pos + len(chunk)] = chunk
+			pos += len(chunk)
+		view.release()
+		del buf[pos:]
+		return memoryview(buf)
+	
+	def GetBitstreamLength(self):
+		"""
+		
+			Computes the decoded bitstream length without decoding it.
+			
+			Output:
+				decoded bitstream length in bytes (int)
+			
+		"""
+		data, start, end, close = self._OpenBitstreamData()
+		try:
+			return _Base64Length(data, start, end)
+		finally:
+			close()
+	
+	def WriteBitstream(self, sink, chunkSize=1<<20, callback=None):
+		"""
+		
+			Decodes bitstream from loaded file and writes it to a file-like object or socket,
+			one chunk at a time. Memory use depends on chunkSize only.
+			
+			Parameters:
+				sink            destination (object with a write or sendall method)
+				chunkSize       number of encoded bytes decoded at a time (int, optional)
+				callback        function called after each chunk with the number of
+								bytes written so far (callable, optional)
+			
+			Output:
+				number of bytes written (int)
+			
+		"""
+		written = 0
+		for chunk in self._BitstreamChunks(chunkSize):
+			_WriteAll(sink, chunk)
+			written += len(chunk)
+			if callback is not None:
+				callback(written)
+		return written
+	
+	def _BitstreamEncodedLength(self):
+		"""
+		
+			Returns the size of the encoded bitstream text (whitespace included).
+			
+			Output:
+				size in bytes (int)
+			
+		"""
+		if self.stream!=None:
+			start, end = self.stream.bitstreamRange or (0, 0)
+			return max(0, end - start)
+		data, start, end, close = self._OpenBitstreamData()
+		close()
+		return end - start
+	
+	def _OpenBitstreamData(self):
+		"""
+		
+			Gives access to the encoded bitstream text of the loaded file.
+			The "stream" and "lazy" engines use the data mapped or passed when the file was opened,
+			the "dom" engine uses the text node.
+			
+			Output:
+				(data, start, end, close) tuple, where data is the encoded text container,
+				start and end delimit the bitstream in data, and close releases data
+			
+		"""
+		if self.stream!=None:
+			start, end = self.stream.bitstreamRange or (0, 0)
+			if end <= start:
+				return b"", 0, 0, lambda: None
+			return self.data, start, end, lambda: None
+		if self.bitx!=None:
+			nodes = self.bitx.getElementsByTagName("Bitstream")[0].childNodes
+			if len(nodes)>0:
+				return nodes[0].data, 0, len(nodes[0].data), lambda: None
+		return b"", 0, 0, lambda: None
+	
+	def _BitstreamChunks(self, chunkSize=1<<20):
+		"""
+		
+			Decodes bitstream from loaded file chunk by chunk.
+			
+			Parameters:
+				chunkSize       number of encoded bytes decoded at a time (int, optional)
+			
+			Output:
+				generator of decoded binary chunks (bytes)
+			
+		"""
+		data, start, end, close = self._OpenBitstreamData()
+		chunks = _Base64Chunks(data, start, end, chunkSize)
+		if self.stats is not None:
+			chunks = self.stats.TimeChunks(u"bitstream.decode", chunks, u"bitstream.bytesDecoded")
+		try:
+			for chunk in chunks:
+				yield chunk
+		finally:
+			chunks.close()
+			close()
+	
+
+class _CowList(list):
+	"""
+
+		List of model objects with copy-on-write access to frozen items, used by LVBitxCreate.
+		Indexing a frozen item replaces it with a mutable copy (see Thaw) in this list only, so
+		edits never reach the shared frozen objects and only the items actually indexed are copied.
+		Iteration returns items as stored, frozen or not.
+
+	"""
+	def __getitem__(self, index):
+		item = list.__getitem__(self, index)
+		if isinstance(item, _Frozen):
+			item = Thaw(item)
+			list.__setitem__(self, index, item)
+		return item
+
+class LVBitxCreate():
+	"""
+	
+		LVBITX creator class
+	
+	"""
+	def __init__(self, bitfile=None, stats=None, strict=False):
+		"""
+		
+			Initialization.
+			
+			Parameters:
+				bitfile         Bitfile object to take properties from; its lists, their items and icon
+								are copied, with a FrozenBitfile list items are copied only when indexed
+								(Bitfile, optional)
+				stats           instrumentation collector (Stats, optional)
+				strict          if True, generation raises ValidationError when ValidateBitfile
+								reports errors (bool, optional)
+			
+		"""
+		self.stats = stats # instrumentation collector (Stats object or None)
+		self.strict = strict # if True, invalid models are rejected by Generate and GenerateTo
+		self.signatureRegister = "" # signature to be provided on load
+		self.signatureGuids = "" # ?
+		self.signatureNames = "" # ?
+		self.viName = "default.vi" # VI name
+		self.targetClass = "PXIe-7965R" # target class
+		self.autoRunWhenDownloaded = False # if True, auto-run when loaded
+		self.multipleUserClocks = False # if True, more than one clock is defined
+		self.bitstream = "" # binary bitstream (bytes, or readable binary file-like object)
+		self.registers = [] # list of Register objects
+		self.icon = Icon() # VI icon object
+		self.channels = [] # list of DmaChannel objects
+		self.registerBlocks = [] # list of RegisterBlock objects
+		self.usedBaseClocks = [] # list of BaseClock objects
+		if bitfile is not None:
+			for name in ("signatureRegister", "signatureGuids", "signatureNames", "viName", "targetClass",
+					"autoRunWhenDownloaded", "multipleUserClocks", "registers", "icon", "channels",
+					"registerBlocks", "usedBaseClocks"):
+				setattr(self, name, getattr(bitfile, name))
+			if isinstance(bitfile, _Frozen):
+				# frozen models are shared: edits go to copies made on access
+				for name in ("registers", "channels", "registerBlocks", "usedBaseClocks"):
+					setattr(self, name, _CowList(getattr(bitfile, name)))
+				self.icon = Thaw(bitfile.icon)
+			else:
+				# lists, their items and icon are copied so that edits don't reach the source Bitfile
+				for name in ("registers", "channels", "registerBlocks", "usedBaseClocks"):
+					setattr(self, name, [_CopyModel(item) for item in getattr(bitfile, name)])
+				self.icon = _CopyModel(bitfile.icon)
+
+	def Generate(self):
+		"""
+		
+			Generates a LVBITX stream from the properties of the object.
+			
+			Output:
+				string containing LVBITX data (str)
+		
+		"""
+		import io
+		output = io.StringIO()
+		self.GenerateTo(output, pretty=True)
+		return output.getvalue()
+	
+	@_Timed(u"serialize")
+	def GenerateTo(self, fileobj, pretty=False):
+		"""
+		
+			Writes a LVBITX stream generated from the properties of the object to a file-like object.
+			XML is written incrementally and the bitstream is base64 encoded chunk by chunk,
+			so memory use depends on the metadata only.
+			
+			Parameters:
+				fileobj         destination (text or binary file-like object)
+				pretty          if True, indents the output like Generate (bool, optional)
+			
+		"""
+		if self.strict:
+			errors = [d for d in ValidateBitfile(self) if d.severity == "error"]
+			if errors:
+				raise ValidationError(errors)
+		import io
+		if isinstance(fileobj, io.TextIOBase):
+			xml = _XmlWriter(fileobj.write, pretty)
+		else:
+			xml = _XmlWriter(lambda text: _WriteAll(fileobj, text.encode("utf-8")), pretty)
+		
+		xml.Start("Bitfile")
+		xml.Element("BitfileVersion", "1.0")
+		xml.Element("SignatureRegister", self.signatureRegister)
+		xml.Element("SignatureGuids", self.signatureGuids)
+		xml.Element("SignatureNames", self.signatureNames)
+		from datetime import datetime
+		xml.Element("TimeStamp", datetime.today().strftime("%m/%d/%Y%l:%M %p"))
+		xml.Element("CompilationStatus", "")
+		xml.Element("BitstreamVersion", "2")
+		
+		# VI node
+		xml.Start("VI")
+		xml.Element("Name", self.viName)
+		xml.Start("RegisterList")
+		for reg in self.registers:
+			RegisterSchema.Encode(reg, u"Register", xml)
+		xml.End()
+		xml.End()
+		
+		# icon node
+		IconSchema.Encode(self.icon, u"Icon", xml)
+		
+		# Project node
+		xml.Start("Project")
+		xml.Element("TargetClass", self.targetClass)
+		xml.Element("AutoRunWhenDownloaded", BoolCodec.Encode(self.autoRunWhenDownloaded))
+		xml.Start("CompilationResultsTree")
+		xml.Start("CompilationResults")
+		xml.Start("NiFlexRio")
+		xml.Start("Puma2")
+		xml.Element("BitstreamVersion", "2")
+		xml.End()
+		xml.End()
+		xml.Start("NiFpga")
+		xml.Element("version", "1")
+		xml.End()
+		
+		# DmaChannelAllocationList tag
+		xml.Start("DmaChannelAllocationList")
+		for chan in self.channels:
+			DmaChannelSchema.Encode(chan, u"Channel", xml)
+		xml.End()
+		
+		# RegisterBlockList tag
+		xml.Start("RegisterBlockList")
+		for reg in self.registerBlocks:
+			RegisterBlockSchema.Encode(reg, u"RegisterBlock", xml)
+		xml.End()
+		
+		# UsedBaseClockList tag
+		xml.Start("UsedBaseClockList")
+		for clk in self.usedBaseClocks:
+			BaseClockSchema.Encode(clk, u"BaseClock", xml)
+		xml.End()
+		xml.End()
+		xml.End()
+		xml.Element("MultipleUserClocks", BoolCodec.Encode(self.multipleUserClocks))
+		xml.End()
+		
+		xml.Element("ClientData")
+		
+		# Bitstream tag
+		xml.Start("Bitstream")
+		xml.Text("") # never an empty-element tag
+		chunks = _Base64EncodeChunks(self.bitstream)
+		if self.stats is not None:
+			chunks = self.stats.TimeChunks(u"bitstream.encode", chunks, u"bitstream.bytesEncoded")
+		for chunk in chunks:
+			xml.Text(chunk.decode("ascii"))
+		xml.End()
+		
+		xml.End()
+		xml.Flush()
+	
+	def Template(self, pretty=False):
+		"""
+		
+			Compiles the current properties into a template for fast generation of variants that
+			differ only by VI name, signature, AutoRunWhenDownloaded or DMA channel names: XML and
+			bitstream encoding happen once, each variant is then a copy with a few fields replaced.
+			
+			Parameters:
+				pretty          if True, indents the output like Generate (bool, optional)
+			
+			Output:
+				LVBitxTemplate object (to be closed after use)
+			
+		"""
+		return LVBitxTemplate(self, pretty)
+
+class LVBitxTemplate():
+	"""
+
+		Precompiled LVBITX output for fast generation of variants (see LVBitxCreate.Template).
+		The file is generated once into a temporary file, with markers in place of the fields that
+		vary (VI name, signature, AutoRunWhenDownloaded, DMA channel names); their positions are
+		recorded. Rendering a variant copies the static ranges, encoded bitstream included, from
+		the temporary file (in the kernel when possible) and writes only the field values.
+
+	"""
+	def __init__(self, creator, pretty=False):
+		"""
+
+			Initialization.
+
+			Parameters:
+				creator         LVBitxCreate object holding the base properties
+				pretty          if True, indents the output like Generate (bool, optional)
+
+		"""
+		import mmap, tempfile
+		self.stats = creator.stats # instrumentation collector (Stats object or None)
+		self.defaults = {} # slot -> base value
+		self.channels = {} # channel number or base name -> slot
+		self.slots = [] # (offset, length, slot) of each marker, sorted by offset
+		markers = {}
+		def Mark(slot, value):
+			marker = u"\ue000%d\ue001" % len(markers) # private use characters, left as is by escaping
+			markers[marker.encode("utf-8")] = slot
+			self.defaults[slot] = value
+			return marker
+		source = LVBitxCreate(stats=creator.stats, strict=creator.strict)
+		for name in ("signatureGuids", "signatureNames", "targetClass", "multipleUserClocks", "bitstream",
+				"registers", "icon", "registerBlocks", "usedBaseClocks"):
+			setattr(source, name, getattr(creator, name))
+		source.viName = Mark("viName", creator.viName)
+		source.signatureRegister = Mark("signatureRegister", creator.signatureRegister)
+		source.autoRunWhenDownloaded = Mark("autoRunWhenDownloaded", creator.autoRunWhenDownloaded)
+		source.channels = []
+		for i in range(len(creator.channels)):
+			chan = DmaChannel()
+			for name in DmaChannel.__slots__:
+				setattr(chan, name, getattr(creator.channels[i], name))
+			chan.name = Mark(("channel", i), chan.name)
+			self.channels.setdefault(chan.number, ("channel", i))
+			self.channels.setdefault(creator.channels[i].name, ("channel", i))
+			source.channels.append(chan)
+		self.file = tempfile.TemporaryFile() # compiled output
+		try:
+			source.GenerateTo(self.file, pretty)
+			self.file.flush()
+			self.size = self.file.tell() # compiled output size
+			data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+			try:
+				end = data.find(b"<Bitstream>")
+				for marker, slot in markers.items():
+					self.slots.append((data.find(marker, 0, end), len(marker), slot))
+			finally:
+				data.close()
+		except:
+			self.file.close()
+			raise
+		self.slots.sort(key=lambda item: item[0])
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc):
+		self.Close()
+		return False
+
+	def Close(self):
+		"""
+
+			Releases the compiled output.
+
+		"""
+		self.file.close()
+
+	@_Timed(u"render")
+	def Render(self, sink, viName=None, signatureRegister=None, autoRunWhenDownloaded=None, channelNames=None):
+		"""
+
+			Writes a variant. Fields left to None keep their base value.
+
+			Parameters:
+				sink                   destination file name, or binary file-like object (str or object with a write method)
+				viName                 VI name (str, optional)
+				signatureRegister      signature (str, optional)
+				autoRunWhenDownloaded  auto-run flag (bool, optional)
+				channelNames           dict DMA channel number or base name -> new name (dict, optional)
+
+			Output:
+				number of bytes written (int)
+
+		"""
+		import io
+		values = dict(self.defaults)
+		for slot, value in (("viName", viName), ("signatureRegister", signatureRegister), ("autoRunWhenDownloaded", autoRunWhenDownloaded)):
+			if value is not None:
+				values[slot] = value
+		for key, name in (channelNames or {}).items():
+			values[self.channels[key]] = name
+		if isinstance(sink, str):
+			with open(sink, "wb") as f:
+				return self.Render(f, viName, signatureRegister, autoRunWhenDownloaded, channelNames)
+		try:
+			sink.flush()
+			fd = sink.fileno()
+		except (AttributeError, io.UnsupportedOperation):
+			fd = None
+		src = self.file.fileno()
+		written = 0
+		pos = 0
+		for offset, length, slot in self.slots + [(self.size, 0, None)]:
+			if fd is not None:
+				_CopyRange(src, fd, pos, offset - pos)
+			else:
+				_CopyTo(src, sink, pos, offset - pos)
+			written += offset - pos
+			pos = offset + length
+			if slot is None:
+				break
+			if slot == "autoRunWhenDownloaded":
+				text = BoolCodec.Encode(values[slot])
+			else:
+				text = _XmlEscape(values[slot])
+			text = text.encode("utf-8")
+			_WriteAll(_FdWriter(fd) if fd is not None else sink, text)
+			written += len(text)
+		return written
+
+def _CopyTo(src, sink, offset, count):
+	"""
+
+		Copies a byte range from a file descriptor to a file-like object, chunk by chunk.
+
+	"""
+	import os
+	while count > 0:
+		chunk = os.pread(src, min(count, 1<<20), offset)
+		if len(chunk) == 0:
+			raise IOError("unexpected end of file")
+		_WriteAll(sink, chunk)
+		offset += len(chunk)
+		count -= len(chunk)
+
+def _RegisterByteSize(reg):
+	"""
+
+		Returns the number of bytes covered by a register.
+
+	"""
+	return max(1, (reg.sizeInBits + 7) // 8)
+
+class Diagnostic():
+	"""
+
+		Validation finding
+
+	"""
+	__slots__ = ("severity", "code", "section", "key", "message")
+	def __init__(self, severity, code, section, key, message):
+		self.severity = severity # "error" or "warning"
+		self.code = code # finding type, e.g. "register-overlap"
+		self.section = section # Bitfile attribute the finding is about, e.g. "registers"
+		self.key = key # name or number of the record at fault
+		self.message = message # human-readable description
+
+	def __repr__(self):
+		return "%s: %s [%s]" % (self.severity, self.message, self.code)
+
+class ValidationError(LVbitxError, ValueError):
+	"""
+
+		Raised when generating a bitfile from invalid models in strict mode.
+
+	"""
+	def __init__(self, diagnostics):
+		LVbitxError.__init__(self, "; ".join(d.message for d in diagnostics))
+		self.diagnostics = diagnostics # list of Diagnostic objects
+
+TypeBits = {TypeCode[u"Bool"]:1, TypeCode[u"I8"]:8, TypeCode[u"U8"]:8, TypeCode[u"I16"]:16, TypeCode[u"U16"]:16, TypeCode[u"I32"]:32, TypeCode[u"U32"]:32, TypeCode[u"I64"]:64, TypeCode[u"U64"]:64}
+
+def ValidateBitfile(bitfile):
+	"""
+
+		Checks a bitfile model for inconsistencies the driver would only report on load.
+		Overlapping registers are found with a sweep over registers sorted by offset, duplicates
+		with hash sets, so the cost is O(n log n) in the number of registers.
+		Errors: overlapping registers, duplicate register names or ids, duplicate DMA channel
+		numbers, duplicate register block names or offsets.
+		Warnings: registers smaller than their data type, registers below every register block,
+		duplicate DMA channel names.
+
+		Parameters:
+			bitfile         Bitfile object (or any object with the same lists, e.g. LVBitxCreate)
+
+		Output:
+			list of Diagnostic objects (empty if the model is consistent)
+
+	"""
+	diagnostics = []
+	def Duplicates(items, key, severity, code, section, what):
+		seen = set()
+		for item in items:
+			value = key(item)
+			if value in seen:
+				diagnostics.append(Diagnostic(severity, code, section, value, "duplicate %s %s" % (what, value)))
+			seen.add(value)
+	Duplicates(bitfile.registers, lambda reg: reg.name, "error", "register-duplicate-name", "registers", "register name")
+	Duplicates(bitfile.registers, lambda reg: reg.id, "error", "register-duplicate-id", "registers", "register id")
+	Duplicates(bitfile.channels, lambda chan: chan.number, "error", "channel-duplicate-number", "channels", "DMA channel number")
+	Duplicates(bitfile.channels, lambda chan: chan.name, "warning", "channel-duplicate-name", "channels", "DMA channel name")
+	Duplicates(bitfile.registerBlocks, lambda block: block.name, "error", "block-duplicate-name", "registerBlocks", "register block name")
+	Duplicates(bitfile.registerBlocks, lambda block: block.offset, "error", "block-duplicate-offset", "registerBlocks", "register block offset")
+
+	previous = None
+	reach = 0
+	for reg in sorted(bitfile.registers, key=lambda reg: reg.offset):
+		if previous is not None and reg.offset < reach:
+			diagnostics.append(Diagnostic("error", "register-overlap", "registers", reg.name,
+				"register %s at 0x%X overlaps register %s" % (reg.name, reg.offset, previous.name)))
+		end = reg.offset + _RegisterByteSize(reg)
+		if end > reach:
+			reach = end
+			previous = reg
+		if isinstance(reg.datatype, DatatypeArray):
+			bits = TypeBits.get(reg.datatype.type.type, 0) * reg.datatype.size
+		else:
+			bits = TypeBits.get(reg.datatype.type, 0)
+		if reg.sizeInBits < bits:
+			diagnostics.append(Diagnostic("warning", "register-size", "registers", reg.name,
+				"register %s holds %d bits but its data type needs %d" % (reg.name, reg.sizeInBits, bits)))
+
+	if len(bitfile.registerBlocks) > 0:
+		lowest = min(block.offset for block in bitfile.registerBlocks)
+		for reg in bitfile.registers:
+			if reg.offset < lowest:
+				diagnostics.append(Diagnostic("warning", "register-outside-blocks", "registers", reg.name,
+					"register %s at 0x%X is below every register block" % (reg.name, reg.offset)))
+	return diagnostics
+
+class RegisterMap():
+	"""
+
+		Immutable register index built from parsed Register (and RegisterBlock) objects.
+		Registers can be looked up by name or id with a hash lookup, and any address can be
+		resolved to the register or register block covering it by bisection.
+		Nothing can be changed once built, so a map can be shared between threads without locking
+		(the Register objects themselves are not copied).
+
+	"""
+	__slots__ = ("_registers", "_byName", "_byId", "_offsets", "_reach", "_blocks", "_blockOffsets")
+
+	def __init__(self, registers, registerBlocks=()):
+		"""
+
+			Initialization.
+
+			Parameters:
+				registers       list of Register objects
+				registerBlocks  list of RegisterBlock objects (list, optional)
+
+		"""
+		regs = tuple(sorted(registers, key=lambda reg: reg.offset))
+		byName = {}
+		byId = {}
+		reach = []
+		end = 0
+		for reg in regs:
+			byName.setdefault(reg.name, reg)
+			byId.setdefault(reg.id, reg)
+			end = max(end, reg.offset + _RegisterByteSize(reg))
+			reach.append(end)
+		blocks = tuple(sorted(registerBlocks, key=lambda block: block.offset))
+		init = object.__setattr__
+		init(self, "_registers", regs) # registers sorted by offset
+		init(self, "_byName", byName) # name -> Register dict (first one if duplicated)
+		init(self, "_byId", byId) # id -> Register dict (first one if duplicated)
+		init(self, "_offsets", tuple(reg.offset for reg in regs)) # sorted register offsets
+		init(self, "_reach", tuple(reach)) # highest end address of registers up to each index
+		init(self, "_blocks", blocks) # register blocks sorted by offset
+		init(self, "_blockOffsets", tuple(block.offset for block in blocks)) # sorted block offsets
+
+	def __setattr__(self, name, value):
+		raise AttributeError("RegisterMap is immutable")
+
+	def __delattr__(self, name):
+		raise AttributeError("RegisterMap is immutable")
+
+	def __len__(self):
+		return len(self._registers)
+
+	def __iter__(self):
+		return iter(self._registers)
+
+	def __contains__(self, name):
+		return name in self._byName
+
+	def GetByName(self, name, default=None):
+		"""
+
+			Finds a register by name.
+
+			Parameters:
+				name            register name (str)
+				default         value returned if there's no such register (optional)
+
+			Output:
+				Register object
+
+		"""
+		return self._byName.get(name, default)
+
+	def GetById(self, id, default=None):
+		"""
+
+			Finds a register by numerical id.
+
+			Parameters:
+				id              register id (int)
+				default         value returned if there's no such register (optional)
+
+			Output:
+				Register object
+
+		"""
+		return self._byId.get(id, default)
+
+	def Resolve(self, address):
+		"""
+
+			Finds the register covering an address.
+
+			Parameters:
+				address         address (int)
+
+			Output:
+				Register object, or None if no register covers the address
+
+		"""
+		import bisect
+		i = bisect.bisect_right(self._offsets, address) - 1
+		while i >= 0 and address < self._reach[i]:
+			reg = self._registers[i]
+			if address < reg.offset + _RegisterByteSize(reg):
+				return reg
+			i -= 1
+		return None
+
+	def ResolveBlock(self, address):
+		"""
+
+			Finds the register block an address belongs to, i.e. the one with the highest offset
+			not above the address.
+
+			Parameters:
+				address         address (int)
+
+			Output:
+				RegisterBlock object, or None if the address is below every block
+
+		"""
+		import bisect
+		i = bisect.bisect_right(self._blockOffsets, address) - 1
+		if i < 0:
+			return None
+		return self._blocks[i]
+
+RegisterFlag = {u"hidden":1, u"indicator":2, u"internal":4, u"bidirectional":8, u"synchronous":16, u"accessMayTimeout":32, u"registerNode":64}
+
+class RegisterTable():
+	"""
+
+		Columnar (struct-of-arrays) view of a register list.
+		Offsets, sizes, type codes, ids and boolean flags (see RegisterFlag dict) are packed in
+		typed arrays, which takes a fraction of the memory of Register objects and allows bulk
+		queries. Array registers have type code TypeCode["Array"].
+
+	"""
+	__slots__ = ("names", "offset", "sizeInBits", "type", "id", "flags", "blocks")
+
+	def __init__(self, registers, registerBlocks=()):
+		"""
+
+			Initialization.
+
+			Parameters:
+				registers       list of Register objects
+				registerBlocks  list of RegisterBlock objects, used to select registers by block (list, optional)
+
+		"""
+		from array import array
+		self.names = tuple(reg.name for reg in registers) # register names
+		self.offset = array("q", (reg.offset for reg in registers)) # address offsets
+		self.sizeInBits = array("l", (reg.sizeInBits for reg in registers)) # sizes in bits
+		self.type = array("b", (TypeCode[u"Array"] if isinstance(reg.datatype, DatatypeArray) else reg.datatype.type for reg in registers)) # type codes
+		self.id = array("q", (reg.id for reg in registers)) # numerical ids
+		self.flags = array("B", (_RegisterFlags(reg) for reg in registers)) # RegisterFlag bit masks
+		self.blocks = sorted((block.offset, block.name) for block in registerBlocks) # (offset, name) pairs sorted by offset
+
+	def __len__(self):
+		return len(self.names)
+
+	def AsArray(self):
+		"""
+
+			Returns the table as a NumPy structured array (requires NumPy).
+			Fields are offset, sizeInBits, type, id and flags; names are left out.
+
+			Output:
+				structured array (numpy.ndarray)
+
+		"""
+		import numpy
+		table = numpy.empty(len(self.names), dtype=[("offset", "i8"), ("sizeInBits", "i4"), ("type", "i1"), ("id", "i8"), ("flags", "u1")])
+		for name in ("offset", "sizeInBits", "type", "id", "flags"):
+			table[name] = numpy.frombuffer(getattr(self, name), dtype=getattr(self, name).typecode)
+		return table
+
+	def Select(self, type=None, flags=0, noFlags=0, block=None):
+		"""
+
+			Selects registers matching all given criteria. Uses vectorized NumPy operations if NumPy
+			is installed.
+
+			Parameters:
+				type            type code (see TypeCode dict) (int, optional)
+				flags           RegisterFlag bits that must be set (int, optional)
+				noFlags         RegisterFlag bits that must be clear (int, optional)
+				block           name of the register block the registers must be in (str, optional)
+
+			Output:
+				list of row indices (use names to get register names)
+
+		"""
+		start, end = self._BlockRange(block)
+		try:
+			import numpy
+		except ImportError:
+			numpy = None
+		if numpy is None:
+			rows = []
+			for i in range(len(self.names)):
+				if type is not None and self.type[i] != type: continue
+				if self.flags[i] & flags != flags or self.flags[i] & noFlags: continue
+				if self.offset[i] < start or end is not None and self.offset[i] >= end: continue
+				rows.append(i)
+			return rows
+		offset = numpy.frombuffer(self.offset, dtype=self.offset.typecode)
+		bits = numpy.frombuffer(self.flags, dtype=self.flags.typecode)
+		mask = (bits & flags == flags) & (bits & noFlags == 0) & (offset >= start)
+		if type is not None:
+			mask &= numpy.frombuffer(self.type, dtype=self.type.typecode) == type
+		if end is not None:
+			mask &= offset < end
+		return numpy.flatnonzero(mask).tolist()
+
+	def _BlockRange(self, block):
+		"""
+
+			Returns the address range of a register block: from its offset to the offset of the next block.
+
+			Parameters:
+				block           register block name, or None for the whole address space (str)
+
+			Output:
+				(start, end) tuple, end is None for the last block
+
+		"""
+		if block is None:
+			return 0, None
+		for i in range(len(self.blocks)):
+			if self.blocks[i][1] == block:
+				if i + 1 < len(self.blocks):
+					return self.blocks[i][0], self.blocks[i + 1][0]
+				return self.blocks[i][0], None
+		raise KeyError(block)
+
+def _RegisterFlags(reg):
+	"""
+
+		Packs the boolean properties of a register into a RegisterFlag bit mask.
+
+	"""
+	flags = 0
+	for name, bit in RegisterFlag.items():
+		if getattr(reg, name):
+			flags |= bit
+	return flags
+
+RegisterFormat = {TypeCode[u"Bool"]:"?", TypeCode[u"I8"]:"b", TypeCode[u"U8"]:"B", TypeCode[u"I16"]:"h", TypeCode[u"U16"]:"H", TypeCode[u"I32"]:"i", TypeCode[u"U32"]:"I", TypeCode[u"I64"]:"q", TypeCode[u"U64"]:"Q"}
+
+class RegisterCodec():
+	"""
+
+		Compiled layout of a register list, used to decode raw register space snapshots in bulk.
+		The layout is computed once from register offsets and data types: a single struct format
+		for plain Python decoding, and a NumPy structured dtype for vectorized decoding of one or
+		many snapshots. Booleans take one byte, arrays are stored element after element.
+
+	"""
+	__slots__ = ("baseOffset", "size", "names", "_struct", "_fields", "_dtype")
+
+	def __init__(self, registers, baseOffset=None, byteOrder="<"):
+		"""
+
+			Initialization.
+
+			Parameters:
+				registers       list of Register objects
+				baseOffset      register address at the start of snapshots; defaults to the lowest
+								register offset (int, optional)
+				byteOrder       struct byte order character ("<" or ">") (str, optional)
+
+		"""
+		import struct
+		regs = sorted(registers, key=lambda reg: reg.offset)
+		if baseOffset is None:
+			baseOffset = regs[0].offset if len(regs) > 0 else 0
+		formats = [byteOrder]
+		fields = {}
+		names = []
+		end = 0
+		index = 0
+		for reg in regs:
+			code, count = _RegisterElement(reg)
+			if reg.name in fields:
+				raise ValueError("duplicate register name: %s" % reg.name)
+			start = reg.offset - baseOffset
+			if start < end:
+				raise ValueError("register %s overlaps the previous register" % reg.name)
+			if start > end:
+				formats.append("%dx" % (start - end))
+			formats.append("%d%s" % (count, code) if count > 1 else code)
+			element = struct.Struct(byteOrder + code * count)
+			fields[reg.name] = (start, element, index, count if isinstance(reg.datatype, DatatypeArray) else 0)
+			names.append(reg.name)
+			end = start + element.size
+			index += count
+		self.baseOffset = baseOffset # register address of the first snapshot byte
+		self.size = end # snapshot size in bytes
+		self.names = tuple(names) # register names, sorted by offset
+		self._struct = struct.Struct("".join(formats)) # whole snapshot layout
+		self._fields = fields # name -> (byte position, element struct, index in unpacked tuple, array size or 0)
+		self._dtype = None # NumPy dtype, built on first use
+
+	def Decode(self, buffer):
+		"""
+
+			Decodes a snapshot into register values.
+
+			Parameters:
+				buffer          snapshot (bytes-like object, at least size bytes long)
+
+			Output:
+				dict register name -> value (bool, int, or list for arrays)
+
+		"""
+		values = self._struct.unpack_from(buffer)
+		decoded = {}
+		for name, (start, element, index, count) in self._fields.items():
+			decoded[name] = list(values[index:index + count]) if count > 0 else values[index]
+		return decoded
+
+	def Encode(self, values, buffer=None):
+		"""
+
+			Writes register values into a snapshot buffer. Registers missing from values are left as they are.
+
+			Parameters:
+				values          dict register name -> value (list for arrays)
+				buffer          snapshot to update; a zeroed one is created if omitted (writable bytes-like object, optional)
+
+			Output:
+				the snapshot (bytearray if created here)
+
+		"""
+		if buffer is None:
+			buffer = bytearray(self.size)
+		for name, value in values.items():
+			start, element, index, count = self._fields[name]
+			if count > 0:
+				element.pack_into(buffer, start, *value)
+			else:
+				element.pack_into(buffer, start, value)
+		return buffer
+
+	def GetDtype(self, stride=None):
+		"""
+
+			Returns the NumPy structured dtype of snapshots (requires NumPy).
+
+			Parameters:
+				stride          snapshot size in bytes, if larger than size (int, optional)
+
+			Output:
+				numpy.dtype
+
+		"""
+		import numpy
+		if self._dtype is None:
+			byteOrder = self._struct.format[0]
+			formats = []
+			offsets = []
+			for name in self.names:
+				start, element, index, count = self._fields[name]
+				base = byteOrder + element.format[-1]
+				formats.append((base, (count,)) if count > 0 else base)
+				offsets.append(start)
+			self._dtype = numpy.dtype({"names":list(self.names), "formats":formats, "offsets":offsets, "itemsize":self.size})
+		if stride is None or stride == self.size:
+			return self._dtype
+		if stride < self.size:
+			raise ValueError("stride is smaller than snapshot size")
+		return numpy.dtype({"names":self._dtype.names, "formats":[self._dtype.fields[name][0] for name in self._dtype.names], "offsets":[self._dtype.fields[name][1] for name in self._dtype.names], "itemsize":stride})
+
+	def DecodeArray(self, buffer):
+		"""
+
+			Decodes a snapshot as a NumPy record, without copying (requires NumPy).
+
+			Parameters:
+				buffer          snapshot (bytes-like object, at least size bytes long)
+
+			Output:
+				structured scalar (numpy.void); fields are accessed by register name
+
+		"""
+		import numpy
+		return numpy.frombuffer(buffer, dtype=self.GetDtype(), count=1)[0]
+
+	def DecodeBatch(self, buffer, stride=None, dtype=None):
+		"""
+
+			Decodes consecutive snapshots at once (requires NumPy).
+
+			Parameters:
+				buffer          snapshots laid end to end (bytes-like object)
+				stride          distance between snapshots in bytes; defaults to size (int, optional)
+				dtype           if given, values are converted to this type and returned as a 2-D array with
+								one row per snapshot and one column per register element (optional)
+
+			Output:
+				structured array with one record per snapshot, or 2-D array (numpy.ndarray)
+
+		"""
+		import numpy
+		snapshots = numpy.frombuffer(buffer, dtype=self.GetDtype(stride))
+		if dtype is None:
+			return snapshots
+		from numpy.lib import recfunctions
+		return recfunctions.structured_to_unstructured(snapshots, dtype=dtype)
+
+def _RegisterElement(reg):
+	"""
+
+		Returns the struct format code and element count of a register.
+
+	"""
+	if isinstance(reg.datatype, DatatypeArray):
+		code, count = RegisterFormat.get(reg.datatype.type.type), reg.datatype.size
+	else:
+		code, count = RegisterFormat.get(reg.datatype.type), 1
+	if code is None:
+		raise ValueError("unsupported data type for register %s" % reg.name)
+	return code, count
+
+class DmaCodec():
+	"""
+
+		Converter between raw DMA FIFO elements and NumPy arrays, derived from a DmaChannel (requires NumPy).
+		Integer and boolean channels are viewed in place, without copying. Fixed-point channels (integer
+		word length different from word length) are scaled by 2**(integerWordLength - wordLength) to
+		floats; elements narrower than their container are sign-extended or masked first.
+
+	"""
+	__slots__ = ("dtype", "itemsize", "wordLength", "signed", "scale", "minimum", "maximum")
+
+	def __init__(self, channel, byteOrder="<"):
+		"""
+
+			Initialization.
+
+			Parameters:
+				channel         DmaChannel object
+				byteOrder       byte order of FIFO data ("<" or ">") (str, optional)
+
+		"""
+		import numpy
+		datatype = channel.datatype
+		code = RegisterFormat.get(datatype.subtype)
+		fixedPoint = datatype.integerWordLength != datatype.wordLength and datatype.wordLength > 0
+		if code is None or fixedPoint:
+			if datatype.wordLength <= 0 or datatype.wordLength > 64:
+				raise ValueError("unsupported data type for DMA channel %s" % channel.name)
+			size = 1
+			while size * 8 < datatype.wordLength:
+				size *= 2
+			code = {1:"b", 2:"h", 4:"i", 8:"q"}[size]
+			if not datatype.signed:
+				code = code.upper()
+		self.dtype = numpy.dtype(byteOrder + code) # raw element dtype
+		self.itemsize = self.dtype.itemsize # raw element size in bytes
+		self.wordLength = datatype.wordLength if fixedPoint else self.itemsize * 8 # significant bits per element
+		self.signed = self.dtype.kind == "i" # True if elements are signed
+		self.scale = 2.0**(datatype.integerWordLength - datatype.wordLength) if fixedPoint else None # fixed-point scale, None for plain channels
+		self.minimum = datatype.minimum # lowest representable value
+		self.maximum = datatype.maximum # highest representable value
+
+	def ToArray(self, buffer, out=None, scratch=None):
+		"""
+
+			Converts raw FIFO elements to an array.
+
+			Parameters:
+				buffer          raw elements (bytes-like object whose length is a multiple of itemsize)
+				out             preallocated float64 array receiving scaled values (numpy.ndarray, optional)
+				scratch         preallocated integer array of the element type (native byte order)
+								receiving sign-extended or masked elements (numpy.ndarray, optional)
+
+			Output:
+				numpy.ndarray: a read-only view of buffer for plain channels (scratch if masking is
+				needed), float values for fixed-point channels
+
+		"""
+		import numpy
+		raw = numpy.frombuffer(buffer, dtype=self.dtype)
+		bits = self.itemsize * 8
+		if self.wordLength < bits:
+			if scratch is None:
+				scratch = numpy.empty(len(raw), dtype=self.dtype.newbyteorder("="))
+			scratch = scratch[:len(raw)]
+			if self.signed:
+				shift = bits - self.wordLength
+				numpy.left_shift(raw, shift, out=scratch)
+				numpy.right_shift(scratch, shift, out=scratch)
+			else:
+				numpy.bitwise_and(raw, (1 << self.wordLength) - 1, out=scratch)
+			raw = scratch
+		if self.scale is None:
+			return raw
+		if out is None:
+			out = numpy.empty(len(raw))
+		return numpy.multiply(raw, self.scale, out=out[:len(raw)])
+
+	def FromArray(self, values, out=None):
+		"""
+
+			Converts values to raw FIFO elements. Fixed-point values are rounded and clipped to the word length.
+
+			Parameters:
+				values          values (array-like)
+				out             preallocated array of dtype receiving the elements (numpy.ndarray, optional)
+
+			Output:
+				numpy.ndarray of dtype, usable wherever a bytes-like object is expected
+
+		"""
+		import numpy
+		values = numpy.asarray(values)
+		if out is None:
+			out = numpy.empty(len(values), dtype=self.dtype)
+		out = out[:len(values)]
+		if self.scale is None:
+			out[...] = values
+			return out
+		if self.signed:
+			low, high = -(1 << (self.wordLength - 1)), (1 << (self.wordLength - 1)) - 1
+		else:
+			low, high = 0, (1 << self.wordLength) - 1
+		numpy.clip(numpy.rint(values / self.scale), low, high, out=out, casting="unsafe")
+		return out
+
+class DmaStream():
+	"""
+
+		Splits raw DMA FIFO data from any byte source into decoded fixed-size blocks (requires NumPy).
+		Data is read into a ring buffer allocated once, sized from the FIFO depth
+		(numberOfElements) and divided into block slots; elements split across chunk boundaries
+		are simply completed by the next chunk. Blocks are views into the ring (or, for
+		fixed-point and narrow channels, into preallocated per-slot arrays, so decoding allocates
+		no element buffers): a block stays valid until slots - 1
+		more blocks have been produced, so copy it if it must be kept longer.
+
+	"""
+	__slots__ = ("codec", "number", "blockSize", "slots", "_ring", "_raw", "_out", "_scratch")
+
+	def __init__(self, channel, blockSize=None, byteOrder="<"):
+		"""
+
+			Initialization.
+
+			Parameters:
+				channel         DmaChannel object
+				blockSize       number of elements per block; defaults to half the FIFO depth (int, optional)
+				byteOrder       byte order of FIFO data ("<" or ">") (str, optional)
+
+		"""
+		import numpy
+		codec = DmaCodec(channel, byteOrder)
+		depth = channel.numberOfElements if channel.numberOfElements > 0 else 2048
+		if blockSize is None:
+			blockSize = max(1, depth // 2)
+		self.codec = codec # element converter (DmaCodec object)
+		self.number = channel.number # channel number
+		self.blockSize = blockSize # number of elements per block
+		self.slots = max(2, depth // blockSize) # number of blocks held by the ring
+		self._ring = bytearray(self.slots * blockSize * codec.itemsize) # ring buffer
+		self._raw = [numpy.frombuffer(self._ring, dtype=codec.dtype, count=blockSize, offset=slot * blockSize * codec.itemsize) for slot in range(self.slots)] # raw element view of each slot
+		self._out = [numpy.empty(blockSize) for slot in range(self.slots)] if codec.scale is not None else None # float output of each slot
+		self._scratch = [numpy.empty(blockSize, dtype=codec.dtype.newbyteorder("=")) for slot in range(self.slots)] if codec.wordLength < codec.itemsize * 8 else None # sign-extended or masked elements of each slot
+
+	def Blocks(self, source):
+		"""
+
+			Reads a source to its end, producing blocks as they fill up. The last block may be shorter.
+
+			Parameters:
+				source          object with a readinto method (file, pipe, BytesIO, ...), socket
+								(recv_into method), or iterable of bytes-like chunks
+
+			Output:
+				generator of blocks (numpy.ndarray)
+
+		"""
+		slotBytes = self.blockSize * self.codec.itemsize
+		view = memoryview(self._ring)
+		slot = 0
+		filled = 0
+		read = getattr(source, "readinto", None) or getattr(source, "recv_into", None)
+		if read is not None:
+			while True:
+				base = slot * slotBytes
+				n = read(view[base + filled:base + slotBytes])
+				if not n:
+					break
+				filled += n
+				if filled == slotBytes:
+					yield self._Block(slot, self.blockSize)
+					slot = (slot + 1) % self.slots
+					filled = 0
+		else:
+			for chunk in source:
+				chunk = memoryview(chunk).cast("B")
+				pos = 0
+				while pos < len(chunk):
+					base = slot * slotBytes
+					n = min(slotBytes - filled, len(chunk) - pos)
+					view[base + filled:base + filled + n] = chunk[pos:pos + n]
+					pos += n
+					filled += n
+					if filled == slotBytes:
+						yield self._Block(slot, self.blockSize)
+						slot = (slot + 1) % self.slots
+						filled = 0
+		if filled % self.codec.itemsize != 0:
+			raise ValueError("data ends with an incomplete element")
+		if filled > 0:
+			yield self._Block(slot, filled // self.codec.itemsize)
+
+	def _Block(self, slot, count):
+		"""
+
+			Decodes the first count elements of a ring slot.
+
+		"""
+		raw = self._raw[slot] if count == self.blockSize else self._raw[slot][:count]
+		if self.codec.scale is None and self.codec.wordLength == self.codec.itemsize * 8:
+			return raw
+		return self.codec.ToArray(raw, out=self._out[slot] if self._out is not None else None,
+			scratch=self._scratch[slot] if self._scratch is not None else None)
+
+class LVbitxCache():
+	"""
+
+		Cache of parsed bitfile models.
+		Bitfile objects (see LVbitxParse.Load) are kept in a bounded in-memory LRU, in front of an
+		optional on-disk store. Entries are keyed by file path, size and modification time, plus a
+		SHA-256 hash of the content if requested. A hit skips XML parsing entirely. Every call
+		returns its own copy of the models, so callers can edit them without affecting the cache.
+
+	"""
+	def __init__(self, directory=None, maxEntries=64, contentHash=False):
+		"""
+
+			Initialization.
+
+			Parameters:
+				directory       on-disk store directory, created if needed; None for memory only (str, optional)
+				maxEntries      maximum number of bitfiles kept in memory (int, optional)
+				contentHash     if True, the file content hash is part of the key (bool, optional)
+
+		"""
+		import collections, os, threading
+		self.directory = directory # on-disk store directory
+		self.maxEntries = maxEntries # memory LRU size
+		self.contentHash = contentHash # if True, keys include a content hash
+		self.memoryHits = 0 # number of hits in memory
+		self.diskHits = 0 # number of hits on disk
+		self.misses = 0 # number of parsed files
+		self._entries = collections.OrderedDict() # key -> Bitfile, least recently used first
+		self._lock = threading.Lock()
+		if directory is not None and not os.path.isdir(directory):
+			os.makedirs(directory)
+
+	def Load(self, fileName):
+		"""
+
+			Returns the models of a bitfile, parsing it only on a cache miss.
+
+			Parameters:
+				fileName        LVBITX file name (str)
+
+			Output:
+				Bitfile object (a copy owned by the caller)
+
+		"""
+		key = self._Key(fileName)
+		with self._lock:
+			bitfile = self._entries.get(key)
+			if bitfile is not None:
+				self._entries.move_to_end(key)
+				self.memoryHits += 1
+				return _CopyModel(bitfile)
+		bitfile = self._ReadStore(key)
+		if bitfile is not None:
+			with self._lock:
+				self.diskHits += 1
+		else:
+			bitfile = LVbitxParse(fileName, engine="stream").Load()
+			self._WriteStore(key, bitfile)
+			with self._lock:
+				self.misses += 1
+		self._Remember(key, bitfile)
+		return _CopyModel(bitfile)
+
+	def Invalidate(self, fileName=None):
+		"""
+
+			Drops cached entries from memory and disk.
+
+			Parameters:
+				fileName        LVBITX file name whose entries are dropped; None drops everything (str, optional)
+
+		"""
+		import os
+		path = None if fileName is None else os.path.abspath(fileName)
+		with self._lock:
+			for key in list(self._entries.keys()):
+				if path is None or key[0] == path:
+					del self._entries[key]
+		if self.directory is not None:
+			prefix = "" if path is None else self._PathDigest(path) + "-"
+			for name in os.listdir(self.directory):
+				if name.startswith(prefix) and name.endswith(".pickle"):
+					try:
+						os.remove(os.path.join(self.directory, name))
+					except OSError:
+						pass
+
+	def Stats(self):
+		"""
+
+			Reports cache statistics.
+
+			Output:
+				dict with memoryHits, diskHits, hits, misses and entries (number of bitfiles in memory)
+
+		"""
+		with self._lock:
+			return {"memoryHits":self.memoryHits, "diskHits":self.diskHits, "hits":self.memoryHits + self.diskHits,
+				"misses":self.misses, "entries":len(self._entries)}
+
+	def _Key(self, fileName):
+		"""
+
+			Builds the cache key of a file: (absolute path, size, modification time[, content hash]).
+
+		"""
+		import os
+		path = os.path.abspath(fileName)
+		info = os.stat(path)
+		if not self.contentHash:
+			return (path, info.st_size, info.st_mtime_ns)
+		import hashlib
+		digest = hashlib.sha256()
+		with open(path, "rb") as f:
+			for chunk in iter(lambda: f.read(1<<20), b""):
+				digest.update(chunk)
+		return (path, info.st_size, info.st_mtime_ns, digest.hexdigest())
+
+	@staticmethod
+	def _PathDigest(path):
+		import hashlib
+		return hashlib.sha1(path.encode("utf-8")).hexdigest()
+
+	def _StoreName(self, key):
+		"""
+
+			Returns the on-disk file name of an entry: <path digest>-<version digest>.pickle.
+
+		"""
+		import hashlib, os
+		version = hashlib.sha1(repr(key[1:]).encode("ascii")).hexdigest()
+		return os.path.join(self.directory, "%s-%s.pickle" % (self._PathDigest(key[0]), version))
+
+	def _ReadStore(self, key):
+		"""
+
+			Reads an entry from disk. Unreadable entries count as missing.
+
+		"""
+		if self.directory is None:
+			return None
+		import pickle
+		try:
+			with open(self._StoreName(key), "rb") as f:
+				stored = pickle.load(f)
+		except (IOError, OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+			return None
+		if stored[0] != key:
+			return None
+		return stored[1]
+
+	def _WriteStore(self, key, bitfile):
+		"""
+
+			Writes an entry to disk atomically and removes older versions of the same file.
+
+		"""
+		if self.directory is None:
+			return
+		import os, pickle, tempfile
+		self.Invalidate(key[0])
+		fd, tempName = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+		try:
+			with os.fdopen(fd, "wb") as f:
+				pickle.dump((key, bitfile), f, pickle.HIGHEST_PROTOCOL)
+			os.replace(tempName, self._StoreName(key))
+		except:
+			os.remove(tempName)
+			raise
+
+	def _Remember(self, key, bitfile):
+		"""
+
+			Puts an entry in the memory LRU, evicting the least recently used ones.
+
+		"""
+		with self._lock:
+			self._entries[key] = bitfile
+			self._entries.move_to_end(key)
+			while len(self._entries) > self.maxEntries:
+				self._entries.popitem(last=False)
+
+_ProbeFields = ("bitfileVersion", "signatureRegister", "timeStamp", "viName", "targetClass")
+_ProbeSections = (u"RegisterList", u"Icon", u"DmaChannelAllocationList", u"Bitstream")
+
+def ProbeFile(fileName, chunkSize=4096):
+	"""
+
+		Reads identification fields from the beginning of a bitfile, without parsing the rest.
+		The file is read chunk by chunk and parsing stops as soon as all fields are known, or
+		when a large section (register list, icon, DMA channels) starts after the signature and
+		VI name have been found, and in any case at the bitstream. Fields that come after the
+		stopping point (usually targetClass) are None.
+
+		Parameters:
+			fileName        LVBITX file name or path, binary file-like object (read from its
+							current position), zipfile.Path, or bytes-like object
+			chunkSize       number of bytes read at a time (int, optional)
+
+		Output:
+			dict with bitfileVersion, signatureRegister, timeStamp, viName, targetClass (str or None)
+			and bytesRead (int)
+
+	"""
+	import os, zipfile
+	from xml.parsers import expat
+	parser = expat.ParserCreate()
+	handler = _StreamHandler(parser)
+	required = set((u"SignatureRegister", u"Name"))
+	wanted = set(tag for tag, (parents, target, codec) in _StreamHandler.fields.items() if target in _ProbeFields)
+	def StartElement(name, attrs):
+		if name in _ProbeSections and (name == u"Bitstream" or required <= handler.seen):
+			raise _StopParsing()
+		handler.StartElement(name, attrs)
+	parser.StartElementHandler = StartElement
+	if isinstance(fileName, zipfile.Path):
+		source = fileName.open("rb")
+	elif isinstance(fileName, (str, os.PathLike)):
+		source = open(fileName, "rb")
+	else:
+		source = None
+	name = str(fileName) if source is not None else getattr(fileName, "name", "")
+	name = name if isinstance(name, str) else ""
+	read = 0
+	try:
+		if source is None and not hasattr(fileName, "read"):
+			data = memoryview(fileName).cast("B")
+			chunks = (data[pos:pos + chunkSize] for pos in range(0, len(data), chunkSize))
+		else:
+			stream = source if source is not None else fileName
+			chunks = iter(lambda: stream.read(chunkSize), b"")
+		for chunk in chunks:
+			read += len(chunk)
+			parser.Parse(bytes(chunk), False)
+			if wanted <= handler.seen:
+				break
+	except _StopParsing:
+		pass
+	except expat.ExpatError as e:
+		raise LVbitxParseError("%s: %s" % (name or "<data>", expat.ErrorString(e.code)), name, e.lineno, e.offset)
+	finally:
+		if source is not None:
+			source.close()
+	result = dict((target, getattr(handler.bitfile, target) if tag in handler.seen else None)
+		for tag, (parents, target, codec) in _StreamHandler.fields.items() if target in _ProbeFields)
+	result["bytesRead"] = read
+	return result
+
+def ScanFile(fileName):
+	"""
+
+		Summarizes a bitfile with the streaming engine. Errors are reported in the result
+		rather than raised, so that batch scans go on past malformed files.
+
+		Parameters:
+			fileName        LVBITX file name (str)
+
+		Output:
+			dict with file, signature, viName, registers, channels, registerBlocks,
+			usedBaseClocks (counts) and bitstreamSize (decoded bytes), or file and error
+
+	"""
+	try:
+		lvp = LVbitxParse(fileName, engine="stream")
+		bitfile = lvp.Load()
+		return {"file":fileName, "signature":bitfile.signatureRegister, "viName":bitfile.viName,
+			"registers":len(bitfile.registers), "channels":len(bitfile.channels),
+			"registerBlocks":len(bitfile.registerBlocks), "usedBaseClocks":len(bitfile.usedBaseClocks),
+			"bitstreamSize":lvp.GetBitstreamLength()}
+	except Exception as e:
+		return {"file":fileName, "error":"%s: %s" % (type(e).__name__, e)}
+
+def ScanFiles(fileNames, jobs=None):
+	"""
+
+		Summarizes bitfiles in parallel over a process pool (see ScanFile).
+		Results are yielded as soon as they are available, in completion order.
+
+		Parameters:
+			fileNames       LVBITX file names (iterable of str)
+			jobs            number of worker processes; None uses all cores, 1 scans in-process (int, optional)
+
+		Output:
+			generator of ScanFile results (dict)
+
+	"""
+	if jobs == 1:
+		for fileName in fileNames:
+			yield ScanFile(fileName)
+		return
+	import concurrent.futures, itertools, os
+	if jobs is None:
+		jobs = os.cpu_count() or 1
+	with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+		window = 4 * jobs # number of files in flight
+		names = iter(fileNames)
+		pending = set(executor.submit(ScanFile, name) for name in itertools.islice(names, window))
+		while len(pending) > 0:
+			done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+			for future in done:
+				yield future.result()
+			pending |= set(executor.submit(ScanFile, name) for name in itertools.islice(names, len(done)))
+
+def ScanDirectory(directory, jobs=None, pattern="*.lvbitx"):
+	"""
+
+		Summarizes all bitfiles found below a directory (see ScanFiles).
+
+		Parameters:
+			directory       directory scanned recursively (str)
+			jobs            number of worker processes (int, optional)
+			pattern         file name pattern (str, optional)
+
+		Output:
+			generator of ScanFile results (dict)
+
+	"""
+	return ScanFiles(_FindFiles(directory, pattern), jobs)
+
+def _FindFiles(directory, pattern):
+	"""
+
+		Lists files matching a name pattern below a directory, in sorted order.
+
+		Output:
+			generator of file names (str)
+
+	"""
+	import fnmatch, os
+	for root, dirs, files in os.walk(directory):
+		dirs.sort()
+		for name in sorted(files):
+			if fnmatch.fnmatch(name, pattern):
+				yield os.path.join(root, name)
+
+def _ModelFields(obj, prefix=""):
+	"""
+
+		Flattens a model object into a dict of plain values, nested models giving dotted names
+		(e.g. datatype.type).
+
+	"""
+	fields = {}
+	for name in _SlotNames(type(obj)):
+		value = getattr(obj, name)
+		if hasattr(value, "__slots__"):
+			fields.update(_ModelFields(value, prefix + name + "."))
+		else:
+			fields[prefix + name] = list(value) if isinstance(value, (list, tuple)) else value
+	return fields
+
+def _DiffFields(old, new):
+	"""
+
+		Compares two flattened models.
+
+		Output:
+			dict field -> [old value, new value], for changed fields only
+
+	"""
+	changes = {}
+	for name in sorted(set(old) | set(new)):
+		if old.get(name) != new.get(name):
+			changes[name] = [old.get(name), new.get(name)]
+	return changes
+
+def _DiffRecords(old, new, key):
+	"""
+
+		Compares two lists of records matched by key.
+
+		Output:
+			dict with added and removed keys (lists) and changed (key -> changed fields)
+
+	"""
+	oldByKey = dict((key(obj), obj) for obj in old)
+	newByKey = dict((key(obj), obj) for obj in new)
+	changed = {}
+	for k, obj in oldByKey.items():
+		if k in newByKey:
+			changes = _DiffFields(_ModelFields(obj), _ModelFields(newByKey[k]))
+			if changes:
+				changed[k] = changes
+	return {"added":sorted(k for k in newByKey if k not in oldByKey),
+		"removed":sorted(k for k in oldByKey if k not in newByKey),
+		"changed":changed}
+
+DiffKeys = {u"name":lambda obj: obj.name, u"id":lambda obj: obj.id} # register key name -> key function
+
+def DiffBitfiles(old, new, registerKey=u"name"):
+	"""
+
+		Compares the models of two bitfiles. Records are matched with hash indexes (registers by name
+		or id, DMA channels by number, register blocks and base clocks by name), so the cost is linear
+		in the number of records.
+
+		Parameters:
+			old             Bitfile object
+			new             Bitfile object
+			registerKey     register matching key, one of DiffKeys (str, optional)
+
+		Output:
+			dict with header and icon (field -> [old value, new value]) and registers, channels,
+			registerBlocks, usedBaseClocks (dicts with added, removed and changed entries)
+
+	"""
+	header = ("bitfileVersion", "signatureRegister", "signatureGuids", "signatureNames", "timeStamp",
+		"viName", "targetClass", "autoRunWhenDownloaded", "multipleUserClocks")
+	byName = DiffKeys[u"name"]
+	return {"header":_DiffFields(dict((name, getattr(old, name)) for name in header), dict((name, getattr(new, name)) for name in header)),
+		"icon":_DiffFields(_ModelFields(old.icon), _ModelFields(new.icon)),
+		"registers":_DiffRecords(old.registers, new.registers, DiffKeys[registerKey]),
+		"channels":_DiffRecords(old.channels, new.channels, lambda obj: obj.number),
+		"registerBlocks":_DiffRecords(old.registerBlocks, new.registerBlocks, byName),
+		"usedBaseClocks":_DiffRecords(old.usedBaseClocks, new.usedBaseClocks, byName)}
+
+def DiffFiles(oldFileName, newFileName, registerKey=u"name", bitstream=True):
+	"""
+
+		Compares two bitfiles (see DiffBitfiles), including their bitstreams. Files are read with
+		the streaming engine and bitstreams are compared by hashing them chunk by chunk, so neither
+		payload is held in memory.
+
+		Parameters:
+			oldFileName     LVBITX file name (str)
+			newFileName     LVBITX file name (str)
+			registerKey     register matching key, one of DiffKeys (str, optional)
+			bitstream       if False, bitstreams are not compared (bool, optional)
+
+		Output:
+			DiffBitfiles result, with an additional bitstream entry holding identical (bool) and
+			old and new SHA-256 hashes of the decoded bitstreams
+
+	"""
+	import hashlib
+	parsers = []
+	for fileName in (oldFileName, newFileName):
+		parsers.append(LVbitxParse(fileName, engine="stream"))
+	diff = DiffBitfiles(parsers[0].Load(), parsers[1].Load(), registerKey)
+	if bitstream:
+		hashes = []
+		for lvp in parsers:
+			digest = hashlib.sha256()
+			for chunk in lvp._BitstreamChunks():
+				digest.update(chunk)
+			hashes.append(digest.hexdigest())
+		diff["bitstream"] = {"identical":hashes[0] == hashes[1], "old":hashes[0], "new":hashes[1]}
+	return diff
+
+def _DiffIsEmpty(diff):
+	"""
+
+		Tells whether a DiffBitfiles or DiffFiles result reports no difference.
+
+	"""
+	for name, value in diff.items():
+		if name == "bitstream":
+			if not value["identical"]:
+				return False
+		elif name in ("header", "icon"):
+			if value:
+				return False
+		elif value["added"] or value["removed"] or value["changed"]:
+			return False
+	return True
+
+def main(argv=None):
+	"""
+
+		Command-line entry point (python -m lvbitx).
+
+		Parameters:
+			argv            command-line arguments, without program name (list, optional)
+
+		Output:
+			exit status (int)
+
+	"""
+	import argparse, json, sys
+	parser = argparse.ArgumentParser(prog="python -m lvbitx", description="LabView FPGA bitfile tools")
+	commands = parser.add_subparsers(dest="command")
+	commands.required = True
+	scan = commands.add_parser("scan", help="summarize bitfiles as JSON lines")
+	scan.add_argument("paths", nargs="+", metavar="PATH", help="bitfile, or directory scanned recursively")
+	scan.add_argument("--jobs", "-j", type=int, default=None, help="number of worker processes (default: all cores)")
+	scan.add_argument("--pattern", default="*.lvbitx", help="file name pattern in directories (default: *.lvbitx)")
+	diff = commands.add_parser("diff", help="compare two bitfiles, as JSON")
+	diff.add_argument("old", help="reference bitfile")
+	diff.add_argument("new", help="bitfile compared to the reference")
+	diff.add_argument("--key", choices=sorted(DiffKeys), default=u"name", help="register matching key (default: name)")
+	diff.add_argument("--no-bitstream", action="store_true", help="don't compare bitstreams")
+	args = parser.parse_args(argv)
+
+	if args.command == "scan":
+		import os
+		def names():
+			# files and directory contents share one pool
+			for path in args.paths:
+				if os.path.isdir(path):
+					for name in _FindFiles(path, args.pattern):
+						yield name
+				else:
+					yield path
+		status = 0
+		for result in ScanFiles(names(), args.jobs):
+			if "error" in result:
+				status = 1
+			sys.stdout.write(json.dumps(result, sort_keys=True) + "\n")
+			sys.stdout.flush()
+		return status
+
+	if args.command == "diff":
+		try:
+			result = DiffFiles(args.old, args.new, args.key, not args.no_bitstream)
+		except Exception as e:
+			sys.stderr.write("%s: %s\n" % (type(e).__name__, e))
+			return 2
+		sys.stdout.write(json.dumps(result, indent=1, sort_keys=True) + "\n")
+		return 0 if _DiffIsEmpty(result) else 1
+
+async def LoadAsync(fileName, engine="stream", executor=None):
+	"""
+
+		Opens a bitfile without blocking the asyncio event loop: parsing runs on an executor.
+
+		Parameters:
+			fileName        LVBITX file name (str)
+			engine          parser engine, one of ParserEngines (str, optional)
+			executor        executor running the parser; None uses the loop's default thread pool
+							(concurrent.futures.Executor, optional)
+
+		Output:
+			LVbitxParse object
+
+	"""
+	import asyncio
+	loop = asyncio.get_running_loop()
+	return await loop.run_in_executor(executor, LVbitxParse, fileName, engine)
+
+async def LoadManyAsync(fileNames, limit=4, engine="stream", executor=None):
+	"""
+
+		Opens several bitfiles concurrently, at most limit at a time (see LoadAsync).
+		If one of them fails or the call is cancelled, the loads not started yet are cancelled.
+
+		Parameters:
+			fileNames       LVBITX file names (iterable of str)
+			limit           maximum number of concurrent loads (int, optional)
+			engine          parser engine, one of ParserEngines (str, optional)
+			executor        executor running the parsers (concurrent.futures.Executor, optional)
+
+		Output:
+			list of LVbitxParse objects, in the order of fileNames
+
+	"""
+	import asyncio
+	semaphore = asyncio.Semaphore(limit)
+	async def load(fileName):
+		async with semaphore:
+			return await LoadAsync(fileName, engine, executor)
+	tasks = [asyncio.ensure_future(load(fileName)) for fileName in fileNames]
+	try:
+		return await asyncio.gather(*tasks)
+	finally:
+		for task in tasks:
+			task.cancel()
+
+async def IterBitstreamAsync(lvp, chunkSize=1<<20, executor=None):
+	"""
+
+		Decodes the bitstream of an opened bitfile chunk by chunk without blocking the asyncio
+		event loop: each chunk is decoded on an executor.
+
+		Parameters:
+			lvp             opened parser (LVbitxParse)
+			chunkSize       number of encoded bytes decoded at a time (int, optional)
+			executor        executor running the decoder; None uses the loop's default thread pool
+							(concurrent.futures.Executor, optional)
+
+		Output:
+			async generator of decoded binary chunks (bytes)
+
+	"""
+	import asyncio, threading
+	loop = asyncio.get_running_loop()
+	chunks = lvp._BitstreamChunks(chunkSize)
+	lock = threading.Lock() # a cancelled step may still be running when the generator is closed
+	def step():
+		with lock:
+			return next(chunks, None)
+	def close():
+		with lock:
+			chunks.close()
+	try:
+		while True:
+			chunk = await loop.run_in_executor(executor, step)
+			if chunk is None:
+				break
+			yield chunk
+	finally:
+		# waits for a step still running, so the file data is released when the generator is closed
+		await loop.run_in_executor(executor, close)
+
+class _StopParsing(Exception):
+	"""
+
+		Raised by expat handlers to end a parse early.
+
+	"""
+	pass
+
+_StartTagPattern = None
+
+def _StartTag(data, start):
+	"""
+
+		Measures the start tag beginning at a given offset.
+
+		Parameters:
+			data            file data (bytes-like object, e.g. mmap)
+			start           offset of the '<' character (int)
+
+		Output:
+			(end, selfClosing) tuple, end being the offset after '>'
+
+	"""
+	global _StartTagPattern
+	if _StartTagPattern is None:
+		import re
+		_StartTagPattern = re.compile(br'<[^\s/>]+(?:\s+[^\s=/>]+\s*=\s*(?:"[^"]*"|\'[^\']*\'))*\s*(/?)>')
+	match = _StartTagPattern.match(data, start)
+	return match.end(), match.group(1) == b"/"
+
+class _PatchIndexer():
+	"""
+
+		Expat event handlers recording the byte ranges of patchable metadata (see LVbitxPatch).
+		Parsing stops at the <Bitstream> tag, which is never read.
+
+	"""
+	def __init__(self, parser, data):
+		"""
+
+			Initialization.
+
+			Parameters:
+				parser          expat parser the handlers are attached to (xmlparser)
+				data            file data (bytes-like object, e.g. mmap)
+
+		"""
+		self.parser = parser # expat parser
+		self.data = data # file data
+		self.path = [] # tag names of currently open elements
+		self.starts = [] # (offset, content offset, self-closing) of currently open elements
+		self.text = None # character data buffer of the element being read
+		self.header = {} # header field tag -> range
+		self.registers = [] # per register dicts: name, id, fields (tag -> range)
+		self.channels = [] # per channel dicts: name, number, nameRange, fields (tag -> range)
+		self.record = None # dict of the register or channel being read
+		parser.StartElementHandler = self.StartElement
+		parser.EndElementHandler = self.EndElement
+		parser.CharacterDataHandler = self.CharacterData
+
+	def StartElement(self, name, attrs):
+		if name == u"Bitstream":
+			raise _StopParsing()
+		parent = self.path[-1] if self.path else None
+		start = self.parser.CurrentByteIndex
+		end, selfClosing = _StartTag(self.data, start)
+		if name == u"Register" and parent == u"RegisterList":
+			self.record = {"name":u"", "id":None, "fields":{}}
+			self.registers.append(self.record)
+		elif name == u"Channel" and parent == u"DmaChannelAllocationList":
+			self.record = {"name":attrs.get(u"name", u""), "number":None, "fields":{}, "nameRange":self._AttributeRange(start, end, b"name")}
+			self.channels.append(self.record)
+		self.path.append(name)
+		self.starts.append((start, end, selfClosing))
+		self.text = []
+
+	def EndElement(self, name):
+		self.path.pop()
+		start, contentStart, selfClosing = self.starts.pop()
+		if selfClosing:
+			fieldRange = (start, contentStart, name, True)
+		else:
+			fieldRange = (contentStart, self.parser.CurrentByteIndex, name, False)
+		text = u"".join(self.text or [])
+		self.text = None
+		parent = self.path[-1] if self.path else None
+		if name in _StreamHandler.fields and parent in _StreamHandler.fields[name][0]:
+			self.header.setdefault(name, fieldRange)
+		elif self.record is not None and parent in (u"Register", u"Channel"):
+			self.record["fields"][name] = fieldRange
+			if parent == u"Register" and name == u"Name": self.record["name"] = text
+			elif parent == u"Register" and name == u"ID": self.record["id"] = int(text)
+			elif parent == u"Channel" and name == u"Number": self.record["number"] = int(text)
+		elif name in (u"Register", u"Channel"):
+			self.record = None
+
+	def CharacterData(self, data):
+		if self.text is not None:
+			self.text.append(data)
+
+	def _AttributeRange(self, start, end, name):
+		"""
+
+			Finds the value range of an attribute within a start tag.
+
+		"""
+		import re
+		match = re.compile(br'\s' + name + br'\s*=\s*(["\'])(.*?)\1', re.S).search(self.data, start, end)
+		if match is None:
+			return None
+		return (match.start(2), match.end(2), None, False)
+
+class LVbitxPatch():
+	"""
+
+		In-place metadata editor.
+		Edits are recorded as byte range replacements; writing copies untouched ranges (in
+		particular the encoded bitstream) through unchanged, in the kernel when possible, so the
+		cost of an edit depends on the size of the change, not on the size of the file.
+		Only the metadata before <Bitstream> is indexed.
+
+	"""
+	def __init__(self, fileName):
+		"""
+
+			Initialization.
+
+			Parameters:
+				fileName        LVBITX file name (str)
+
+		"""
+		self.fileName = fileName # LVBITX file name
+		self.edits = {} # start offset -> (end offset, replacement bytes)
+		self._Index()
+
+	def _Index(self):
+		"""
+
+			Records patchable byte ranges of the file.
+
+		"""
+		import mmap
+		from xml.parsers import expat
+		with open(self.fileName, "rb") as f:
+			data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+		try:
+			parser = expat.ParserCreate()
+			indexer = _PatchIndexer(parser, data)
+			try:
+				for pos in range(0, len(data), 1<<16):
+					parser.Parse(data[pos:pos + (1<<16)], False)
+				parser.Parse(b"", True)
+			except _StopParsing:
+				pass
+			indexer.parser = indexer.data = None
+		finally:
+			data.close()
+		self.header = indexer.header # header field tag -> range
+		self.registers = indexer.registers # per register ranges
+		self.channels = indexer.channels # per channel ranges
+
+	def SetSignature(self, signature):
+		"""
+
+			Changes SignatureRegister.
+
+			Parameters:
+				signature       new signature (str)
+
+		"""
+		self._Replace(self._HeaderRange(u"SignatureRegister"), signature)
+
+	def SetViName(self, name):
+		"""
+
+			Changes VI name.
+
+			Parameters:
+				name            new VI name (str)
+
+		"""
+		self._Replace(self._HeaderRange(u"Name"), name)
+
+	def SetAutoRunWhenDownloaded(self, autoRun):
+		"""
+
+			Changes AutoRunWhenDownloaded flag.
+
+			Parameters:
+				autoRun         if True, auto-run when loaded (bool)
+
+		"""
+		self._Replace(self._HeaderRange(u"AutoRunWhenDownloaded"), BoolCodec.Encode(autoRun))
+
+	def SetRegisterField(self, register, attribute, value):
+		"""
+
+			Changes a field of a register.
+
+			Parameters:
+				register        register name (str) or id (int)
+				attribute       Register attribute name, e.g. "hidden" or "offset" (str)
+				value           new value
+
+		"""
+		if isinstance(register, int):
+			records = [x for x in self.registers if x["id"] == register]
+		else:
+			records = [x for x in self.registers if x["name"] == register]
+		if len(records) == 0:
+			raise KeyError(register)
+		self._SetField(records[0], RegisterSchema, attribute, value)
+
+	def SetChannelField(self, channel, attribute, value):
+		"""
+
+			Changes a field of a DMA channel.
+
+			Parameters:
+				channel         channel name (str) or number (int)
+				attribute       DmaChannel attribute name, e.g. "name" or "numberOfElements" (str)
+				value           new value
+
+		"""
+		if isinstance(channel, int):
+			records = [x for x in self.channels if x["number"] == channel]
+		else:
+			records = [x for x in self.channels if x["name"] == channel]
+		if len(records) == 0:
+			raise KeyError(channel)
+		if attribute == "name":
+			if records[0]["nameRange"] is None:
+				raise KeyError(attribute)
+			self._Replace(records[0]["nameRange"], value)
+		else:
+			self._SetField(records[0], DmaChannelSchema, attribute, value)
+
+	def SetChannelName(self, channel, name):
+		"""
+
+			Renames a DMA channel.
+
+			Parameters:
+				channel         channel name (str) or number (int)
+				name            new name (str)
+
+		"""
+		self.SetChannelField(channel, "name", name)
+
+	def Write(self, fileName=None):
+		"""
+
+			Writes the patched file. Untouched byte ranges are copied without going through Python buffers.
+			The object then refers to the written file, which is indexed again.
+
+			Parameters:
+				fileName        output file name; None patches the input file (str, optional)
+
+		"""
+		import os, tempfile
+		edits = sorted((start, end, text) for start, (end, text) in self.edits.items())
+		if fileName is None and all(end - start == len(text) for start, end, text in edits):
+			# same sizes: overwrite bytes in place
+			fd = os.open(self.fileName, os.O_WRONLY)
+			try:
+				for start, end, text in edits:
+					os.pwrite(fd, text, start)
+			finally:
+				os.close(fd)
+		else:
+			target = fileName if fileName is not None else self.fileName
+			fd, tempName = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(target)), suffix=".tmp")
+			try:
+				with open(self.fileName, "rb") as src:
+					size = os.fstat(src.fileno()).st_size
+					pos = 0
+					for start, end, text in edits:
+						_CopyRange(src.fileno(), fd, pos, start - pos)
+						_WriteAll(_FdWriter(fd), text)
+						pos = end
+					_CopyRange(src.fileno(), fd, pos, size - pos)
+				os.close(fd)
+				fd = None
+				os.replace(tempName, target)
+			except:
+				if fd is not None:
+					os.close(fd)
+				os.remove(tempName)
+				raise
+			self.fileName = target
+		self.edits = {}
+		self._Index()
+
+	def _HeaderRange(self, tag):
+		if tag not in self.header:
+			raise KeyError(tag)
+		return self.header[tag]
+
+	def _SetField(self, record, schema, attribute, value):
+		"""
+
+			Replaces the text of a record field, encoded with the field codec of the schema.
+
+		"""
+		fields = [f for f in schema.fields if f.attribute == attribute and f.schema is None and f.decode is None]
+		if len(fields) == 0 or fields[0].tag not in record["fields"]:
+			raise KeyError(attribute)
+		self._Replace(record["fields"][fields[0].tag], fields[0].codec.Encode(value))
+
+	def _Replace(self, fieldRange, text):
+		"""
+
+			Records the replacement of an element text or attribute value.
+
+		"""
+		start, end, tag, selfClosing = fieldRange
+		text = _XmlEscape(text)
+		if selfClosing:
+			text = u"<%s>%s</%s>" % (tag, text, tag)
+		self.edits[start] = (end, text.encode("utf-8"))
+
+class _FdWriter():
+	"""
+
+		Minimal file-like wrapper around an OS file descriptor.
+
+	"""
+	def __init__(self, fd):
+		self.fd = fd
+
+	def write(self, data):
+		import os
+		return os.write(self.fd, data)
+
+def _CopyRange(src, dst, offset, count):
+	"""
+
+		Copies a byte range from a file descriptor to the current position of another one,
+		with copy_file_range or sendfile when available.
+
+		Parameters:
+			src             source file descriptor (int)
+			dst             destination file descriptor (int)
+			offset          source offset (int)
+			count           number of bytes (int)
+
+	"""
+	import os
+	for copy in (getattr(os, "copy_file_range", None), getattr(os, "sendfile", None)):
+		if copy is None:
+			continue
+		try:
+			while count > 0:
+				if copy is os.sendfile:
+					n = os.sendfile(dst, src, offset, count)
+				else:
+					n = os.copy_file_range(src, dst, count, offset)
+				if n == 0:
+					break
+				offset += n
+				count -= n
+			if count == 0:
+				return
+		except OSError:
+			pass
+	while count > 0:
+		chunk = os.pread(src, min(count, 1<<20), offset)
+		if len(chunk) == 0:
+			raise IOError("unexpected end of file")
+		_WriteAll(_FdWriter(dst), chunk)
+		offset += len(chunk)
+		count -= len(chunk)
+
+def _WrapLines(chunks, lineLength, separator):
+	"""
+
+		Splits a stream of text chunks into lines of fixed length.
+
+		Parameters:
+			chunks          text chunks (iterable of bytes)
+			lineLength      line length; 0 leaves the stream unchanged (int)
+			separator       line separator, written between lines only (bytes)
+
+		Output:
+			generator of chunks (bytes)
+
+	"""
+	column = 0
+	for chunk in chunks:
+		if lineLength == 0:
+			yield chunk
+			continue
+		pieces = []
+		pos = 0
+		while pos < len(chunk):
+			if column == lineLength:
+				pieces.append(separator)
+				column = 0
+			n = min(lineLength - column, len(chunk) - pos)
+			pieces.append(chunk[pos:pos + n])
+			pos += n
+			column += n
+		yield b"".join(pieces)
+
+class BitstreamStore():
+	"""
+
+		Content-addressed bitfile store.
+		Each bitfile is split into a metadata record and a bitstream blob. Blobs hold the decoded
+		bitstream, compressed with zlib (gzip container) or lzma, and are named after its SHA-256
+		hash, so bitfiles sharing a compiled image share one blob. Records keep the XML around the
+		bitstream, the layout of its base64 text and the parsed Bitfile model, which is enough to
+		rebuild the original file byte for byte.
+
+	"""
+	compressions = {"zlib":".gz", "lzma":".xz"} # compression -> blob file extension
+
+	def __init__(self, directory, compression="zlib"):
+		"""
+
+			Initialization.
+
+			Parameters:
+				directory       store directory, created if needed (str)
+				compression     blob compression, "zlib" or "lzma" (str, optional)
+
+		"""
+		import os
+		if compression not in self.compressions:
+			raise ValueError("unknown compression: %s" % compression)
+		self.directory = directory # store directory
+		self.compression = compression # compression of new blobs
+		for name in ("records", "blobs"):
+			if not os.path.isdir(os.path.join(directory, name)):
+				os.makedirs(os.path.join(directory, name))
+
+	def Add(self, fileName):
+		"""
+
+			Adds a bitfile to the store.
+
+			Parameters:
+				fileName        LVBITX file name (str)
+
+			Output:
+				record id (SHA-256 hash of the file, str)
+
+		"""
+		import hashlib, mmap, os, pickle, zlib
+		lvp = LVbitxParse(fileName, engine="stream")
+		start, end = lvp.stream.bitstreamRange or (0, 0)
+		with open(fileName, "rb") as f:
+			size = os.fstat(f.fileno()).st_size
+			data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size > 0 else b""
+		try:
+			fileHash = hashlib.sha256()
+			for pos in range(0, size, 1<<20):
+				fileHash.update(data[pos:min(pos + (1<<20), size)])
+			recordId = fileHash.hexdigest()
+			if os.path.exists(self._RecordName(recordId)):
+				return recordId
+			blob = self._AddBlob(lvp)
+			record = {"size":size, "blob":blob, "bitfile":lvp.Load(), "raw":None,
+				"prefix":zlib.compress(data[:start]), "suffix":zlib.compress(data[end:size]),
+				"layout":_Base64Layout(data, start, end)}
+			if self._Encoded(record) != self._Digest(data, start, end):
+				# unusual layout: keep the encoded text as is
+				record["layout"] = None
+				record["raw"] = zlib.compress(data[start:end])
+		finally:
+			if size > 0:
+				data.close()
+		self._Save(self._RecordName(recordId), lambda f: pickle.dump(record, f, pickle.HIGHEST_PROTOCOL))
+		return recordId
+
+	def Records(self):
+		"""
+
+			Lists stored records.
+
+			Output:
+				list of record ids (str)
+
+		"""
+		import os
+		return sorted(name[:-len(".record")] for name in os.listdir(os.path.join(self.directory, "records")) if name.endswith(".record"))
+
+	def GetBitfile(self, recordId):
+		"""
+
+			Returns the models of a stored bitfile.
+
+			Parameters:
+				recordId        record id (str)
+
+			Output:
+				Bitfile object
+
+		"""
+		return self._Record(recordId)["bitfile"]
+
+	def Rebuild(self, recordId, sink):
+		"""
+
+			Writes a byte-identical copy of a stored bitfile, encoding the bitstream chunk by chunk.
+
+			Parameters:
+				recordId        record id (str)
+				sink            destination (object with a write or sendall method)
+
+			Output:
+				number of bytes written (int)
+
+		"""
+		import zlib
+		record = self._Record(recordId)
+		written = 0
+		for chunk in self._EncodedChunks(record, zlib.decompress(record["prefix"]), zlib.decompress(record["suffix"])):
+			_WriteAll(sink, chunk)
+			written += len(chunk)
+		return written
+
+	def WriteBitstream(self, recordId, sink, chunkSize=1<<20, callback=None):
+		"""
+
+			Writes the decoded bitstream of a stored bitfile, straight from its blob.
+
+			Parameters:
+				recordId        record id (str)
+				sink            destination (object with a write or sendall method)
+				chunkSize       number of bytes written at a time (int, optional)
+				callback        function called after each chunk with the number of
+								bytes written so far (callable, optional)
+
+			Output:
+				number of bytes written (int)
+
+		"""
+		written = 0
+		with self._OpenBlob(self._Record(recordId)["blob"]) as blob:
+			for chunk in iter(lambda: blob.read(chunkSize), b""):
+				_WriteAll(sink, chunk)
+				written += len(chunk)
+				if callback is not None:
+					callback(written)
+		return written
+
+	def Remove(self, recordId):
+		"""
+
+			Removes a record, and its blob if no other record uses it.
+
+			Parameters:
+				recordId        record id (str)
+
+		"""
+		import os
+		blob = self._Record(recordId)["blob"]
+		os.remove(self._RecordName(recordId))
+		if all(self._Record(other)["blob"] != blob for other in self.Records()):
+			os.remove(self._BlobName(blob))
+
+	def _AddBlob(self, lvp):
+		"""
+
+			Stores the bitstream of a parsed bitfile unless an identical one is already there.
+
+			Output:
+				blob key (SHA-256 hash of the decoded bitstream, str)
+
+		"""
+		import gzip, hashlib, lzma, os
+		digest = hashlib.sha256()
+		for chunk in lvp._BitstreamChunks():
+			digest.update(chunk)
+		key = digest.hexdigest()
+		if self._BlobName(key) is None:
+			name = os.path.join(self.directory, "blobs", key + self.compressions[self.compression])
+			def write(f):
+				if self.compression == "zlib":
+					out = gzip.GzipFile(fileobj=f, mode="wb", mtime=0)
+				else:
+					out = lzma.LZMAFile(f, "wb")
+				with out:
+					lvp.WriteBitstream(out)
+			self._Save(name, write)
+		return key
+
+	def _BlobName(self, key):
+		"""
+
+			Returns the file name of a blob, whatever its compression, or None if it doesn't exist.
+
+		"""
+		import os
+		for extension in self.compressions.values():
+			name = os.path.join(self.directory, "blobs", key + extension)
+			if os.path.exists(name):
+				return name
+		return None
+
+	def _OpenBlob(self, key):
+		"""
+
+			Opens a blob for reading decoded bitstream data.
+
+		"""
+		import gzip, lzma
+		name = self._BlobName(key)
+		if name is None:
+			raise KeyError(key)
+		if name.endswith(".gz"):
+			return gzip.open(name, "rb")
+		return lzma.open(name, "rb")
+
+	def _RecordName(self, recordId):
+		"""
+
+			Returns the file name of a record.
+
+		"""
+		import os
+		return os.path.join(self.directory, "records", recordId + ".record")
+
+	def _Record(self, recordId):
+		"""
+
+			Loads a record; raises KeyError if it doesn't exist.
+
+		"""
+		import pickle
+		try:
+			with open(self._RecordName(recordId), "rb") as f:
+				return pickle.load(f)
+		except (IOError, OSError):
+			raise KeyError(recordId)
+
+	def _EncodedChunks(self, record, prefix=b"", suffix=b""):
+		"""
+
+			Generates the encoded bitstream text of a record, surrounded by prefix and suffix.
+
+		"""
+		import zlib
+		yield prefix
+		if record["raw"] is not None:
+			yield zlib.decompress(record["raw"])
+		else:
+			leading, lineLength, separator, trailing = record["layout"]
+			yield leading
+			with self._OpenBlob(record["blob"]) as blob:
+				for chunk in _WrapLines(_Base64EncodeChunks(blob), lineLength, separator):
+					yield chunk
+			yield trailing
+		yield suffix
+
+	def _Encoded(self, record):
+		"""
+
+			Hashes the encoded bitstream text rebuilt from a record.
+
+		"""
+		import hashlib
+		digest = hashlib.sha256()
+		for chunk in self._EncodedChunks(record):
+			digest.update(chunk)
+		return digest.hexdigest()
+
+	@staticmethod
+	def _Digest(data, start, end):
+		"""
+
+			Hashes a byte range.
+
+		"""
+		import hashlib
+		digest = hashlib.sha256()
+		for pos in range(start, end, 1<<20):
+			digest.update(data[pos:min(pos + (1<<20), end)])
+		return digest.hexdigest()
+
+	@staticmethod
+	def _Save(name, write):
+		"""
+
+			Writes a file atomically through a temporary file.
+
+		"""
+		import os, tempfile
+		fd, tempName = tempfile.mkstemp(dir=os.path.dirname(name), suffix=".tmp")
+		try:
+			with os.fdopen(fd, "wb") as f:
+				write(f)
+			os.replace(tempName, name)
+		except:
+			os.remove(tempName)
+			raise
+
+def _Base64Layout(data, start, end):
+	"""
+
+		Describes how a base64 text is laid out: whitespace around it, and line length and
+		separator if it is wrapped.
+
+		Parameters:
+			data            file data (bytes-like object, e.g. mmap)
+			start           start of the text (int)
+			end             end of the text (int, excluded)
+
+		Output:
+			(leading whitespace, line length, line separator, trailing whitespace) tuple
+			(line length is 0 if the text is on one line)
+
+	"""
+	head = bytes(data[start:min(end, start + (1<<16))])
+	text = head.lstrip(_Base64Whitespace)
+	leading = head[:len(head) - len(text)]
+	tail = bytes(data[max(start, end - 64):end])
+	trailing = tail[len(tail.rstrip(_Base64Whitespace)):]
+	lineLength = 0
+	separator = b""
+	for i in range(len(text)):
+		if text[i:i + 1] in (b"\r", b"\n"):
+			lineLength = i
+			separator = b"\r\n" if text[i:i + 2] == b"\r\n" else text[i:i + 1]
+			break
+	return (leading, lineLength, separator, trailing)
+
+#lvc = LVBitxCreate()
+#lvc.registers.append(Register())
+#lvc.registers[0].datatype = DatatypeArray()
+#lvc.channels.append(DmaChannel())
+#lvc.registerBlocks.append(RegisterBlock())
+#lvc.usedBaseClocks.append(BaseClock())
+
+#lvp = LVbitxParse()
+#lvp.OpenFile("NiFpga_niScopeEXP2PInterleavedDataFPGA.lvbitx")
+#lvc.registers = lvp.GetRegisterList()
+#lvc.channels = lvp.GetDmaChannels()
+#lvc.registerBlocks = lvp.GetRegisterBlocks()
+#lvc.usedBaseClocks = lvp.GetUsedBaseClocks()
+
+#print lvc.Generate()
+
+if __name__ == "__main__":
+	import sys
+	sys.exit(main())
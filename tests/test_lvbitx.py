@@ -0,0 +1,631 @@
+"""
+
+	Smoke tests for lvbitx: the module imports and a generated bitfile
+	parses back identically with every parser engine.
+
+"""
+
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import lvbitx
+
+
+def MakeCreator():
+	"""
+
+		Builds a small LVBitxCreate object covering every section.
+
+	"""
+	lvc = lvbitx.LVBitxCreate()
+	lvc.viName = "smoke.vi"
+	lvc.signatureRegister = "0123456789ABCDEF0123456789ABCDEF"
+	for i, name in enumerate(("count", "limit")):
+		reg = lvbitx.Register()
+		reg.name = name
+		reg.id = i
+		reg.offset = 0x18000 + 4 * i
+		reg.indicator = i == 0
+		reg.datatype.type = lvbitx.TypeCode[u"U32"]
+		reg.datatype.name = name
+		reg.sizeInBits = 32
+		lvc.registers.append(reg)
+	channel = lvbitx.DmaChannel()
+	channel.name = "Fifo0"
+	channel.number = 0
+	channel.numberOfElements = 1023
+	channel.baseAddressTag = "NiLvFpgaFIFO0"
+	channel.datatype.subtype = lvbitx.TypeCode[u"U32"]
+	channel.datatype.wordLength = 32
+	lvc.channels.append(channel)
+	block = lvbitx.RegisterBlock()
+	block.name = "user"
+	block.offset = 0x18000
+	lvc.registerBlocks.append(block)
+	clock = lvbitx.BaseClock()
+	clock.name = "40 MHz Onboard Clock"
+	lvc.usedBaseClocks.append(clock)
+	lvc.bitstream = bytes(bytearray(range(256))) * 64
+	return lvc
+
+@pytest.fixture
+def bitfile(tmp_path):
+	fileName = str(tmp_path / "smoke.lvbitx")
+	with open(fileName, "wb") as f:
+		MakeCreator().GenerateTo(f)
+	return fileName
+
+@pytest.mark.parametrize("engine", lvbitx.ParserEngines)
+def test_round_trip(bitfile, engine):
+	lvc = MakeCreator()
+	lvp = lvbitx.LVbitxParse(bitfile, engine=engine)
+	assert lvp.GetViName() == lvc.viName
+	assert lvp.GetSignature() == lvc.signatureRegister
+	assert [(r.name, r.id, r.offset, r.indicator) for r in lvp.GetRegisterList()] == \
+		[(r.name, r.id, r.offset, r.indicator) for r in lvc.registers]
+	assert [(c.name, c.number, c.baseAddressTag) for c in lvp.GetDmaChannels()] == \
+		[(c.name, c.number, c.baseAddressTag) for c in lvc.channels]
+	assert [b.name for b in lvp.GetRegisterBlocks()] == ["user"]
+	assert [c.name for c in lvp.GetUsedBaseClocks()] == ["40 MHz Onboard Clock"]
+	assert type(lvp.GetBitstream()) is bytes
+	assert lvp.GetBitstream() == lvc.bitstream
+	assert lvp.GetBitstreamBuffer() == lvc.bitstream
+
+@pytest.mark.parametrize("engine", lvbitx.ParserEngines)
+def test_load_matches_dom(bitfile, engine):
+	diff = lvbitx.DiffBitfiles(lvbitx.LVbitxParse(bitfile).Load(), lvbitx.LVbitxParse(bitfile, engine=engine).Load())
+	assert not diff["header"] and not diff["icon"]
+	for section in ("registers", "channels", "registerBlocks", "usedBaseClocks"):
+		assert not any(diff[section].values())
+
+@pytest.mark.parametrize("engine", lvbitx.ParserEngines)
+def test_results_are_independent(bitfile, engine):
+	lvp = lvbitx.LVbitxParse(bitfile, engine=engine)
+	lvp.GetRegisterList()[0].datatype.name = "changed"
+	lvp.Load().registers.append(lvbitx.Register())
+	assert [r.datatype.name for r in lvp.GetRegisterList()] == ["count", "limit"]
+	assert len(lvp.Load().registers) == 2
+
+def test_creator_copies_bitfile(bitfile):
+	source = lvbitx.LVbitxParse(bitfile).Load()
+	lvc = lvbitx.LVBitxCreate(source)
+	lvc.registers.append(lvbitx.Register())
+	lvc.registers[0].name = "renamed"
+	lvc.registers[1].datatype.name = "renamed"
+	lvc.channels[0].name = "renamed"
+	lvc.icon.rectangle[0] = 99
+	assert len(source.registers) == 2
+	assert [r.name for r in source.registers] == ["count", "limit"]
+	assert source.registers[1].datatype.name == "limit"
+	assert source.channels[0].name == "Fifo0"
+	assert source.icon.rectangle[0] != 99
+
+def test_lazy_section_errors_name_the_file(bitfile):
+	with open(bitfile, "rb") as f:
+		data = f.read()
+	assert b"<Offset>98304</Offset>" in data
+	with open(bitfile, "wb") as f:
+		f.write(data.replace(b"<Offset>98304</Offset>", b"<Offset>x</Offset>", 1))
+	lvp = lvbitx.LVbitxParse(bitfile, engine="lazy")
+	with pytest.raises(lvbitx.LVbitxParseError) as error:
+		lvp.GetRegisterList()
+	assert error.value.source == bitfile
+
+@pytest.mark.parametrize("engine", lvbitx.ParserEngines)
+def test_file_object_read_from_current_position(tmp_path, bitfile, engine):
+	with open(bitfile, "rb") as f:
+		data = f.read()
+	fileName = str(tmp_path / "padded.bin")
+	with open(fileName, "wb") as f:
+		f.write(b"\0" * 100 + data)
+	with open(fileName, "rb") as f:
+		f.seek(100)
+		with lvbitx.LVbitxParse(f, engine=engine) as lvp:
+			assert lvp.GetViName() == "smoke.vi"
+			assert lvp.GetBitstream() == MakeCreator().bitstream
+
+@pytest.mark.parametrize("engine", lvbitx.ParserEngines)
+def test_close_releases_mapping(bitfile, engine):
+	with open(bitfile, "rb") as f:
+		lvp = lvbitx.LVbitxParse(f, engine=engine)
+		mapped = lvp.mapped
+		with lvp:
+			assert lvp.GetViName() == "smoke.vi"
+	assert mapped is None or mapped.closed
+	assert lvp.stream is None and lvp.bitx is None and lvp.data is None
+
+def test_dma_stream_sign_extends_narrow_elements():
+	numpy = pytest.importorskip("numpy")
+	channel = lvbitx.DmaChannel()
+	channel.numberOfElements = 8
+	channel.datatype.wordLength = 12
+	channel.datatype.integerWordLength = 4
+	channel.datatype.signed = True
+	values = numpy.array([-2048, -1, 0, 1, 2047, -5], dtype="<i2")
+	raw = (values.astype("<u2") | 0xf000).astype("<u2").tobytes()
+	blocks = [list(block * 256) for block in lvbitx.DmaStream(channel, blockSize=4).Blocks(io.BytesIO(raw))]
+	assert blocks == [[-2048, -1, 0, 1], [2047, -5]]
+
+def test_async_bitstream_iterator_closes_decoder():
+	import asyncio
+	closed = []
+	class Parser():
+		def _BitstreamChunks(self, chunkSize):
+			try:
+				yield b"a"
+				yield b"b"
+			finally:
+				closed.append(True)
+	async def Consume():
+		chunks = lvbitx.IterBitstreamAsync(Parser())
+		assert await chunks.__anext__() == b"a"
+		await chunks.aclose()
+		return list(closed)
+	assert asyncio.run(Consume()) == [True]
+
+def test_cache_hits_are_independent(tmp_path, bitfile):
+	cache = lvbitx.LVbitxCache(str(tmp_path / "cache"))
+	lvbitx.LVBitxCreate(cache.Load(bitfile)).channels[0].name = "edited"
+	cache.Load(bitfile).registers[0].name = "edited"
+	assert cache.Load(bitfile).channels[0].name == "Fifo0"
+	assert cache.Load(bitfile).registers[0].name == "count"
+	assert lvbitx.LVbitxCache(str(tmp_path / "cache")).Load(bitfile).registers[0].name == "count"
+	assert cache.Stats()["memoryHits"] == 3
+
+@pytest.mark.parametrize("engine", lvbitx.ParserEngines)
+def test_compressed_file_object(tmp_path, bitfile, engine):
+	import gzip
+	fileName = str(tmp_path / "smoke.lvbitx.gz")
+	with open(bitfile, "rb") as f, gzip.open(fileName, "wb") as g:
+		g.write(f.read())
+	with gzip.open(fileName, "rb") as f:
+		with lvbitx.LVbitxParse(f, engine=engine) as lvp:
+			assert lvp.GetViName() == "smoke.vi"
+			assert lvp.GetBitstream() == MakeCreator().bitstream
+	with gzip.open(fileName, "rb") as f:
+		assert lvbitx.ProbeFile(f)["viName"] == "smoke.vi"
+
+@pytest.mark.parametrize("engine", lvbitx.ParserEngines)
+def test_bitstream_read_from_parsed_file(bitfile, engine):
+	with lvbitx.LVbitxParse(bitfile, engine=engine) as lvp:
+		patch = lvbitx.LVbitxPatch(bitfile)
+		patch.SetViName("a much longer name than before.vi")
+		patch.Write()
+		assert lvp.GetViName() == "smoke.vi"
+		assert lvp.GetBitstream() == MakeCreator().bitstream
+
+@pytest.mark.parametrize("engine", lvbitx.ParserEngines)
+def test_empty_bitstream(tmp_path, engine):
+	lvc = MakeCreator()
+	lvc.bitstream = b""
+	fileName = str(tmp_path / "empty.lvbitx")
+	with open(fileName, "wb") as f:
+		lvc.GenerateTo(f)
+	with lvbitx.LVbitxParse(fileName, engine=engine) as lvp:
+		assert lvp.GetBitstream() == b""
+		assert lvp.GetBitstreamLength() == 0
+
+def Parsed(fileName):
+	"""
+
+		Loads a file with the dom engine, returning (Bitfile, bitstream).
+
+	"""
+	lvp = lvbitx.LVbitxParse(fileName)
+	return lvp.Load(), lvp.GetBitstream()
+
+def test_patch_renames_channel_and_register(tmp_path, bitfile):
+	output = str(tmp_path / "patched.lvbitx")
+	patch = lvbitx.LVbitxPatch(bitfile)
+	patch.SetChannelName(0, "Renamed Fifo")
+	patch.SetRegisterField("limit", "name", "threshold")
+	patch.SetRegisterField(0, "hidden", True)
+	patch.Write(output)
+	before, bitstream = Parsed(bitfile)
+	after, patchedBitstream = Parsed(output)
+	assert [c.name for c in after.channels] == ["Renamed Fifo"]
+	assert [(r.name, r.hidden) for r in after.registers] == [("count", True), ("threshold", False)]
+	assert patchedBitstream == bitstream == MakeCreator().bitstream
+	diff = lvbitx.DiffBitfiles(before, after, u"id")
+	assert sorted(diff["registers"]["changed"]) == [0, 1]
+	assert not diff["header"] and not diff["registerBlocks"]["changed"]
+	assert Parsed(bitfile)[0].channels[0].name == "Fifo0"
+
+def test_patch_self_closing_field(tmp_path, bitfile):
+	with open(bitfile, "rb") as f:
+		data = f.read()
+	with open(bitfile, "wb") as f:
+		f.write(data.replace(b"<FlattenedType></FlattenedType>", b"<FlattenedType/>", 1))
+	patch = lvbitx.LVbitxPatch(bitfile)
+	patch.SetRegisterField("count", "flattenedType", "0x1 & <2>")
+	patch.Write()
+	bitfile, bitstream = Parsed(bitfile)
+	assert [r.flattenedType for r in bitfile.registers] == ["0x1 & <2>", ""]
+	assert bitstream == MakeCreator().bitstream
+
+def test_patch_same_size_in_place(bitfile):
+	inode = os.stat(bitfile).st_ino
+	size = os.path.getsize(bitfile)
+	patch = lvbitx.LVbitxPatch(bitfile)
+	patch.SetSignature("FEDCBA9876543210FEDCBA9876543210")
+	patch.SetViName("SMOKE.vi")
+	patch.Write()
+	assert os.stat(bitfile).st_ino == inode and os.path.getsize(bitfile) == size
+	lvp = lvbitx.LVbitxParse(bitfile, engine="stream")
+	assert lvp.GetSignature() == "FEDCBA9876543210FEDCBA9876543210"
+	assert lvp.GetViName() == "SMOKE.vi"
+	assert lvp.GetBitstream() == MakeCreator().bitstream
+	assert patch.edits == {}
+
+def test_patch_rewrite(bitfile):
+	size = os.path.getsize(bitfile)
+	patch = lvbitx.LVbitxPatch(bitfile)
+	patch.SetViName("a longer VI name.vi")
+	patch.SetAutoRunWhenDownloaded(True)
+	patch.Write()
+	assert os.path.getsize(bitfile) > size
+	assert not [name for name in os.listdir(os.path.dirname(bitfile)) if name.endswith(".tmp")]
+	lvp = lvbitx.LVbitxParse(bitfile, engine="lazy")
+	assert lvp.GetViName() == "a longer VI name.vi"
+	assert lvp.Load().autoRunWhenDownloaded is True
+	assert lvp.GetBitstream() == MakeCreator().bitstream
+	patch.SetViName("again.vi")
+	patch.Write()
+	assert lvbitx.LVbitxParse(bitfile).GetViName() == "again.vi"
+
+def Layouts(tmp_path):
+	"""
+
+		Writes the test bitfile with compact, pretty, line-wrapped and irregular base64 bitstreams.
+
+		Output:
+			dict layout name -> file name
+
+	"""
+	import base64
+	files = {}
+	for name, pretty in (("compact", False), ("pretty", True)):
+		files[name] = str(tmp_path / ("%s.lvbitx" % name))
+		with open(files[name], "wb") as f:
+			MakeCreator().GenerateTo(f, pretty=pretty)
+	with open(files["compact"], "rb") as f:
+		data = f.read()
+	encoded = base64.b64encode(MakeCreator().bitstream)
+	assert encoded in data
+	wrapped = b"\r\n".join(encoded[pos:pos + 76] for pos in range(0, len(encoded), 76))
+	files["wrapped"] = str(tmp_path / "wrapped.lvbitx")
+	with open(files["wrapped"], "wb") as f:
+		f.write(data.replace(encoded, b"\r\n" + wrapped + b"\r\n"))
+	# uneven lines can't be described by a layout and are stored as encoded text
+	files["irregular"] = str(tmp_path / "irregular.lvbitx")
+	with open(files["irregular"], "wb") as f:
+		f.write(data.replace(encoded, encoded[:100] + b"\n" + encoded[100:130] + b"\n" + encoded[130:]))
+	return files
+
+@pytest.mark.parametrize("compression", ["zlib", "lzma"])
+def test_store_rebuilds_byte_identical(tmp_path, compression):
+	store = lvbitx.BitstreamStore(str(tmp_path / "store"), compression)
+	for layout, fileName in sorted(Layouts(tmp_path).items()):
+		recordId = store.Add(fileName)
+		output = io.BytesIO()
+		written = store.Rebuild(recordId, output)
+		with open(fileName, "rb") as f:
+			assert output.getvalue() == f.read(), layout
+		assert written == os.path.getsize(fileName)
+		bitstream = io.BytesIO()
+		store.WriteBitstream(recordId, bitstream)
+		assert bitstream.getvalue() == MakeCreator().bitstream
+		assert store.GetBitfile(recordId).viName == "smoke.vi"
+	assert len(store.Records()) == 4
+
+def test_store_deduplicates_blobs(tmp_path):
+	files = Layouts(tmp_path)
+	store = lvbitx.BitstreamStore(str(tmp_path / "store"))
+	blobs = os.path.join(str(tmp_path / "store"), "blobs")
+	ids = [store.Add(files["compact"]), store.Add(files["pretty"])]
+	assert store.Add(files["compact"]) == ids[0]
+	assert len(set(ids)) == 2 and len(store.Records()) == 2
+	assert len(os.listdir(blobs)) == 1
+	store.Remove(ids[0])
+	assert store.Records() == [ids[1]] and len(os.listdir(blobs)) == 1
+	store.Remove(ids[1])
+	assert store.Records() == [] and os.listdir(blobs) == []
+	with pytest.raises(KeyError):
+		store.GetBitfile(ids[0])
+
+def MakeRegisters():
+	"""
+
+		Builds registers spread over two register blocks.
+
+		Output:
+			(list of Register objects, list of RegisterBlock objects)
+
+	"""
+	registers = []
+	for i, (name, code, indicator, offset) in enumerate((("a", u"U32", True, 0x100), ("b", u"I16", False, 0x104),
+			("c", u"U32", False, 0x200), ("d", u"Bool", True, 0x204))):
+		reg = lvbitx.Register()
+		reg.name = name
+		reg.id = i
+		reg.offset = offset
+		reg.indicator = indicator
+		reg.datatype.type = lvbitx.TypeCode[code]
+		reg.sizeInBits = 32
+		registers.append(reg)
+	blocks = []
+	for name, offset in (("low", 0x100), ("high", 0x200)):
+		block = lvbitx.RegisterBlock()
+		block.name = name
+		block.offset = offset
+		blocks.append(block)
+	return registers, blocks
+
+@pytest.mark.parametrize("withNumpy", [True, False])
+def test_register_table_select(monkeypatch, withNumpy):
+	if withNumpy:
+		pytest.importorskip("numpy")
+	else:
+		monkeypatch.setitem(sys.modules, "numpy", None)
+	registers, blocks = MakeRegisters()
+	table = lvbitx.RegisterTable(registers, blocks)
+	assert len(table) == 4 and table.names == ("a", "b", "c", "d")
+	assert table.Select(type=lvbitx.TypeCode[u"U32"]) == [0, 2]
+	assert table.Select(flags=lvbitx.RegisterFlag[u"indicator"]) == [0, 3]
+	assert table.Select(noFlags=lvbitx.RegisterFlag[u"indicator"], block="high") == [2]
+	assert table.Select(block="low") == [0, 1]
+	with pytest.raises(KeyError):
+		table.Select(block="missing")
+
+def test_register_table_as_array():
+	pytest.importorskip("numpy")
+	registers, blocks = MakeRegisters()
+	table = lvbitx.RegisterTable(registers, blocks).AsArray()
+	assert list(table["offset"]) == [0x100, 0x104, 0x200, 0x204]
+	assert list(table["id"]) == [0, 1, 2, 3]
+	assert [bool(flags & lvbitx.RegisterFlag[u"indicator"]) for flags in table["flags"]] == [True, False, False, True]
+
+def test_register_codec_round_trip():
+	registers, blocks = MakeRegisters()
+	array = lvbitx.Register()
+	array.name = "e"
+	array.offset = 0x208
+	array.datatype = lvbitx.DatatypeArray()
+	array.datatype.size = 3
+	array.datatype.type.type = lvbitx.TypeCode[u"I8"]
+	codec = lvbitx.RegisterCodec(registers + [array], byteOrder=">")
+	assert codec.baseOffset == 0x100 and codec.size == 0x10b
+	assert codec.names == ("a", "b", "c", "d", "e")
+	values = {"a":0xdeadbeef, "b":-2, "c":7, "d":True, "e":[-1, 0, 1]}
+	snapshot = codec.Encode(values)
+	assert len(snapshot) == codec.size and snapshot[:4] == b"\xde\xad\xbe\xef"
+	assert codec.Decode(snapshot) == values
+	assert codec.Decode(codec.Encode({"c":9}, bytearray(snapshot)))["c"] == 9
+	overlapping = lvbitx.Register()
+	overlapping.name = "f"
+	overlapping.offset = 0x102
+	overlapping.datatype.type = lvbitx.TypeCode[u"U8"]
+	with pytest.raises(ValueError):
+		lvbitx.RegisterCodec(registers + [overlapping])
+
+def test_register_codec_batch():
+	numpy = pytest.importorskip("numpy")
+	registers, blocks = MakeRegisters()
+	codec = lvbitx.RegisterCodec(registers)
+	stride = codec.size + 4
+	buffer = bytearray(3 * stride)
+	for i in range(3):
+		codec.Encode({"a":i, "b":-i, "c":10 * i, "d":i % 2 == 1}, memoryview(buffer)[i * stride:])
+	assert int(codec.DecodeArray(buffer)["c"]) == 0
+	batch = codec.DecodeBatch(buffer, stride)
+	assert list(batch["b"]) == [0, -1, -2] and list(batch["d"]) == [False, True, False]
+	assert codec.DecodeBatch(buffer, stride, dtype=numpy.float64).tolist() == [[i, -i, 10 * i, i % 2] for i in range(3)]
+
+def MakeChannel(subtype=u"U32", wordLength=32, integerWordLength=32, signed=False):
+	"""
+
+		Builds a DMA channel.
+
+	"""
+	channel = lvbitx.DmaChannel()
+	channel.numberOfElements = 16
+	channel.datatype.subtype = lvbitx.TypeCode.get(subtype, -1)
+	channel.datatype.wordLength = wordLength
+	channel.datatype.integerWordLength = integerWordLength
+	channel.datatype.signed = signed
+	return channel
+
+def test_dma_codec_plain_view():
+	numpy = pytest.importorskip("numpy")
+	codec = lvbitx.DmaCodec(MakeChannel(u"I16", 16, 16, True), ">")
+	buffer = b"\xff\xfe\x00\x01"
+	values = codec.ToArray(buffer)
+	assert values.dtype == numpy.dtype(">i2") and list(values) == [-2, 1]
+	assert values.base is not None
+	assert bytes(codec.FromArray([-2, 1])) == buffer
+
+def test_dma_codec_fixed_point_round_trip():
+	numpy = pytest.importorskip("numpy")
+	codec = lvbitx.DmaCodec(MakeChannel(None, 20, 4, True))
+	assert codec.itemsize == 4 and codec.scale == 2.0**-16
+	values = numpy.array([-8.0, -0.5, 0.0, 1.25, 7.5])
+	raw = codec.FromArray(values)
+	assert list(codec.ToArray(raw)) == list(values)
+	out = numpy.empty(8)
+	assert codec.ToArray(raw, out=out).base is out
+	# out of range values are clipped to the word length
+	assert list(codec.ToArray(codec.FromArray([100.0, -100.0]))) == [8 - 2.0**-16, -8.0]
+	unsigned = lvbitx.DmaCodec(MakeChannel(None, 12, 4, False))
+	assert list(unsigned.ToArray(numpy.array([0xf123], dtype="<u2").tobytes())) == [0x123 / 256.0]
+
+def test_diff_bitfiles(bitfile):
+	old = lvbitx.LVbitxParse(bitfile).Load()
+	new = lvbitx.LVbitxParse(bitfile).Load()
+	assert lvbitx.DiffBitfiles(old, new)["registers"] == {"added":[], "removed":[], "changed":{}}
+	new.viName = "other.vi"
+	new.registers[0].datatype.name = "renamed"
+	new.registers[1].name = "threshold"
+	new.channels[0].numberOfElements = 5
+	new.usedBaseClocks = []
+	diff = lvbitx.DiffBitfiles(old, new, u"id")
+	assert diff["header"] == {"viName":["smoke.vi", "other.vi"]}
+	assert diff["registers"]["changed"] == {0:{"datatype.name":["count", "renamed"]}, 1:{"name":["limit", "threshold"]}}
+	assert diff["channels"]["changed"] == {0:{"numberOfElements":[1023, 5]}}
+	assert diff["usedBaseClocks"]["removed"] == ["40 MHz Onboard Clock"]
+	byName = lvbitx.DiffBitfiles(old, new, u"name")["registers"]
+	assert (byName["added"], byName["removed"]) == (["threshold"], ["limit"])
+
+def test_diff_files_and_command(tmp_path, bitfile, capsys):
+	import json
+	other = str(tmp_path / "other.lvbitx")
+	lvc = MakeCreator()
+	lvc.bitstream = lvc.bitstream[::-1]
+	with open(other, "wb") as f:
+		lvc.GenerateTo(f)
+	diff = lvbitx.DiffFiles(bitfile, other)
+	assert diff["bitstream"]["identical"] is False and not diff["registers"]["changed"]
+	assert lvbitx.DiffFiles(bitfile, other, bitstream=False).get("bitstream") is None
+	assert lvbitx.main(["diff", bitfile, bitfile]) == 0
+	capsys.readouterr()
+	assert lvbitx.main(["diff", bitfile, other]) == 1
+	assert json.loads(capsys.readouterr().out)["bitstream"]["identical"] is False
+	assert lvbitx.main(["diff", bitfile, other, "--no-bitstream"]) == 0
+	assert lvbitx.main(["diff", bitfile, str(tmp_path / "missing.lvbitx")]) == 2
+
+def Break(lvc, check):
+	"""
+
+		Makes a creator fail one ValidateBitfile check.
+
+	"""
+	if check == "register-duplicate-name":
+		lvc.registers[1].name = lvc.registers[0].name
+	elif check == "register-duplicate-id":
+		lvc.registers[1].id = lvc.registers[0].id
+	elif check == "channel-duplicate-number":
+		lvc.channels.append(lvbitx.Thaw(lvbitx.Freeze(lvc.channels[0])))
+		lvc.channels[1].name = "Fifo1"
+	elif check == "channel-duplicate-name":
+		lvc.channels.append(lvbitx.Thaw(lvbitx.Freeze(lvc.channels[0])))
+		lvc.channels[1].number = 1
+	elif check == "block-duplicate-name":
+		lvc.registerBlocks.append(lvbitx.RegisterBlock())
+		lvc.registerBlocks[1].name = lvc.registerBlocks[0].name
+		lvc.registerBlocks[1].offset = 0x20000
+	elif check == "block-duplicate-offset":
+		lvc.registerBlocks.append(lvbitx.RegisterBlock())
+		lvc.registerBlocks[1].name = "other"
+		lvc.registerBlocks[1].offset = lvc.registerBlocks[0].offset
+	elif check == "register-overlap":
+		lvc.registers[1].offset = lvc.registers[0].offset + 2
+	elif check == "register-size":
+		lvc.registers[0].sizeInBits = 8
+	elif check == "register-outside-blocks":
+		lvc.registers[0].offset = 0x100
+
+@pytest.mark.parametrize("check,severity", [("register-duplicate-name", "error"), ("register-duplicate-id", "error"),
+	("channel-duplicate-number", "error"), ("channel-duplicate-name", "warning"), ("block-duplicate-name", "error"),
+	("block-duplicate-offset", "error"), ("register-overlap", "error"), ("register-size", "warning"),
+	("register-outside-blocks", "warning")])
+def test_validator_checks(check, severity):
+	assert lvbitx.ValidateBitfile(MakeCreator()) == []
+	lvc = MakeCreator()
+	Break(lvc, check)
+	diagnostics = lvbitx.ValidateBitfile(lvc)
+	assert [(d.code, d.severity) for d in diagnostics] == [(check, severity)]
+
+def test_validation_on_open_and_generate(tmp_path):
+	lvc = MakeCreator()
+	Break(lvc, "register-overlap")
+	fileName = str(tmp_path / "overlap.lvbitx")
+	with open(fileName, "wb") as f:
+		lvc.GenerateTo(f)
+	for engine in lvbitx.ParserEngines:
+		lvp = lvbitx.LVbitxParse(fileName, engine=engine, validate=True)
+		assert [d.code for d in lvp.diagnostics] == ["register-overlap"]
+	lvc.strict = True
+	with pytest.raises(lvbitx.ValidationError) as error:
+		lvc.GenerateTo(io.BytesIO())
+	assert [d.code for d in error.value.diagnostics] == ["register-overlap"]
+
+def WithoutTimeStamp(data):
+	"""
+
+		Blanks the generation time stamp of LVBITX data.
+
+	"""
+	import re
+	return re.sub(b"<TimeStamp>[^<]*</TimeStamp>", b"<TimeStamp/>", data)
+
+@pytest.mark.parametrize("pretty", [False, True])
+def test_template_matches_generate(tmp_path, pretty):
+	lvc = MakeCreator()
+	with lvc.Template(pretty) as template:
+		base = io.BytesIO()
+		template.Render(base)
+		fileName = str(tmp_path / "variant.lvbitx")
+		written = template.Render(fileName, viName="variant & co.vi", signatureRegister="F" * 32,
+			autoRunWhenDownloaded=True, channelNames={0:"Renamed <Fifo>"})
+	expected = io.BytesIO()
+	lvc.GenerateTo(expected, pretty)
+	assert WithoutTimeStamp(base.getvalue()) == WithoutTimeStamp(expected.getvalue())
+	lvc.viName = "variant & co.vi"
+	lvc.signatureRegister = "F" * 32
+	lvc.autoRunWhenDownloaded = True
+	lvc.channels[0].name = "Renamed <Fifo>"
+	expected = io.BytesIO()
+	lvc.GenerateTo(expected, pretty)
+	with open(fileName, "rb") as f:
+		variant = f.read()
+	assert written == len(variant)
+	assert WithoutTimeStamp(variant) == WithoutTimeStamp(expected.getvalue())
+	assert lvbitx.LVbitxParse(fileName, engine="lazy").GetDmaChannels()[0].name == "Renamed <Fifo>"
+
+def test_probe_reads_header_only(tmp_path, bitfile):
+	import zipfile
+	lvc = MakeCreator()
+	lvc.bitstream = bytes(1 << 20)
+	big = str(tmp_path / "big.lvbitx")
+	with open(big, "wb") as f:
+		lvc.GenerateTo(f)
+	dom = lvbitx.LVbitxParse(big).Load()
+	info = lvbitx.ProbeFile(big, chunkSize=1024)
+	assert info["signatureRegister"] == dom.signatureRegister
+	assert info["viName"] == "smoke.vi"
+	assert info["bitfileVersion"] == dom.bitfileVersion and info["timeStamp"] == dom.timeStamp
+	assert 0 < info["bytesRead"] < os.path.getsize(big) // 10
+	with open(bitfile, "rb") as f:
+		data = f.read()
+	assert lvbitx.ProbeFile(data)["viName"] == "smoke.vi"
+	archive = str(tmp_path / "bundle.zip")
+	with zipfile.ZipFile(archive, "w") as z:
+		z.writestr("fpga/smoke.lvbitx", data)
+	assert lvbitx.ProbeFile(zipfile.Path(archive, "fpga/smoke.lvbitx"))["viName"] == "smoke.vi"
+	with pytest.raises(lvbitx.LVbitxParseError):
+		lvbitx.ProbeFile(b"<Bitfile><VI><Name>x</Bitfile>")
+
+def test_scan_command_uses_one_pool(tmp_path, bitfile, capsys, monkeypatch):
+	import json, shutil
+	directory = tmp_path / "builds" / "nested"
+	directory.mkdir(parents=True)
+	shutil.copy(bitfile, str(directory / "copy.lvbitx"))
+	(directory / "notes.txt").write_text("not a bitfile")
+	broken = str(tmp_path / "broken.lvbitx")
+	with open(broken, "w") as f:
+		f.write("<Bitfile>")
+	calls = []
+	scanFiles = lvbitx.ScanFiles
+	def ScanFiles(fileNames, jobs=None):
+		calls.append(jobs)
+		return scanFiles(fileNames, 1)
+	monkeypatch.setattr(lvbitx, "ScanFiles", ScanFiles)
+	assert lvbitx.main(["scan", bitfile, str(tmp_path / "builds"), broken, "-j", "3"]) == 1
+	results = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+	assert calls == [3]
+	assert sorted(result["file"] for result in results) == sorted([bitfile, str(directory / "copy.lvbitx"), broken])
+	assert [result["viName"] for result in results if "error" not in result] == ["smoke.vi", "smoke.vi"]
+	assert [result["file"] for result in results if "error" in result] == [broken]